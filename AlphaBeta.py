@@ -1,65 +1,214 @@
 import math
+import mmap
+import os
+import random
+import sys
+import time
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # The batch API falls back to the scalar search.
+    np = None
+
+
+def tree_depth(leaf_count, branching):
+    """Return the depth d of a uniform tree, where branching ** d == leaf_count."""
+    if leaf_count < 1:
+        raise ValueError("The tree needs at least one leaf value.")
+    if branching < 2 and leaf_count > 1:
+        raise ValueError("The branching factor must be at least 2.")
+    depth, size = 0, 1
+    while size < leaf_count:
+        size *= branching
+        depth += 1
+    if size != leaf_count:
+        raise ValueError(f"{leaf_count} leaves is not a power of the branching factor {branching}.")
+    return depth
+
 
 # Alpha-Beta Pruning Algorithm
-def alpha_beta_pruning(depth, node_index, is_maximizing, values, alpha, beta):
-    # If we are at leaf node (depth 3 => 8 leaf nodes)
-    if depth == 3:
-        return values[node_index]
-
-    if is_maximizing:
-        best = -math.inf
-        for i in range(2):  # Each node has 2 children
-            val = alpha_beta_pruning(depth + 1, node_index * 2 + i, False, values, alpha, beta)
-            best = max(best, val)
-            alpha = max(alpha, best)
-            if beta <= alpha:
-                break  # Beta cut-off
-        return best
-    else:
-        best = math.inf
-        for i in range(2):  # Each node has 2 children
-            val = alpha_beta_pruning(depth + 1, node_index * 2 + i, True, values, alpha, beta)
-            best = min(best, val)
-            beta = min(beta, best)
-            if beta <= alpha:
-                break  # Alpha cut-off
-        return best
+def alpha_beta_pruning(values, branching=2, is_maximizing=True):
+    """Evaluate a uniform minimax tree stored as a flat array of leaf values.
+
+    The children of node i on one level are nodes i * branching .. i * branching +
+    branching - 1 on the next, so the tree is never built. The search keeps its
+    own stack (one slot per level) instead of recursing, so deep trees do not
+    run into Python's recursion limit. values may be a list, array('d'),
+    NumPy array or memory-mapped view (see load_leaves). Returns the root
+    value and the number of leaves evaluated.
+    """
+    depth = tree_depth(len(values), branching)
+    if depth == 0:
+        return values[0], 1
+
+    # Per-level state: node index, next child, alpha, beta and best value so far.
+    index = [0] * depth
+    child = [0] * depth
+    alpha = [-math.inf] * depth
+    beta = [math.inf] * depth
+    best = [0] * depth
+    maximizing = [is_maximizing == (level % 2 == 0) for level in range(depth)]
+    best[0] = -math.inf if maximizing[0] else math.inf
+    last = depth - 1
+    leaves = 0
+    level = 0
+
+    while True:
+        if level == last:
+            # Scan the leaves of this node directly.
+            first = index[level] * branching
+            a, b, value = alpha[level], beta[level], best[level]
+            if maximizing[level]:
+                for i in range(first, first + branching):
+                    leaves += 1
+                    leaf = values[i]
+                    if leaf > value:
+                        value = leaf
+                        if value > a:
+                            a = value
+                            if b <= a:
+                                break  # Beta cut-off
+            else:
+                for i in range(first, first + branching):
+                    leaves += 1
+                    leaf = values[i]
+                    if leaf < value:
+                        value = leaf
+                        if value < b:
+                            b = value
+                            if b <= a:
+                                break  # Alpha cut-off
+        elif child[level] < branching and alpha[level] < beta[level]:
+            # Descend into the next child.
+            node = index[level] * branching + child[level]
+            child[level] += 1
+            level += 1
+            index[level] = node
+            child[level] = 0
+            alpha[level] = alpha[level - 1]
+            beta[level] = beta[level - 1]
+            best[level] = -math.inf if maximizing[level] else math.inf
+            continue
+        else:
+            value = best[level]
+
+        # The node on this level is finished; pass its value to the parent.
+        if level == 0:
+            return value, leaves
+        level -= 1
+        if maximizing[level]:
+            if value > best[level]:
+                best[level] = value
+                if value > alpha[level]:
+                    alpha[level] = value
+        else:
+            if value < best[level]:
+                best[level] = value
+                if value < beta[level]:
+                    beta[level] = value
+
+
+def batch_minimax(leaves, branching=2, is_maximizing=True):
+    """Compute the exact minimax value of many uniform trees at once.
+
+    Every level is reduced with a single NumPy max or min over all trees,
+    working up from the leaves, so there is no per-node interpreter work.
+    Without NumPy each tree is searched with alpha_beta_pruning instead.
+    leaves has one row per tree; the root values come back as a 1-D array
+    (a list without NumPy).
+    """
+    if np is None:
+        return [alpha_beta_pruning(row, branching, is_maximizing)[0] for row in leaves]
+
+    values = np.asarray(leaves)
+    if values.ndim != 2:
+        raise ValueError("Leaves must be a 2-D array with one row per tree.")
+    trees, leaf_count = values.shape
+    depth = tree_depth(leaf_count, branching)
+    for level in range(depth - 1, -1, -1):
+        values = values.reshape(trees, -1, branching)
+        if is_maximizing == (level % 2 == 0):
+            values = values.max(axis=2)
+        else:
+            values = values.min(axis=2)
+    return values[:, 0]
+
+
+def check_batch(leaves, branching=2, is_maximizing=True):
+    """Return True if batch_minimax agrees with alpha_beta_pruning on every tree."""
+    batch = batch_minimax(leaves, branching, is_maximizing)
+    return all(alpha_beta_pruning(row, branching, is_maximizing)[0] == value
+               for row, value in zip(leaves, batch))
+
+
+def benchmark_batch(trees=2000, branching=2, depth=10, seed=0):
+    """Time batch_minimax against one alpha_beta_pruning call per tree."""
+    rng = random.Random(seed)
+    rows = [[rng.randint(-100, 100) for _ in range(branching ** depth)] for _ in range(trees)]
+    leaves = np.array(rows) if np is not None else rows
+
+    start = time.perf_counter()
+    scalar = [alpha_beta_pruning(row, branching)[0] for row in rows]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = batch_minimax(leaves, branching)
+    batch_time = time.perf_counter() - start
+
+    agree = all(a == b for a, b in zip(scalar, batch))
+    print(f"{trees} trees, branching {branching}, depth {depth}"
+          f"{'' if np is not None else ' (NumPy not installed)'}")
+    print(f"  alpha-beta per tree: {scalar_time:.3f}s")
+    print(f"  batch minimax:       {batch_time:.3f}s")
+    print(f"  speedup: {scalar_time / batch_time:.1f}x, results agree: {agree}")
+
+
+def save_leaves(values, path):
+    """Write leaf values to a file as native 8-byte floats."""
+    with open(path, 'wb') as f:
+        array('d', values).tofile(f)
+
+
+def load_leaves(path):
+    """Load leaf values written by save_leaves, or a text file of numbers.
+
+    Binary files are memory-mapped, so only the leaves the search touches are
+    read from disk. A file ending in .txt is parsed as whitespace-separated
+    numbers into an array('d').
+    """
+    if path.endswith('.txt'):
+        with open(path) as f:
+            return array('d', map(float, f.read().split()))
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size % 8:
+            raise ValueError(f"{path} is not a file of 8-byte floats.")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast('d')
+
 
 # User Input Function
 def main():
     print("Alpha-Beta Pruning Example")
-    print("This builds a minimax tree of depth 3 with 8 leaf nodes.")
+    print("This evaluates a minimax tree with a uniform branching factor.")
 
     try:
-        values = list(map(int, input("Enter 8 space-separated leaf node values: ").split()))
-        if len(values) != 8:
-            print("❌ Error: You must enter exactly 8 values.")
-            return
-    except ValueError:
-        print("❌ Error: Please enter valid integers.")
+        branching = int(input("Enter the branching factor (default 2): ") or 2)
+        entry = input("Enter space-separated leaf node values or a file path: ").strip()
+        if os.path.isfile(entry):
+            values = load_leaves(entry)
+        else:
+            values = list(map(int, entry.split()))
+        optimal_value, leaves = alpha_beta_pruning(values, branching)
+    except ValueError as error:
+        print(f"❌ Error: {error}")
         return
 
-    optimal_value = alpha_beta_pruning(0, 0, True, values, -math.inf, math.inf)
     print(f"\n✅ Optimal value (root node): {optimal_value}")
+    print(f"Leaves evaluated: {leaves} of {len(values)}")
 
 if __name__ == "__main__":
-    main()
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-#  3 5 6 9 1 2 0 -1
\ No newline at end of file
+    if '--benchmark' in sys.argv:
+        benchmark_batch()
+    else:
+        main()
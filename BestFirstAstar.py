@@ -1,30 +1,271 @@
 import heapq
-
-def best_first_search(graph, heuristics, start, goal):
-    visited = set()
-    queue = [(heuristics[start], start, [start])]
+import itertools
+import math
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+import tracemalloc
+from array import array
+
+def reconstruct_path(parent, goal):
+    """Follow parent pointers back from the goal and return the path start -> goal."""
+    path = [goal]
+    while parent[path[-1]] is not None:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+def best_first_search(graph, heuristics, start, goal, stats=None):
+    # Heap entries are (h, tie-breaker, node, parent); the path is rebuilt once at the goal.
+    parent = {}
+    counter = itertools.count()
+    queue = [(heuristics[start], next(counter), start, None)]
+    expanded = 0
 
     while queue:
-        h, current, path = heapq.heappop(queue)
+        h, _, current, previous = heapq.heappop(queue)
+        if current in parent:
+            continue
+        parent[current] = previous
         if current == goal:
-            return path
-
-        if current not in visited:
-            visited.add(current)
-            for neighbor, cost in graph[current]:
-                if neighbor not in visited:
-                    heapq.heappush(queue, (heuristics[neighbor], neighbor, path + [neighbor]))
-
-    return None
+            break
+
+        expanded += 1
+        for neighbor, cost in graph[current]:
+            if neighbor not in parent:
+                heapq.heappush(queue, (heuristics[neighbor], next(counter), neighbor, current))
+
+    if stats is not None:
+        stats['expanded'] = expanded
+    return reconstruct_path(parent, goal) if goal in parent else None
+
+class IndexedHeap:
+    """A binary min-heap of distinct items with a real decrease-key.
+
+    pos maps each queued item to its slot, so update() can move an item up in
+    O(log n) instead of pushing a duplicate entry.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.items = []
+        self.pos = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.pos
+
+    def push(self, item, key):
+        """Add an item, or lower its key if it is already queued."""
+        if item in self.pos:
+            self.update(item, key)
+            return
+        self.keys.append(key)
+        self.items.append(item)
+        self.pos[item] = len(self.items) - 1
+        self._sift_up(len(self.items) - 1)
+
+    def update(self, item, key):
+        """Decrease the key of a queued item."""
+        index = self.pos[item]
+        if key < self.keys[index]:
+            self.keys[index] = key
+            self._sift_up(index)
+
+    def pop(self):
+        """Remove and return the (item, key) pair with the smallest key."""
+        item, key = self.items[0], self.keys[0]
+        last_item, last_key = self.items.pop(), self.keys.pop()
+        del self.pos[item]
+        if self.items:
+            self.items[0], self.keys[0] = last_item, last_key
+            self.pos[last_item] = 0
+            self._sift_down(0)
+        return item, key
+
+    def _sift_up(self, index):
+        keys, items, pos = self.keys, self.items, self.pos
+        item, key = items[index], keys[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if keys[parent] <= key:
+                break
+            keys[index], items[index] = keys[parent], items[parent]
+            pos[items[index]] = index
+            index = parent
+        keys[index], items[index] = key, item
+        pos[item] = index
+
+    def _sift_down(self, index):
+        keys, items, pos = self.keys, self.items, self.pos
+        size = len(items)
+        item, key = items[index], keys[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and keys[child + 1] < keys[child]:
+                child += 1
+            if key <= keys[child]:
+                break
+            keys[index], items[index] = keys[child], items[child]
+            pos[items[index]] = index
+            index = child
+        keys[index], items[index] = key, item
+        pos[item] = index
+
+def a_star_search(graph, heuristics, start, goal, stats=None, heap='lazy'):
+    """A* that keeps the best known g per node and never queues a dominated entry.
+
+    A closed node that is reached again with a smaller g is reopened, so the
+    returned path is optimal for any admissible heuristic, consistent or not.
+    With heap='lazy' every improvement pushes a new heapq entry and stale ones
+    are skipped when popped; heap='indexed' uses an IndexedHeap with
+    decrease-key. The search counters are written to stats if it is given.
+    """
+    if heap not in ('lazy', 'indexed'):
+        raise ValueError(f"Unknown heap type: {heap}")
+    best_g = {start: 0}
+    parent = {start: None}
+    closed = set()  # Nodes expanded at least once, to count re-expansions.
+    counter = itertools.count()
+    pushes = pops = stale_pops = decrease_keys = expanded = reexpansions = 0
+    found = False
+
+    if heap == 'lazy':
+        queue = [(heuristics[start], 0, next(counter), start)]  # (f = g + h, g, tie-breaker, node)
+    else:
+        queue = IndexedHeap()
+        queue.push(start, (heuristics[start], 0, next(counter)))
+    pushes += 1
 
-def a_star_search(graph, heuristics, start, goal):
+    while queue:
+        pops += 1
+        if heap == 'lazy':
+            f, g, _, current = heapq.heappop(queue)
+            if g > best_g[current]:
+                stale_pops += 1  # A cheaper entry for this node was queued later.
+                continue
+        else:
+            current, (f, g, _) = queue.pop()
+        if current == goal:
+            found = True
+            break
+
+        if current in closed:
+            reexpansions += 1
+        closed.add(current)
+        expanded += 1
+        for neighbor, cost in graph[current]:
+            g_new = g + cost
+            if g_new >= best_g.get(neighbor, math.inf):
+                continue
+            # This also reopens an expanded node: with an inconsistent heuristic
+            # it may have been expanded before its cheapest path was known.
+            best_g[neighbor] = g_new
+            parent[neighbor] = current
+            key = (g_new + heuristics[neighbor], g_new, next(counter))
+            if heap == 'lazy':
+                heapq.heappush(queue, key + (neighbor,))
+                pushes += 1
+            elif neighbor in queue:
+                queue.update(neighbor, key)
+                decrease_keys += 1
+            else:
+                queue.push(neighbor, key)
+                pushes += 1
+
+    if stats is not None:
+        stats.update(pushes=pushes, pops=pops, stale_pops=stale_pops, decrease_keys=decrease_keys,
+                     expanded=expanded, reexpansions=reexpansions)
+    return reconstruct_path(parent, goal) if found else None
+
+def bidirectional_search(graph, heuristics, start, goal, stats=None, start_heuristics=None,
+                         reverse_graph=None):
+    """Point-to-point search from both ends that meets in the middle.
+
+    With heuristics=None this is bidirectional Dijkstra. Otherwise it is
+    bidirectional A* with average potentials: the forward search uses
+    p(v) = (h_goal(v) - h_start(v)) / 2 and the reverse search -p(v), so both
+    see the same reduced edge costs and the plain Dijkstra stopping rule
+    applies: stop once min_forward + min_reverse >= mu, the best path found.
+    Both heuristics must be consistent; start_heuristics (estimates of the
+    distance to start) defaults to zero.
+
+    The reverse search walks graph backwards, so a directed graph needs its
+    reverse_graph (see CSRGraph.reverse). The path found is as short as the
+    one from a_star_search.
+    """
+    if reverse_graph is None:
+        reverse_graph = graph
+    if heuristics is None:
+        def potential(node):
+            return 0
+    elif start_heuristics is None:
+        def potential(node):
+            return heuristics[node] / 2
+    else:
+        def potential(node):
+            return (heuristics[node] - start_heuristics[node]) / 2
+
+    # Per direction: best g, parent, heap of (key, g, tie-breaker, node), sign of the potential.
+    sides = (({start: 0}, {start: None}, [(potential(start), 0, 0, start)], 1, graph),
+             ({goal: 0}, {goal: None}, [(-potential(goal), 0, 1, goal)], -1, reverse_graph))
+    counter = itertools.count(2)
+    settled = [0, 0]
+    pushes = 2
+    best, meet = math.inf, None
+    if start == goal:
+        best, meet = 0, start
+
+    while sides[0][2] and sides[1][2]:
+        if sides[0][2][0][0] + sides[1][2][0][0] >= best:
+            break
+        # Expand the side with the smaller frontier.
+        side = 0 if len(sides[0][2]) <= len(sides[1][2]) else 1
+        best_g, parent, queue, sign, edges = sides[side]
+        other_g = sides[1 - side][0]
+        key, g, _, current = heapq.heappop(queue)
+        if g > best_g[current]:
+            continue
+        settled[side] += 1
+        for neighbor, cost in edges[current]:
+            g_new = g + cost
+            if g_new >= best_g.get(neighbor, math.inf):
+                continue
+            best_g[neighbor] = g_new
+            parent[neighbor] = current
+            heapq.heappush(queue, (g_new + sign * potential(neighbor), g_new, next(counter), neighbor))
+            pushes += 1
+            if neighbor in other_g and g_new + other_g[neighbor] < best:
+                best, meet = g_new + other_g[neighbor], neighbor
+
+    if stats is not None:
+        stats.update(forward_settled=settled[0], reverse_settled=settled[1],
+                     settled=settled[0] + settled[1], pushes=pushes)
+    if meet is None:
+        return None
+    path = reconstruct_path(sides[0][1], meet)
+    node = sides[1][1][meet]
+    while node is not None:
+        path.append(node)
+        node = sides[1][1][node]
+    return path
+
+def _path_copy_a_star_search(graph, heuristics, start, goal, stats=None):
+    # The original A*, which copies the whole path into every heap entry; kept for benchmarking.
     visited = set()
-    queue = [(heuristics[start], 0, start, [start])]  # (f = g + h, g, node, path)
+    queue = [(heuristics[start], 0, start, [start])]
 
     while queue:
         f, g, current, path = heapq.heappop(queue)
         if current == goal:
-            return path
+            break
 
         if current not in visited:
             visited.add(current)
@@ -33,8 +274,335 @@ def a_star_search(graph, heuristics, start, goal):
                     g_new = g + cost
                     f_new = g_new + heuristics[neighbor]
                     heapq.heappush(queue, (f_new, g_new, neighbor, path + [neighbor]))
+    else:
+        path = None
 
-    return None
+    if stats is not None:
+        stats['expanded'] = len(visited)
+    return path
+
+def grid_graph(width, height, seed=0):
+    """Build a road-like undirected grid graph with random edge costs of at least 1.
+
+    Node ids are integers row * width + col. Returns the graph and coords,
+    which maps every node to its (row, col).
+    """
+    rng = random.Random(seed)
+    graph = {}
+    coords = {}
+    for row in range(height):
+        for col in range(width):
+            node = row * width + col
+            graph[node] = []
+            coords[node] = (row, col)
+    for row in range(height):
+        for col in range(width):
+            node = row * width + col
+            if col + 1 < width:
+                cost = 1 + rng.random()
+                graph[node].append((node + 1, cost))
+                graph[node + 1].append((node, cost))
+            if row + 1 < height:
+                cost = 1 + rng.random()
+                graph[node].append((node + width, cost))
+                graph[node + width].append((node, cost))
+    return graph, coords
+
+def manhattan_heuristics(coords, goal):
+    """Manhattan distance to the goal, which is admissible when every edge costs at least 1."""
+    goal_row, goal_col = coords[goal]
+    return {node: abs(row - goal_row) + abs(col - goal_col) for node, (row, col) in coords.items()}
+
+def _measure(search, graph, heuristics, start, goal):
+    # Time a plain run, then repeat it under tracemalloc, which slows allocation down.
+    stats = {}
+    begin = time.perf_counter()
+    path = search(graph, heuristics, start, goal, stats)
+    elapsed = time.perf_counter() - begin
+    tracemalloc.start()
+    search(graph, heuristics, start, goal)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return path, elapsed, peak, stats
+
+def benchmark_search(width=300, height=300, seed=0):
+    """Compare path-copying A* with the parent-pointer versions on a grid graph."""
+    graph, coords = grid_graph(width, height, seed)
+    start, goal = 0, width * height - 1
+    heuristics = manhattan_heuristics(coords, goal)
+    print(f"{width}x{height} grid, {width * height} nodes")
+    searches = (("path copying", _path_copy_a_star_search),
+                ("lazy heap", a_star_search),
+                ("indexed heap", lambda *args: a_star_search(*args, heap='indexed')))
+    for name, search in searches:
+        path, elapsed, peak, stats = _measure(search, graph, heuristics, start, goal)
+        expanded = stats['expanded']
+        print(f"  {name:13} expanded {expanded}, {elapsed:.2f}s "
+              f"({elapsed / max(expanded, 1) * 1e6:.1f} us/expansion), "
+              f"peak memory {peak / 2 ** 20:.1f} MiB, path length {len(path)}")
+        if 'pushes' in stats:
+            print(f"  {'':13} pushes {stats['pushes']}, pops {stats['pops']}, "
+                  f"stale pops {stats['stale_pops']}, decrease-keys {stats['decrease_keys']}")
+
+CSR_MAGIC = b'CSR1'
+CSR_HEADER = struct.Struct('<4sIqq')  # magic, flags, node count, arc count
+CSR_NAMES, CSR_SYMMETRIC = 1, 2  # Header flags
+
+class CSRGraph:
+    """A directed graph in compressed sparse row form with integer node ids.
+
+    The arcs leaving node i are targets[offsets[i]:offsets[i + 1]], with costs
+    at the same positions in weights. graph[i] yields (neighbor, cost) pairs
+    like the adjacency dicts from build_graph, so best_first_search and
+    a_star_search run on it directly; heuristics are then indexed by node id
+    (a list or array works). The arrays may be array objects or memoryviews
+    over a memory-mapped file (see load_csr). symmetric marks graphs that
+    store every edge in both directions, so they are their own reverse.
+    """
+
+    def __init__(self, offsets, targets, weights, names=None, symmetric=False):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self._names = names
+        self._ids = None
+        self.symmetric = symmetric
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, node):
+        first, last = self.offsets[node], self.offsets[node + 1]
+        return zip(self.targets[first:last], self.weights[first:last])
+
+    @property
+    def arc_count(self):
+        return len(self.targets)
+
+    @property
+    def names(self):
+        """Original node names by id; decoded on first use for mapped graphs."""
+        if isinstance(self._names, (bytes, memoryview)):
+            self._names = bytes(self._names).decode().split('\n')
+        return self._names
+
+    def name(self, node):
+        """Return the original name of a node id (1-based numbers for DIMACS graphs)."""
+        return self.names[node] if self.names is not None else str(node + 1)
+
+    def node_id(self, name):
+        """Return the integer id of a node name."""
+        if self.names is None:
+            return int(name) - 1
+        if self._ids is None:
+            self._ids = {node_name: node for node, node_name in enumerate(self.names)}
+        return self._ids[name]
+
+    @classmethod
+    def from_arcs(cls, node_count, sources, targets, weights, names=None, symmetric=False):
+        """Build the CSR arrays from parallel arrays of arcs with a counting sort."""
+        offsets = array('q', bytes(8 * (node_count + 1)))
+        for source in sources:
+            offsets[source + 1] += 1
+        for node in range(node_count):
+            offsets[node + 1] += offsets[node]
+
+        arc_count = len(sources)
+        sorted_targets = array('i', bytes(4 * arc_count))
+        sorted_weights = array('d', bytes(8 * arc_count))
+        cursor = array('q', offsets[:-1])
+        for source, target, weight in zip(sources, targets, weights):
+            position = cursor[source]
+            sorted_targets[position] = target
+            sorted_weights[position] = weight
+            cursor[source] = position + 1
+        return cls(offsets, sorted_targets, sorted_weights, names, symmetric)
+
+    def reverse(self):
+        """Return the graph with every arc reversed, for searching backwards."""
+        sources = array('i')
+        for node in range(len(self)):
+            sources.extend([node] * (self.offsets[node + 1] - self.offsets[node]))
+        return CSRGraph.from_arcs(len(self), array('i', self.targets), sources, self.weights,
+                                  self._names)
+
+    @classmethod
+    def from_dict(cls, graph):
+        """Convert an adjacency dict of name -> [(neighbor, cost), ...]."""
+        names = list(graph)
+        ids = {name: node for node, name in enumerate(names)}
+        sources, targets, weights = array('i'), array('i'), array('d')
+        for name, edges in graph.items():
+            for neighbor, cost in edges:
+                sources.append(ids[name])
+                targets.append(ids[neighbor])
+                weights.append(cost)
+        return cls.from_arcs(len(names), sources, targets, weights, [str(name) for name in names])
+
+def load_edge_list(path, directed=False):
+    """Read a text file of 'from to [cost]' lines into a CSRGraph.
+
+    Node names are interned to integer ids in order of first appearance.
+    Lines starting with '#' are ignored and a missing cost counts as 1.
+    Every edge is stored in both directions unless directed is True.
+    """
+    ids = {}
+    names = []
+    sources, targets, weights = array('i'), array('i'), array('d')
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if not parts or parts[0].startswith('#'):
+                continue
+            ends = []
+            for name in parts[:2]:
+                node = ids.get(name)
+                if node is None:
+                    node = ids[name] = len(names)
+                    names.append(name)
+                ends.append(node)
+            cost = float(parts[2]) if len(parts) > 2 else 1.0
+            sources.append(ends[0])
+            targets.append(ends[1])
+            weights.append(cost)
+            if not directed:
+                sources.append(ends[1])
+                targets.append(ends[0])
+                weights.append(cost)
+    return CSRGraph.from_arcs(len(names), sources, targets, weights, names, not directed)
+
+def load_dimacs_gr(path):
+    """Read a DIMACS shortest-path .gr file ('p sp n m' and 'a u v w' lines).
+
+    DIMACS nodes are numbered from 1; node id i is DIMACS node i + 1. Arcs
+    are directed, as in the file (road graphs list both directions).
+    """
+    node_count = 0
+    sources, targets, weights = array('i'), array('i'), array('d')
+    with open(path) as f:
+        for line in f:
+            if line.startswith('a'):
+                _, source, target, weight = line.split()
+                sources.append(int(source) - 1)
+                targets.append(int(target) - 1)
+                weights.append(float(weight))
+            elif line.startswith('p'):
+                node_count = int(line.split()[2])
+    return CSRGraph.from_arcs(node_count, sources, targets, weights)
+
+def save_csr(graph, path):
+    """Write a CSRGraph to a binary file that load_csr can memory-map.
+
+    Layout: header (with the CSR_NAMES and CSR_SYMMETRIC flags), int64
+    offsets, float64 weights, int32 targets (padded to 8 bytes), then the
+    node names joined by newlines if the graph has any.
+    """
+    names = graph.names
+    with open(path, 'wb') as f:
+        flags = (CSR_NAMES if names is not None else 0) | (CSR_SYMMETRIC if graph.symmetric else 0)
+        f.write(CSR_HEADER.pack(CSR_MAGIC, flags, len(graph), graph.arc_count))
+        array('q', graph.offsets).tofile(f)
+        array('d', graph.weights).tofile(f)
+        array('i', graph.targets).tofile(f)
+        f.write(bytes(-4 * graph.arc_count % 8))
+        if names is not None:
+            f.write('\n'.join(names).encode())
+
+def load_csr(path):
+    """Memory-map a file written by save_csr; nothing is parsed or copied."""
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, flags, node_count, arc_count = CSR_HEADER.unpack_from(mapped)
+    if magic != CSR_MAGIC:
+        raise ValueError(f"{path} is not a CSR graph file.")
+
+    view = memoryview(mapped)
+    start = CSR_HEADER.size
+    offsets = view[start:start + 8 * (node_count + 1)].cast('q')
+    start += 8 * (node_count + 1)
+    weights = view[start:start + 8 * arc_count].cast('d')
+    start += 8 * arc_count
+    targets = view[start:start + 4 * arc_count].cast('i')
+    start += 4 * arc_count + (-4 * arc_count % 8)
+    names = view[start:] if flags & CSR_NAMES else None
+    return CSRGraph(offsets, targets, weights, names, bool(flags & CSR_SYMMETRIC))
+
+def load_graph(path):
+    """Load a graph file by extension: .csr (mapped), .gr (DIMACS) or an edge list."""
+    if path.endswith('.csr'):
+        return load_csr(path)
+    if path.endswith('.gr'):
+        return load_dimacs_gr(path)
+    return load_edge_list(path)
+
+def benchmark_bidirectional(width=300, height=300, queries=20, seed=0):
+    """Count settled nodes for one- and two-sided searches on random grid queries."""
+    graph, coords = grid_graph(width, height, seed)
+    rng = random.Random(seed)
+    zero = {node: 0 for node in graph}
+    searches = (
+        ("Dijkstra", lambda start, goal, to_goal, to_start, stats:
+            a_star_search(graph, zero, start, goal, stats)),
+        ("A*", lambda start, goal, to_goal, to_start, stats:
+            a_star_search(graph, to_goal, start, goal, stats)),
+        ("bidirectional Dijkstra", lambda start, goal, to_goal, to_start, stats:
+            bidirectional_search(graph, None, start, goal, stats)),
+        ("bidirectional A*", lambda start, goal, to_goal, to_start, stats:
+            bidirectional_search(graph, to_goal, start, goal, stats, to_start)),
+    )
+    settled = [0] * len(searches)
+    elapsed = [0.0] * len(searches)
+    for _ in range(queries):
+        start, goal = rng.randrange(len(graph)), rng.randrange(len(graph))
+        to_goal = manhattan_heuristics(coords, goal)
+        to_start = manhattan_heuristics(coords, start)
+        costs = []
+        for index, (name, search) in enumerate(searches):
+            stats = {}
+            begin = time.perf_counter()
+            path = search(start, goal, to_goal, to_start, stats)
+            elapsed[index] += time.perf_counter() - begin
+            settled[index] += stats['settled'] if 'settled' in stats else stats['expanded']
+            costs.append(sum(min(cost for neighbor, cost in graph[node] if neighbor == after)
+                             for node, after in zip(path, path[1:])))
+        if max(costs) - min(costs) > 1e-9:
+            print(f"  path costs differ for {start} -> {goal}: {costs}")
+
+    print(f"{width}x{height} grid, {queries} random queries")
+    for index, (name, search) in enumerate(searches):
+        print(f"  {name:23} {settled[index] / queries:9.0f} settled nodes/query, "
+              f"{elapsed[index] / queries * 1000:.1f} ms/query")
+
+def benchmark_csr(width=300, height=300, path='grid.csr', seed=0):
+    """Compare dict and CSR storage of a grid graph: memory, load time and A* time."""
+    tracemalloc.start()
+    graph, coords = grid_graph(width, height, seed)
+    dict_memory = tracemalloc.get_traced_memory()[0]
+    csr = CSRGraph.from_dict(graph)
+    csr_memory = tracemalloc.get_traced_memory()[0] - dict_memory
+    tracemalloc.stop()
+
+    save_csr(csr, path)
+    begin = time.perf_counter()
+    mapped = load_csr(path)
+    load_time = time.perf_counter() - begin
+
+    start, goal = 0, width * height - 1
+    heuristics = manhattan_heuristics(coords, goal)
+    csr_heuristics = [heuristics[int(name)] for name in mapped.names]
+    print(f"{width}x{height} grid, {len(mapped)} nodes, {mapped.arc_count} arcs")
+    print(f"  storage: dict {dict_memory / 2 ** 20:.1f} MiB, CSR {csr_memory / 2 ** 20:.1f} MiB, "
+          f"mapped load {load_time * 1000:.2f} ms")
+    for name, search_graph, search_heuristics, ends in (
+            ("dict", graph, heuristics, (start, goal)),
+            ("mapped CSR", mapped, csr_heuristics, (mapped.node_id(str(start)), mapped.node_id(str(goal))))):
+        stats = {}
+        begin = time.perf_counter()
+        result = a_star_search(search_graph, search_heuristics, *ends, stats)
+        elapsed = time.perf_counter() - begin
+        print(f"  A* on {name:10} {elapsed:.2f}s ({elapsed / stats['expanded'] * 1e6:.1f} us/expansion), "
+              f"path length {len(result)}")
+    os.remove(path)
 
 # User Input Function
 def build_graph():
@@ -61,26 +629,50 @@ def build_graph():
     return graph, heuristics, start, goal
 
 # Main Function
+def print_path(title, path, graph=None):
+    print(f"\n--- {title} Result ---")
+    if path:
+        names = path if graph is None else [graph.name(node) for node in path]
+        print("Path found:", " -> ".join(names))
+    else:
+        print("No path found.")
+
 def main():
     print("Best-First Search and A* Algorithm for Pathfinding")
     graph, heuristics, start, goal = build_graph()
+    print_path("Best-First Search", best_first_search(graph, heuristics, start, goal))
+    print_path("A* Search", a_star_search(graph, heuristics, start, goal))
+    print_path("Bidirectional Dijkstra", bidirectional_search(graph, None, start, goal))
+
+def search_file(path, start, goal):
+    """Run both searches on a graph file; with no heuristic, A* is Dijkstra's algorithm."""
+    graph = load_graph(path)
+    heuristics = [0] * len(graph)
+    start, goal = graph.node_id(start), graph.node_id(goal)
+    print_path("Best-First Search", best_first_search(graph, heuristics, start, goal), graph)
+    print_path("A* Search", a_star_search(graph, heuristics, start, goal), graph)
+    # Only directed graphs (DIMACS files and CSR files made from them) need a reversed copy
+    reverse_graph = graph if graph.symmetric else graph.reverse()
+    print_path("Bidirectional Dijkstra",
+               bidirectional_search(graph, None, start, goal, reverse_graph=reverse_graph), graph)
 
-    print("\n--- Best-First Search Result ---")
-    path_bfs = best_first_search(graph, heuristics, start, goal)
-    if path_bfs:
-        print("Path found:", " -> ".join(path_bfs))
-    else:
-        print("No path found.")
-
-    print("\n--- A* Search Result ---")
-    path_astar = a_star_search(graph, heuristics, start, goal)
-    if path_astar:
-        print("Path found:", " -> ".join(path_astar))
+if __name__ == "__main__":
+    # python BestFirstAstar.py --graph FILE START GOAL   (FILE: .csr, DIMACS .gr or edge list)
+    # python BestFirstAstar.py --convert FILE OUT.csr
+    if "--benchmark" in sys.argv:
+        benchmark_search()
+    elif "--benchmark-bidirectional" in sys.argv:
+        benchmark_bidirectional()
+    elif "--benchmark-csr" in sys.argv:
+        benchmark_csr()
+    elif "--graph" in sys.argv:
+        search_file(*sys.argv[sys.argv.index("--graph") + 1:][:3])
+    elif "--convert" in sys.argv:
+        source, target = sys.argv[sys.argv.index("--convert") + 1:][:2]
+        save_csr(load_graph(source), target)
     else:
-        print("No path found.")
+        main()
 
-if __name__ == "__main__":
-    main()
 
 
 
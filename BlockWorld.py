@@ -1,8 +1,239 @@
+import bisect
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import heapq
+import io
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from array import array
+
+
+SOLVE_MODES = ('greedy', 'optimal', 'large')
+
+
+def format_action(action):
+    """Turn a (block, source_stack, target_stack) action record into a readable step"""
+    block, source, target = action
+    return f"Move {block} from stack {source} to stack {target}"
+
+
+class BlockState:
+    """
+    Compact, hashable block world state for search
+    
+    Blocks and stacks are numbered. The state is what each block sits on:
+    on[b] is the block under b, or len(names) + s for the bottom of stack
+    s. Since only the top block of a stack ever moves, a move touches one
+    entry of on, stack_of and top, and undoing it is the reverse move.
+    
+    hash is a Zobrist-style hash kept up to date on every move: the XOR
+    over all blocks of a per-block key times a per-support key, so only
+    one term changes per move. It is deterministic across processes.
+    Stacks listed as spare, such as those empty in the goal, share one
+    floor key, so states that only differ by which spare stack holds
+    what hash the same.
+    """
+    __slots__ = ('names', 'index', 'on', 'stack_of', 'top', 'block_keys', 'support_keys',
+                 'hash', 'goal_on', 'matched')
+    
+    MASK = (1 << 64) - 1
+
+    def __init__(self, stacks, names=None, spare=()):
+        """Build the state from stacks of block names (bottom to top), numbering blocks in names order"""
+        self.names = names if names is not None else [block for stack in stacks for block in stack]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        n = len(self.names)
+        self.on = array('i', [0] * n)
+        self.stack_of = array('i', [0] * n)
+        self.top = array('i', [-1] * len(stacks))
+        for s, stack in enumerate(stacks):
+            support = n + s
+            for name in stack:
+                block = self.index[name]
+                self.on[block] = support
+                self.stack_of[block] = s
+                support = block
+            if stack:
+                self.top[s] = support
+        
+        rng = random.Random(n * 1000003 + len(stacks))
+        self.block_keys = [rng.getrandbits(64) | 1 for _ in range(n)]
+        self.support_keys = [rng.getrandbits(64) | 1 for _ in range(n + len(stacks))]
+        for stack in spare:
+            self.support_keys[n + stack] = self.support_keys[n + spare[0]]
+        self.hash = 0
+        for block in range(n):
+            self.hash ^= self.block_keys[block] * self.support_keys[self.on[block]] & self.MASK
+        self.goal_on = None
+        self.matched = 0
+
+    @classmethod
+    def from_world(cls, world):
+        """Snapshot a BlockWorld's stacks"""
+        return cls(world.stacks)
+
+    def copy(self):
+        """Independent copy sharing the name and hash key tables"""
+        state = object.__new__(BlockState)
+        state.names = self.names
+        state.index = self.index
+        state.on = array('i', self.on)
+        state.stack_of = array('i', self.stack_of)
+        state.top = array('i', self.top)
+        state.block_keys = self.block_keys
+        state.support_keys = self.support_keys
+        state.hash = self.hash
+        state.goal_on = self.goal_on
+        state.matched = self.matched
+        return state
+
+    def move(self, block, target):
+        """Move a clear block (by index) to the top of another stack in O(1) and return the action for undo"""
+        n = len(self.on)
+        source = self.stack_of[block]
+        if target == source:
+            raise ValueError(f"Block {self.names[block]} is already on stack {target}")
+        old_support = self.on[block]
+        new_support = self.top[target] if self.top[target] >= 0 else n + target
+        
+        self.top[source] = old_support if old_support < n else -1
+        self.top[target] = block
+        self.on[block] = new_support
+        self.stack_of[block] = target
+        
+        key = self.block_keys[block]
+        self.hash ^= (key * self.support_keys[old_support] & self.MASK) ^ (key * self.support_keys[new_support] & self.MASK)
+        if self.goal_on is not None:
+            self.matched += (new_support == self.goal_on[block]) - (old_support == self.goal_on[block])
+        return block, source, target
+
+    def undo(self, action):
+        """Take back a move returned by move"""
+        block, source, _ = action
+        self.move(block, source)
+
+    def moves(self):
+        """Every legal action as (block, source_stack, target_stack)"""
+        for source, block in enumerate(self.top):
+            if block < 0:
+                continue
+            for target in range(len(self.top)):
+                if target != source:
+                    yield block, source, target
+
+    def set_goal(self, goal_config):
+        """Track how many blocks sit on their goal support so is_goal is O(1)"""
+        n = len(self.on)
+        below = {(stack, height): self.index[block] for block, (stack, height) in goal_config.items()}
+        self.goal_on = array('i', [0] * n)
+        for name, (stack, height) in goal_config.items():
+            self.goal_on[self.index[name]] = below[(stack, height - 1)] if height > 0 else n + stack
+        self.matched = sum(1 for block in range(n) if self.on[block] == self.goal_on[block])
+
+    def is_goal(self):
+        """Whether every block sits on its goal support (needs set_goal)"""
+        return self.matched == len(self.on)
+
+    def key(self):
+        """Immutable snapshot of the state, for exact comparisons and table keys"""
+        return self.on.tobytes()
+
+    def restore(self, key, hash_value):
+        """Go back to a snapshot taken with key, whose hash was hash_value, in O(n)"""
+        n = len(self.on)
+        self.on = array('i')
+        self.on.frombytes(key)
+        above = [-1] * (n + len(self.top))
+        for block in range(n):
+            above[self.on[block]] = block
+        for stack in range(len(self.top)):
+            top = -1
+            block = above[n + stack]
+            while block >= 0:
+                self.stack_of[block] = stack
+                top = block
+                block = above[block]
+            self.top[stack] = top
+        self.hash = hash_value
+        if self.goal_on is not None:
+            self.matched = sum(1 for block in range(n) if self.on[block] == self.goal_on[block])
+
+    def stack_blocks(self, stack):
+        """Block indices of one stack, bottom to top"""
+        n = len(self.on)
+        blocks = []
+        block = self.top[stack]
+        while block >= 0:
+            blocks.append(block)
+            block = self.on[block] if self.on[block] < n else -1
+        return blocks[::-1]
+
+    def stacks(self):
+        """The stacks as lists of block names (bottom to top)"""
+        return [[self.names[block] for block in self.stack_blocks(stack)] for stack in range(len(self.top))]
+
+    def named(self, action):
+        """Action record with the block's name instead of its index"""
+        block, source, target = action
+        return self.names[block], source, target
+
+    def __hash__(self):
+        return self.hash
+
+    def __eq__(self, other):
+        return isinstance(other, BlockState) and self.on == other.on
+
+
+class ParkingIndex:
+    """
+    Stacks kept sorted by (deadline, height), for choosing where to park a block
+    
+    A stack's deadline is the earliest point in the build order at which
+    something in it is needed. Updating one stack is a bisect and a list
+    insert, so no move has to scan every stack.
+    """
+
+    def __init__(self, keys):
+        """keys: (deadline, height, stack) for every stack, in stack order"""
+        self.keys = list(keys)
+        self.order = sorted(self.keys)
+
+    def update(self, stack, deadline, height):
+        """Re-file a stack under its new deadline and height"""
+        del self.order[bisect.bisect_left(self.order, self.keys[stack])]
+        self.keys[stack] = (deadline, height, stack)
+        bisect.insort(self.order, self.keys[stack])
+
+    def select(self, rank, avoid):
+        """
+        Stack to park a block of the given rank on, never one in avoid
+        
+        Prefers the stack with the earliest deadline after rank, so the
+        block is gone before anything under it is needed, and other stacks
+        are kept free for later blocks. Failing that, it takes the stack
+        that is needed last.
+        """
+        start = bisect.bisect_left(self.order, (rank + 1,))
+        for _, _, stack in itertools.islice(self.order, start, None):
+            if stack not in avoid:
+                return stack
+        for _, _, stack in reversed(self.order):
+            if stack not in avoid:
+                return stack
+        return None
+
+
 class BlockWorld:
     def __init__(self):
         self.stacks = []  # List of stacks, each stack is a list of blocks (bottom to top)
         self.block_positions = {}  # Maps block name to (stack_index, height_in_stack)
-        self.actions = []  # List of actions for the solution
+        self.actions = []  # (block, source_stack, target_stack) records of the solution
+        self.nodes_expanded = 0  # States expanded by the last optimal search
 
     def add_stack(self):
         """Add a new empty stack"""
@@ -53,7 +284,7 @@ class BlockWorld:
         self.block_positions[block_name] = (target_stack_index, new_height)
         
         # Record action
-        self.actions.append(f"Move {block_name} from stack {source_stack_index} to stack {target_stack_index}")
+        self.actions.append((block_name, source_stack_index, target_stack_index))
         return True
 
     def is_on_top(self, block_name):
@@ -180,15 +411,51 @@ class BlockWorld:
         
         return goal_config
 
-    def solve(self, goal_config):
+    def solve(self, goal_config, mode='greedy'):
         """
-        Solve the block world problem using a simple algorithm:
-        1. Clear blocks that need to be moved
-        2. Move blocks to their goal positions
+        Solve the block world problem and print the solution, using:
+        'greedy' - the simple clear-and-move algorithm
+        'optimal' - the shortest plan, found by A*
+        'large' - a fast heuristic plan meant for thousands of blocks
         """
         print("\n=== Solving Block World Problem ===")
         self.actions = []  # Reset actions list
         
+        if mode == 'optimal':
+            plan = self.plan_optimal(goal_config)
+            if plan is None:
+                print("Error: The goal state cannot be reached!")
+                return
+            for block, _, target_stack in plan:
+                self.move_block(block, target_stack)
+            print(f"Optimal plan: {len(plan)} moves, {self.nodes_expanded} states expanded")
+        elif mode == 'large':
+            if not self.solve_large(goal_config):
+                print("Error: The goal state cannot be reached!")
+                return
+        else:
+            self.solve_greedy(goal_config)
+        
+        # Verify goal state
+        if self.is_goal_state(goal_config):
+            print("\n=== Solution ===")
+            if not self.actions:
+                print("The initial state is already the goal state!")
+            else:
+                for i, action in enumerate(self.actions):
+                    print(f"Step {i+1}: {format_action(action)}")
+            
+            print("\n=== Final State ===")
+            self.print_state()
+        else:
+            print("Error: Failed to reach goal state!")
+
+    def solve_greedy(self, goal_config):
+        """
+        Simple algorithm:
+        1. Clear blocks that need to be moved
+        2. Move blocks to their goal positions
+        """
         # First, handle blocks that are not in the correct position
         for block, (goal_stack, goal_height) in goal_config.items():
             current_stack, current_height = self.block_positions[block]
@@ -219,20 +486,352 @@ class BlockWorld:
                 if goal_height < len(target_stack) - 1:
                     # We'll implement this if needed
                     pass
+
+    def goal_stacks(self, goal_config):
+        """Goal configuration as a list of stacks (bottom to top), or None if it is not complete"""
+        if sum(map(len, self.stacks)) != len(self.block_positions):
+            return None  # A block name is used twice, so blocks cannot be told apart
+        goal_stacks = [[] for _ in range(len(self.stacks))]
+        for block, (stack_idx, height) in sorted(goal_config.items(), key=lambda item: item[1]):
+            if stack_idx >= len(self.stacks) or height != len(goal_stacks[stack_idx]):
+                return None  # Unknown stack or a gap under the block
+            goal_stacks[stack_idx].append(block)
+        if set(goal_config) != set(self.block_positions):
+            return None  # Every block needs exactly one goal position
+        return goal_stacks
+
+    def plan_optimal(self, goal_config, max_nodes=None):
+        """
+        Find a shortest plan with A* search over BlockState states
         
-        # Verify goal state
-        if self.is_goal_state(goal_config):
-            print("\n=== Solution ===")
-            if not self.actions:
-                print("The initial state is already the goal state!")
+        The heuristic counts every block that is not yet in its final
+        position (the correct stack with correct blocks all the way down).
+        A block counts twice when it must move once to get out of the way
+        and again to reach its goal: if it sits in its goal stack, or above
+        a block that belongs under it in the goal. A block's count only
+        depends on the blocks below it, so a move only changes the count of
+        the block that moved, by at most one.
+        
+        A block counted once has to go straight to its final position, so
+        it must get there before any unplaced block beneath it moves, and
+        after every block that belongs under it in the goal. Blocks whose
+        orderings form a cycle cannot all move just once: each disjoint
+        cycle adds one more move. This part is only worked out when a state
+        is taken off the open list, and the heuristic stays admissible, so
+        a state is reopened if a shorter path to it turns up. The first
+        plan found is optimal.
+        
+        When a top block can go straight to its final position, that move
+        is the only one tried: some shortest plan always starts with it.
+        
+        The search runs on a single BlockState: each child is an O(1) move
+        that is hashed and undone again. The transposition table is keyed
+        by the Zobrist hash, with the stacks that are empty in the goal
+        marked spare so that they are interchangeable, and keeps only each
+        state's compact key, from which the state is restored when it is
+        expanded.
+        
+        Optimal planning is NP-hard, and the cost grows with the length of
+        the plan more than with the number of blocks: 15-20 block problems
+        whose plans are about 15 moves or shorter solve in well under a
+        second, while random 15-20 block problems (plans of 20-30 moves)
+        can need hundreds of thousands of expansions, so give those a
+        max_nodes budget or use solve_large.
+        
+        goal_config maps each block to its goal (stack_index, height_in_stack).
+        Returns the plan as (block, source_stack, target_stack) moves, or
+        None if the goal cannot be reached or max_nodes states were expanded.
+        """
+        self.nodes_expanded = 0
+        goal = self.goal_stacks(goal_config)
+        if goal is None:
+            return None
+        spare = [i for i, stack in enumerate(goal) if not stack]
+        spare_set = set(spare)
+        state = BlockState(self.stacks, spare=spare)
+        goal_stack = [goal_config[name][0] for name in state.names]
+        goal_height = [goal_config[name][1] for name in state.names]
+        n_stacks = len(goal)
+
+        def block_cost(i, correct, lowest, height, block):
+            # Moves the block still needs if it is put at this height on stack i,
+            # given whether everything below is a correct goal prefix and the
+            # lowest goal height per goal stack among the blocks below
+            if goal_stack[block] == i:
+                return 0 if correct and goal_height[block] == height else 2
+            return 2 if lowest.get(goal_stack[block], goal_height[block]) < goal_height[block] else 1
+
+        def scan(i, stack):
+            # Returns (cost of the whole stack, cost of its top block, whether
+            # it is a correct goal prefix, lowest goal height per goal stack)
+            cost = top_cost = 0
+            correct = True
+            lowest = {}
+            for height, block in enumerate(stack):
+                top_cost = block_cost(i, correct, lowest, height, block)
+                cost += top_cost
+                correct = correct and top_cost == 0
+                if goal_height[block] < lowest.get(goal_stack[block], goal_height[block] + 1):
+                    lowest[goal_stack[block]] = goal_height[block]
+            return cost, top_cost, correct, lowest
+
+        def shortest_cycle(graph):
+            # Blocks on a shortest cycle of the "must be final before" graph, or None
+            best = None
+            for start in graph:
+                parent = {start: None}
+                frontier = [start]
+                while frontier and parent[start] is None:
+                    next_frontier = []
+                    for block in frontier:
+                        for after in graph[block]:
+                            if after == start:
+                                parent[start] = block
+                                break
+                            if after not in parent and after in graph:
+                                parent[after] = block
+                                next_frontier.append(after)
+                        if parent[start] is not None:
+                            break
+                    frontier = next_frontier
+                if parent[start] is not None:
+                    cycle = [parent[start]]
+                    while cycle[-1] != start:
+                        cycle.append(parent[cycle[-1]])
+                    if best is None or len(cycle) < len(best):
+                        best = cycle
+                        if len(best) == 2:
+                            break
+            return best
+
+        def deadlocks():
+            # Number of disjoint ordering cycles among the blocks counted once
+            once = {}  # Goal stack -> [(goal height, block)] for blocks counted once
+            waits = []  # (block counted once, lowest goal height per goal stack of unplaced blocks below it)
+            for i in range(n_stacks):
+                correct = True
+                lowest = {}
+                unplaced = {}
+                for height, block in enumerate(state.stack_blocks(i)):
+                    cost = block_cost(i, correct, lowest, height, block)
+                    correct = correct and cost == 0
+                    if cost == 1:
+                        once.setdefault(goal_stack[block], []).append((goal_height[block], block))
+                        if unplaced:
+                            waits.append((block, dict(unplaced)))
+                    if goal_height[block] < lowest.get(goal_stack[block], goal_height[block] + 1):
+                        lowest[goal_stack[block]] = goal_height[block]
+                    if cost and goal_height[block] < unplaced.get(goal_stack[block], goal_height[block] + 1):
+                        unplaced[goal_stack[block]] = goal_height[block]
+            if not waits:
+                return 0
+            # block -> blocks that can only be placed after it
+            graph = {block: [after for stack, low in below.items()
+                             for height, after in once.get(stack, ()) if height > low]
+                     for block, below in waits}
+            count = 0
+            while graph:
+                cycle = shortest_cycle(graph)
+                if cycle is None:
+                    break
+                count += 1
+                graph = {block: after for block, after in graph.items() if block not in cycle}
+            return count
+
+        def replay(entry):
+            # Follow the parent hashes back to the start, then replay the moves
+            # from there; a move onto a spare stack names the block it went on
+            # (or -1 for an empty stack), as spare stacks may have been swapped
+            moves = []
+            while entry[1] is not None:
+                moves.append(entry[2])
+                entry = table[entry[1]]
+            state.restore(start_key, start_hash)
+            plan = []
+            for block, target, spare_top in reversed(moves):
+                if spare_top is not None:
+                    target = next(stack for stack in spare
+                                  if stack != state.stack_of[block] and state.top[stack] == spare_top)
+                plan.append(state.named(state.move(block, target)))
+            return plan
+
+        start_hash = state.hash
+        start_key = state.key()
+        # Transposition table: hash -> [g, parent hash, move, state key, closed, deadlocks]
+        table = {start_hash: [0, None, None, start_key, False, None]}
+        counter = 0  # Tie-breaker so the heap never compares hashes
+        start_h = sum(scan(i, state.stack_blocks(i))[0] for i in range(n_stacks))
+        open_heap = [(start_h, 0, counter, start_hash)]
+        
+        while open_heap:
+            f, neg_g, _, state_hash = heapq.heappop(open_heap)
+            entry = table[state_hash]
+            g, _, _, key, closed, extra = entry
+            if closed or -neg_g != g:
+                continue  # Stale heap entry
+            state.restore(key, state_hash)
+            if extra is None:
+                extra = entry[5] = deadlocks()
+                if extra:
+                    counter += 1
+                    heapq.heappush(open_heap, (f + extra, neg_g, counter, state_hash))
+                    continue
+            if f == g:  # Heuristic is zero only at the goal
+                return replay(entry)
+            entry[4] = True
+            self.nodes_expanded += 1
+            if max_nodes is not None and self.nodes_expanded > max_nodes:
+                return None
+            
+            h = f - g - extra  # Children start from the per-block counts only
+            stacks = [state.stack_blocks(i) for i in range(n_stacks)]
+            info = [scan(i, stack) for i, stack in enumerate(stacks)]
+            moves = []
+            for source in range(n_stacks):
+                block = state.top[source]
+                if block < 0:
+                    continue
+                for target in range(n_stacks):
+                    if target == source:
+                        continue
+                    _, _, correct, lowest = info[target]
+                    cost = block_cost(target, correct, lowest, len(stacks[target]), block)
+                    child_h = h - info[source][1] + cost
+                    if cost == 0:
+                        moves = [(block, target, child_h)]  # Straight to its final position
+                        break
+                    moves.append((block, target, child_h))
+                else:
+                    continue
+                break
+            
+            for block, target, child_h in moves:
+                spare_top = state.top[target] if target in spare_set else None
+                action = state.move(block, target)
+                child_entry = table.get(state.hash)
+                if child_entry is None or child_entry[0] > g + 1:
+                    table[state.hash] = [g + 1, state_hash, (block, target, spare_top), state.key(), False, None]
+                    counter += 1
+                    heapq.heappush(open_heap, (g + 1 + child_h, -(g + 1), counter, state.hash))
+                state.undo(action)
+        return None
+
+    def solve_large(self, goal_config):
+        """
+        Reach the goal quickly on large instances, without searching
+        
+        Blocks are placed in a fixed build order: goal stack by goal stack,
+        bottom to top. For the next block in that order, its goal stack is
+        cleared down to the finished part, the block is dug out and then
+        placed. Any block that can go straight to its final position does
+        so, whenever that becomes possible. Other blocks that are in the
+        way get parked. They go on a stack whose deadline is later than
+        their own rank, where the deadline is the rank of the first thing
+        in that stack still needed. A block parked that way is gone before
+        its stack is touched again. So once the initial disorder is cleared
+        away, most blocks move at most twice: parked once, then placed.
+        Finished blocks never move again.
+        
+        Each move updates the per-block finished flags, the running
+        minimum rank down every stack and the stack's place in a
+        ParkingIndex. All of these cost O(1) or a bisect.
+        
+        Needs at least three stacks, so there is always somewhere to park.
+        Smaller worlds are handed to plan_optimal, whose state space is tiny.
+        Returns True once the goal state is reached, False if it cannot be.
+        """
+        goal = self.goal_stacks(goal_config)
+        if goal is None:
+            return False
+        if len(self.stacks) < 3:
+            plan = self.plan_optimal(goal_config)
+            if plan is None:
+                return False
+            for block, _, target_stack in plan:
+                self.move_block(block, target_stack)
+            return True
+        
+        build_order = [block for goal_stack in goal for block in goal_stack]
+        rank = {block: i for i, block in enumerate(build_order)}
+        never = len(build_order)  # Deadline of a stack nothing will be needed from
+        
+        # done[s]: how many blocks at the bottom of stack s are in their final position
+        done = []
+        for stack, goal_stack in zip(self.stacks, goal):
+            count = 0
+            while count < min(len(stack), len(goal_stack)) and stack[count] == goal_stack[count]:
+                count += 1
+            done.append(count)
+        final = {block: self.block_positions[block][1] < done[self.block_positions[block][0]]
+                 for block in build_order}
+        # needed[s][h]: lowest rank among the unfinished blocks at heights 0..h of stack s
+        needed = []
+        for stack in self.stacks:
+            lowest = never
+            needed.append([])
+            for block in stack:
+                if not final[block]:
+                    lowest = min(lowest, rank[block])
+                needed[-1].append(lowest)
+        
+        def deadline(s):
+            waiting = rank[goal[s][done[s]]] if done[s] < len(goal[s]) else never
+            return min(needed[s][-1], waiting) if needed[s] else waiting
+        
+        parking = ParkingIndex((deadline(s), len(stack), s) for s, stack in enumerate(self.stacks))
+        ready = list(range(len(goal)))  # Stacks that may be able to take their next block now
+        
+        def can_place(s):
+            # Stack s holds only its finished part and its next block is clear
+            if done[s] == len(goal[s]) or len(self.stacks[s]) != done[s]:
+                return False
+            return self.is_on_top(goal[s][done[s]])
+        
+        def move(block, target):
+            source = self.block_positions[block][0]
+            self.move_block(block, target)
+            needed[source].pop()
+            below = needed[target][-1] if needed[target] else never
+            if goal_config[block] == (target, done[target]) and len(self.stacks[target]) == done[target] + 1:
+                final[block] = True
+                done[target] += 1
+                needed[target].append(below)
+                ready.append(target)
             else:
-                for i, action in enumerate(self.actions):
-                    print(f"Step {i+1}: {action}")
+                needed[target].append(min(below, rank[block]))
+            parking.update(source, deadline(source), len(self.stacks[source]))
+            parking.update(target, deadline(target), len(self.stacks[target]))
+            # The source stack may be cleared down to its finished part, and
+            # its new top may be the next block some goal stack is waiting for
+            ready.append(source)
+            if self.stacks[source]:
+                ready.append(goal_config[self.stacks[source][-1]][0])
+        
+        def relocate(block, avoid):
+            goal_stack = goal_config[block][0]
+            if goal_stack not in avoid and can_place(goal_stack) and goal[goal_stack][done[goal_stack]] == block:
+                move(block, goal_stack)
+            else:
+                move(block, parking.select(rank[block], avoid))
+        
+        for block in build_order:
+            while ready and not final[block]:
+                s = ready.pop()
+                if can_place(s):
+                    move(goal[s][done[s]], s)
+            if final[block]:
+                continue
             
-            print("\n=== Final State ===")
-            self.print_state()
-        else:
-            print("Error: Failed to reach goal state!")
+            # Every block before this one is finished, so its goal stack is
+            # finished right up to where it goes
+            target = goal_config[block][0]
+            while len(self.stacks[target]) > done[target]:
+                relocate(self.stacks[target][-1], {target, self.block_positions[block][0]})
+            while not self.is_on_top(block):
+                source = self.block_positions[block][0]
+                relocate(self.stacks[source][-1], {target, source})
+            move(block, target)
+        return True
 
     def clear_block(self, block_name):
         """Move all blocks above the specified block to temporary stacks"""
@@ -258,7 +857,158 @@ class BlockWorld:
         # Move the block
         self.move_block(block_name, min_stack_idx)
 
+def solve_problem(problem, mode='large'):
+    """
+    Solve one batch problem without printing anything
+    
+    The problem has 'stacks' and 'goal' (lists of stacks, each a list of
+    blocks from bottom to top). It may also have an 'id', a 'mode' that
+    overrides the default, and 'max_nodes' for optimal mode. The result
+    holds the id, status, plan as [block, source, target] moves, plan
+    length, states expanded and wall time in seconds. A problem that is
+    not well formed (repeated blocks, a goal that does not use exactly the
+    initial blocks, an unknown mode) or that greedy mode trips over gets
+    status 'error' and a message under 'error' instead.
+    """
+    if not isinstance(problem, dict):
+        return _error_result(None, f"Problem must be an object, not {type(problem).__name__}")
+    problem_id = problem.get('id')
+    mode = problem.get('mode', mode)
+    if mode not in SOLVE_MODES:
+        return _error_result(problem_id, f"Unknown mode: {mode}")
+    initial_blocks = [block for stack in problem['stacks'] for block in stack]
+    goal_blocks = [block for stack in problem['goal'] for block in stack]
+    if len(set(initial_blocks)) != len(initial_blocks):
+        return _error_result(problem_id, "A block appears more than once in the initial stacks")
+    if sorted(goal_blocks) != sorted(initial_blocks):
+        return _error_result(problem_id, "The goal must hold exactly the initial blocks")
+    
+    world = BlockWorld()
+    n_stacks = max(len(problem['stacks']), len(problem['goal']))
+    for _ in range(n_stacks):
+        world.add_stack()
+    for stack_idx, stack in enumerate(problem['stacks']):
+        for block in stack:
+            world.add_block(block, stack_idx)
+    goal_config = {block: (stack_idx, height) for stack_idx, stack in enumerate(problem['goal'])
+                   for height, block in enumerate(stack)}
+    
+    start = time.perf_counter()
+    if mode == 'optimal':
+        plan = world.plan_optimal(goal_config, problem.get('max_nodes'))
+        for block, _, target_stack in plan or []:
+            world.move_block(block, target_stack)
+        solved = plan is not None
+    elif mode == 'large':
+        solved = world.solve_large(goal_config)
+    else:
+        # Greedy mode reports illegal moves on stdout; keep them for the result
+        messages = io.StringIO()
+        with contextlib.redirect_stdout(messages):
+            world.solve_greedy(goal_config)
+        solved = world.is_goal_state(goal_config)
+        if not solved and messages.getvalue():
+            return _error_result(problem_id, messages.getvalue().splitlines()[0].removeprefix("Error: "))
+    seconds = time.perf_counter() - start
+    
+    return {
+        'id': problem_id,
+        'status': 'solved' if solved else 'failed',
+        'plan': [list(action) for action in world.actions] if solved else None,
+        'plan_length': len(world.actions) if solved else None,
+        'nodes_expanded': world.nodes_expanded,
+        'time': round(seconds, 6),
+    }
+
+
+def _error_result(problem_id, message):
+    """Result for a batch problem that could not be solved at all"""
+    return {'id': problem_id, 'status': 'error', 'error': message}
+
+
+def _solve_lines(lines, mode):
+    """Worker task: solve a chunk of (line number, JSON text) problems"""
+    results = []
+    for line_number, line in lines:
+        try:
+            problem = json.loads(line)
+            result = solve_problem(problem, mode)
+            if result['id'] is None:
+                result['id'] = line_number
+        except (ValueError, KeyError, TypeError) as e:
+            result = _error_result(line_number, str(e))
+        results.append(result)
+    return results
+
+
+def run_batch(input_path, output_path, workers=None, mode='large', chunk_size=32):
+    """
+    Solve every problem in a JSONL file and write one JSON result per line
+    
+    Problems are read lazily and handed to a process pool in chunks, with
+    a bounded number of chunks in flight, so memory stays flat however big
+    the file is. Results come out in input order. Lines that are not
+    valid problems get an 'error' result instead of stopping the run.
+    
+    workers defaults to the CPU count, and 1 solves everything in this
+    process. mode is used for problems that do not name one (see
+    solve_problem); an unknown one raises ValueError. Returns a summary
+    with the number of problems, how many were solved, the total moves and
+    the wall time.
+    """
+    if mode not in SOLVE_MODES:
+        raise ValueError(f"Unknown mode: {mode}")
+    workers = workers or os.cpu_count() or 1
+    summary = {'problems': 0, 'solved': 0, 'moves': 0, 'time': 0.0}
+    start = time.perf_counter()
+    
+    def chunks(f):
+        chunk = []
+        for line_number, line in enumerate(f, 1):
+            if line.strip():
+                chunk.append((line_number, line))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    def write(results, out):
+        for result in results:
+            summary['problems'] += 1
+            if result['status'] == 'solved':
+                summary['solved'] += 1
+                summary['moves'] += result['plan_length']
+            out.write(json.dumps(result) + "\n")
+    
+    with open(input_path) as f, open(output_path, 'w') as out:
+        if workers == 1:
+            for chunk in chunks(f):
+                write(_solve_lines(chunk, mode), out)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                in_flight = deque()
+                for chunk in chunks(f):
+                    in_flight.append(executor.submit(_solve_lines, chunk, mode))
+                    if len(in_flight) >= 4 * workers:
+                        write(in_flight.popleft().result(), out)
+                while in_flight:
+                    write(in_flight.popleft().result(), out)
+    
+    summary['time'] = round(time.perf_counter() - start, 3)
+    return summary
+
+
 def main():
+    # Non-interactive batch mode: BlockWorld.py problems.jsonl results.jsonl [workers] [mode]
+    if len(sys.argv) > 2:
+        workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+        mode = sys.argv[4] if len(sys.argv) > 4 else 'large'
+        summary = run_batch(sys.argv[1], sys.argv[2], workers, mode)
+        print(f"Solved {summary['solved']}/{summary['problems']} problems "
+              f"({summary['moves']} moves) in {summary['time']}s")
+        return
+    
     world = BlockWorld()
     
     # Set up initial state
@@ -268,7 +1018,8 @@ def main():
     goal_config = world.get_goal_state()
     
     # Solve the problem
-    world.solve(goal_config)
+    mode = input("\nSolve mode (greedy/optimal/large) [greedy]: ").strip().lower() or 'greedy'
+    world.solve(goal_config, mode)
 
 if __name__ == "__main__":
     main()
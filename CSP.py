@@ -1,18 +1,265 @@
+import bisect
+import heapq
+import multiprocessing
+import operator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import os
+import queue
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+
+PORTFOLIO_POLL = 0.05  # Seconds between checks on the portfolio workers
+PORTFOLIO_GRACE = 1.0  # Seconds workers get to report after being told to stop
+
+
+class SearchAborted(Exception):
+    """Raised inside the search when its backtrack limit is hit or it is told to stop"""
+
+
+def luby(i):
+    """i-th term (1-based) of the Luby restart sequence: 1 1 2 1 1 2 4 1 1 2 ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    if i == (1 << k) - 1:
+        return 1 << (k - 1)
+    # Otherwise i lies in the repeated prefix of the current block
+    return luby(i - (1 << (k - 1)) + 1)
+
+
+def not_equal(x, y):
+    """Binary not-equal check, recognised by the solver's fast paths"""
+    return x != y
+
+
+class TableCheck:
+    """Callable check for a table constraint: (x, y) must be one of the allowed pairs"""
+    __slots__ = ('allowed', 'row_masks', 'column_masks')
+    
+    def __init__(self, allowed):
+        self.allowed = frozenset(allowed)
+        self.row_masks = None  # Maps x to the bitmask of y values allowed with it
+        self.column_masks = None  # Maps y to the bitmask of x values allowed with it
+    
+    def __call__(self, x, y):
+        return (x, y) in self.allowed
+    
+    def build_masks(self, value_bits):
+        """Build the support bitmasks used by the compact fast paths"""
+        self.row_masks = {}
+        self.column_masks = {}
+        for x, y in self.allowed:
+            if x in value_bits and y in value_bits:
+                self.row_masks[x] = self.row_masks.get(x, 0) | value_bits[y]
+                self.column_masks[y] = self.column_masks.get(y, 0) | value_bits[x]
+
+
+class SwappedCheck:
+    """Callable check with its arguments swapped, used for the reverse arc of a constraint"""
+    __slots__ = ('check',)
+    
+    def __init__(self, check):
+        self.check = check
+    
+    def __call__(self, x, y):
+        return self.check(y, x)
+
+
+class Constraint:
+    """Base class for typed constraints over a tuple of variables (its scope)"""
+    def __init__(self, scope):
+        self.scope = tuple(scope)
+    
+    def arcs(self):
+        """Yield the (variable, neighbor, check) arcs the solver compiles this constraint into"""
+        raise NotImplementedError
+
+
+class NotEqual(Constraint):
+    """x and y must take different values"""
+    def __init__(self, x, y):
+        super().__init__((x, y))
+    
+    def arcs(self):
+        x, y = self.scope
+        yield x, y, not_equal
+        yield y, x, not_equal
+
+
+class AllDifferent(Constraint):
+    """Every variable in the scope must take a different value"""
+    def arcs(self):
+        for i, x in enumerate(self.scope):
+            for y in self.scope[i + 1:]:
+                yield x, y, not_equal
+                yield y, x, not_equal
+
+
+class TableConstraint(Constraint):
+    """(x, y) must take one of the allowed value pairs"""
+    def __init__(self, x, y, allowed):
+        super().__init__((x, y))
+        self.allowed = frozenset(allowed)
+    
+    def arcs(self):
+        x, y = self.scope
+        yield x, y, TableCheck(self.allowed)
+        yield y, x, TableCheck((b, a) for a, b in self.allowed)
+
+
+class FunctionConstraint(Constraint):
+    """Generic binary constraint: check(x_value, y_value) must be true"""
+    def __init__(self, x, y, check):
+        super().__init__((x, y))
+        self.check = check
+    
+    def arcs(self):
+        x, y = self.scope
+        yield x, y, self.check
+        yield y, x, SwappedCheck(self.check)
+
+
+class MRVQueue:
+    """
+    Bucket queue of unassigned variables for the MRV heuristic
+    
+    Variables are kept in buckets indexed by their number of remaining values,
+    and inside a bucket sorted by their position in the variable order, so the
+    next variable to assign is found by scanning at most max_size + 1 buckets
+    instead of every variable. Ties go to the earliest variable, exactly as
+    min() over the variable order picks them.
+    """
+    def __init__(self, max_size, order):
+        self.buckets = [[] for _ in range(max_size + 1)]  # size -> sorted ranks
+        self.order = list(order)  # Variable at each rank
+        self.rank = {var: i for i, var in enumerate(self.order)}
+        self.size = {}  # Current bucket of each queued variable
+    
+    def __len__(self):
+        return len(self.size)
+    
+    def __contains__(self, var):
+        return var in self.size
+    
+    def add(self, var, size):
+        """Queue var with the given number of remaining values"""
+        self.size[var] = size
+        bisect.insort(self.buckets[size], self.rank[var])
+    
+    def remove(self, var):
+        """Take var out of the queue"""
+        bucket = self.buckets[self.size.pop(var)]
+        del bucket[bisect.bisect_left(bucket, self.rank[var])]
+    
+    def update(self, var, size):
+        """Move a queued variable to the bucket for its new remaining-values count"""
+        if self.size[var] != size:
+            self.remove(var)
+            self.add(var, size)
+    
+    def select(self):
+        """Return the variable with fewest remaining values, earliest in the order on ties"""
+        for bucket in self.buckets:
+            if bucket:
+                return self.order[bucket[0]]
+        return None
+
+
+class RandomAccessSet:
+    """Set with O(1) add, discard and uniform random choice"""
+    def __init__(self):
+        self.items = []
+        self.position = {}
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def __contains__(self, item):
+        return item in self.position
+    
+    def add(self, item):
+        if item not in self.position:
+            self.position[item] = len(self.items)
+            self.items.append(item)
+    
+    def discard(self, item):
+        index = self.position.pop(item, None)
+        if index is None:
+            return
+        # Move the last item into the hole
+        last = self.items.pop()
+        if index < len(self.items):
+            self.items[index] = last
+            self.position[last] = index
+    
+    def choice(self, rng):
+        return self.items[rng.randrange(len(self.items))]
+
+
 class CSP:
-    def __init__(self, variables, domains, constraints):
+    def __init__(self, variables, domains, constraints, propagation=None, incremental_mrv=False,
+                 compact=False, seed=None):
         """
         Initialize a CSP problem
         
         Args:
             variables: List of variables in the problem
             domains: Dictionary mapping variables to their possible values
-            constraints: Dictionary mapping variables to their constraints
+            constraints: List of Constraint objects, or a dictionary mapping
+                variables to {'neighbor': ..., 'check': ...} constraint dicts
+            propagation: None for plain backtracking, 'forward_checking' to prune
+                neighbour domains after each assignment, or 'ac3' to maintain
+                arc consistency after each assignment
+            incremental_mrv: Keep unassigned variables in an MRVQueue updated
+                from the neighbours touched by each assignment, instead of
+                recounting every domain on each variable selection
+            compact: Intern domain values to bit positions and keep each live
+                domain as an int bitmask; implies forward checking when no
+                propagation mode is given
+            seed: When given, randomise variable tie-breaking and value order
+                with this seed (used by restarts and the portfolio)
         """
+        if propagation not in (None, 'forward_checking', 'ac3'):
+            raise ValueError(f"Unknown propagation mode: {propagation}")
+        if compact and propagation is None:
+            propagation = 'forward_checking'
+        
         self.variables = variables
         self.domains = domains
         self.constraints = constraints
+        self.propagation = propagation
         self.assignment = {}  # Current assignment of values
         self.backtrack_count = 0  # Count of backtrack operations
+        self.prune_count = 0  # Count of values removed by propagation
+        self.current_domains = None  # Live domains while propagating
+        self.trail = []  # Undo trail of (variable, value) pairs removed from current_domains
+        self.compact = compact
+        self.value_list = []  # Interned values, indexed by bit position (compact mode)
+        self.value_bits = {}  # Maps value to its bit (compact mode)
+        self.ne_neighbors = None  # Maps variable to the neighbours it must differ from
+        self.arcs = None  # Maps variable to its other (neighbor, check) arcs
+        self.incoming = None  # Maps variable to (other, check) arcs pointing at it
+        self.adjacent = None  # Maps variable to its distinct constraint neighbours
+        self.incremental_mrv = incremental_mrv
+        self.mrv_queue = None
+        self.mrv_naive_checks = 0  # Value checks a full MRV rescan would have made
+        self.mrv_update_checks = 0  # Value checks made by incremental MRV updates
+        self.unassigned_values = 0  # Total domain size of unassigned variables
+        self.seed = seed
+        self.random = random.Random(seed) if seed is not None else None
+        self.variable_order = variables  # Order used to break MRV ties
+        self.node_count = 0  # Count of search nodes visited
+        self.restart_count = 0
+        self.step_count = 0  # Count of local search moves
+        self.backtrack_limit = None  # Abort once backtrack_count reaches this
+        self.stop_event = None  # Abort once this (multiprocessing) event is set
+        self.portfolio_stats = []  # Per-worker statistics from portfolio_search
+        self.component_count = 0  # Components found by solve_by_components
+        self.compile_constraints()
         
     def is_complete(self):
         """Check if the current assignment is complete"""
@@ -20,19 +267,37 @@ class CSP:
     
     def is_consistent(self, variable, value):
         """Check if assigning value to variable is consistent with current assignment"""
-        # Check all constraints involving variable
-        for constraint in self.constraints.get(variable, []):
-            neighbor = constraint['neighbor']
-            if neighbor in self.assignment:
+        assignment = self.assignment
+        for neighbor in self.ne_neighbors[variable]:
+            if neighbor in assignment and assignment[neighbor] == value:
+                return False
+        
+        # Check the remaining constraints involving variable
+        for neighbor, check in self.arcs[variable]:
+            if neighbor in assignment:
                 # If the constraint is violated, return False
-                if not constraint['check'](value, self.assignment[neighbor]):
+                if not check(value, assignment[neighbor]):
                     return False
         return True
     
+    def consistent_values(self, variable, values):
+        """Filter values down to those consistent with the current assignment, in one pass"""
+        assignment = self.assignment
+        # Not-equal neighbours are checked all at once against the set of values they hold
+        taken = {assignment[n] for n in self.ne_neighbors[variable] if n in assignment}
+        arcs = [(check, assignment[n]) for n, check in self.arcs[variable] if n in assignment]
+        return [value for value in values
+                if value not in taken and all(check(value, other) for check, other in arcs)]
+    
     def select_unassigned_variable(self):
         """Select an unassigned variable - using minimum remaining values (MRV) heuristic"""
+        if self.mrv_queue is not None:
+            # A full rescan would check every value of every unassigned variable
+            self.mrv_naive_checks += self.unassigned_values
+            return self.mrv_queue.select()
+        
         # Find unassigned variables
-        unassigned = [v for v in self.variables if v not in self.assignment]
+        unassigned = [v for v in self.variable_order if v not in self.assignment]
         
         if not unassigned:
             return None
@@ -42,46 +307,1044 @@ class CSP:
     
     def get_remaining_values(self, variable):
         """Get domain values that are still valid for variable"""
-        return [value for value in self.domains[variable] 
-                if self.is_consistent(variable, value)]
+        if self.current_domains is not None:
+            # Propagation has already removed every value that conflicts
+            # with the assigned neighbours
+            return self.domain_values(variable)
+        return self.consistent_values(variable, self.domains[variable])
     
     def backtracking_search(self):
         """Backtracking search algorithm"""
+        if self.random is not None:
+            self.variable_order = self.random.sample(self.variables, len(self.variables))
+        
+        if self.propagation is not None:
+            self.setup_propagation()
+            if self.propagation == 'ac3' and not self.ac3():
+                return None
+        
+        if self.incremental_mrv:
+            self.setup_mrv_queue()
+        self.ensure_recursion_depth()
         return self._backtrack()
     
+    def ensure_recursion_depth(self):
+        """The search recurses once or twice per variable: make sure large maps fit"""
+        needed = 2 * len(self.variables) + 1000
+        if sys.getrecursionlimit() < needed:
+            sys.setrecursionlimit(needed)
+    
     def _backtrack(self):
         """Recursive backtracking search"""
         if self.is_complete():
             return self.assignment
         
+        self.node_count += 1
+        if self.backtrack_limit is not None and self.backtrack_count >= self.backtrack_limit:
+            raise SearchAborted()
+        if self.stop_event is not None and self.node_count % 256 == 0 and self.stop_event.is_set():
+            raise SearchAborted()
+        
         # Select unassigned variable
         var = self.select_unassigned_variable()
         
-        # Try each value in the domain
-        for value in self.domains[var]:
-            # Check if the value is consistent with current assignment
-            if self.is_consistent(var, value):
-                # Assign value to variable
-                self.assignment[var] = value
-                
-                # Recursively continue
+        if self.propagation is not None:
+            return self._backtrack_propagating(var)
+        
+        values = self.consistent_values(var, self.domains[var])
+        if self.random is not None:
+            self.random.shuffle(values)
+        
+        # Try each value in the domain that is consistent with current assignment
+        for value in values:
+            # Assign value to variable
+            self.assignment[var] = value
+            if self.mrv_queue is not None:
+                self.mrv_assigned(var, self.adjacent[var])
+            
+            # Recursively continue
+            result = self._backtrack()
+            if result:
+                return result
+            
+            # If no solution, backtrack
+            self.backtrack_count += 1
+            del self.assignment[var]
+            if self.mrv_queue is not None:
+                self.mrv_unassigned(var, self.adjacent[var])
+        
+        return None
+    
+    def _backtrack_propagating(self, var):
+        """Try the live values of var, propagating each assignment and undoing it via the trail"""
+        values = self.domain_values(var)
+        if self.random is not None:
+            self.random.shuffle(values)
+        
+        for value in values:
+            mark = len(self.trail)
+            self.assignment[var] = value
+            
+            propagated = self.propagate(var, value)
+            if propagated:
+                if self.mrv_queue is not None:
+                    self.mrv_assigned(var, self.trail_variables(mark))
                 result = self._backtrack()
                 if result:
                     return result
-                
-                # If no solution, backtrack
-                self.backtrack_count += 1
+            
+            # Dead end: undo the assignment and everything it pruned
+            self.backtrack_count += 1
+            if propagated and self.mrv_queue is not None:
+                touched = self.trail_variables(mark)
                 del self.assignment[var]
+                self.restore(mark)
+                self.mrv_unassigned(var, touched)
+            else:
+                del self.assignment[var]
+                self.restore(mark)
+        
+        return None
+    
+    def reset(self):
+        """Clear the search state (assignment, live domains, trail, MRV queue) but keep the counters"""
+        self.assignment = {}
+        self.current_domains = None
+        self.trail = []
+        self.mrv_queue = None
+    
+    def stats(self):
+        """Search statistics as a dictionary"""
+        return {
+            'backtracks': self.backtrack_count,
+            'nodes': self.node_count,
+            'pruned': self.prune_count,
+            'restarts': self.restart_count,
+            'steps': self.step_count,
+        }
+    
+    def restart_search(self, base_limit=100, max_restarts=None):
+        """
+        Randomised backtracking with restarts on a Luby schedule
+        
+        Run i is cut off after base_limit * luby(i) backtracks and the search
+        starts again with a fresh variable and value order. Because the
+        limits grow without bound the search stays complete.
+        
+        Args:
+            base_limit: Backtracks allowed for a run of Luby length 1
+            max_restarts: Give up (return None) after this many restarts
+        
+        Returns:
+            The solution, or None if the problem is unsatisfiable or the
+            restarts ran out
+        """
+        if self.random is None:
+            self.random = random.Random()
         
+        run = 1
+        while max_restarts is None or self.restart_count <= max_restarts:
+            self.reset()
+            self.backtrack_limit = self.backtrack_count + base_limit * luby(run)
+            try:
+                return self.backtracking_search()
+            except SearchAborted:
+                if self.stop_event is not None and self.stop_event.is_set():
+                    raise
+                self.restart_count += 1
+                run += 1
+            finally:
+                self.backtrack_limit = None
+        self.reset()
         return None
+    
+    def portfolio_search(self, configs=None, workers=None, timeout=None):
+        """
+        Run several differently configured searches in parallel processes
+        
+        The first worker to find a solution (or prove there is none) wins and
+        the others are told to stop. Workers that have not reported within
+        PORTFOLIO_GRACE seconds of that (or of the timeout) are terminated.
+        Statistics from every worker are left in self.portfolio_stats, ordered
+        by worker; a worker that failed has status 'error' and the message
+        under 'error'.
+        
+        Args:
+            configs: List of dicts of CSP options (propagation, incremental_mrv,
+                compact, seed) plus optional 'restarts' and 'restart_base'
+                keys; defaults to default_portfolio(workers)
+            workers: Number of workers for the default portfolio; defaults to
+                the number of CPUs
+            timeout: Seconds to wait for a result before stopping every worker
+        
+        Returns:
+            The winning solution, or None if there is none (or time ran out)
+        """
+        if configs is None:
+            configs = default_portfolio(workers or os.cpu_count() or 1)
+        
+        stop_event = multiprocessing.Event()
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=_portfolio_worker,
+                args=(index, self.variables, self.domains, self.constraints,
+                      config, stop_event, results),
+                daemon=True)
+            for index, config in enumerate(configs)
+        ]
+        for process in processes:
+            process.start()
+        
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        grace_deadline = None  # Once set, stragglers are terminated when it passes
+        winner = None
+        reports = {}
+        while len(reports) < len(processes):
+            now = time.perf_counter()
+            if grace_deadline is None and deadline is not None and now >= deadline:
+                # Out of time: stop everyone and give them a moment to report
+                stop_event.set()
+                grace_deadline = now + PORTFOLIO_GRACE
+            if grace_deadline is not None and now >= grace_deadline:
+                break
+            try:
+                report = results.get(timeout=PORTFOLIO_POLL)
+            except queue.Empty:
+                # A worker that died without reporting will never report
+                if not any(process.is_alive() for index, process in enumerate(processes)
+                           if index not in reports):
+                    break
+                continue
+            reports[report['worker']] = report
+            if winner is None and report['status'] in ('solved', 'unsatisfiable'):
+                winner = report
+                stop_event.set()
+                grace_deadline = time.perf_counter() + PORTFOLIO_GRACE
+        
+        stop_event.set()
+        if len(reports) < len(processes):
+            _drain_reports(results, reports)
+        for index, process in enumerate(processes):
+            process.join(PORTFOLIO_GRACE if index in reports else PORTFOLIO_POLL)
+            terminated = process.is_alive()
+            if terminated:
+                process.terminate()
+                process.join()
+            if index not in reports:
+                if terminated:
+                    status, message = 'terminated', None
+                else:
+                    status, message = 'error', f"exited with code {process.exitcode} without reporting"
+                reports[index] = _portfolio_report(index, configs[index], status, 0.0, message=message)
+        
+        solution = winner['assignment'] if winner is not None else None
+        self.portfolio_stats = [reports[index] for index in sorted(reports)]
+        for report in self.portfolio_stats:
+            report['winner'] = report is winner
+            del report['assignment']
+        
+        if solution is None:
+            return None
+        self.assignment = solution
+        return self.assignment
+    
+    # ----- Local search -----
+    
+    def arc_conflicts(self, variable, value, assignment):
+        """Count the non not-equal arcs of variable violated by value against assignment"""
+        return sum(1 for neighbor, check in self.arcs[variable]
+                   if neighbor in assignment and not check(value, assignment[neighbor]))
+    
+    def dsatur_assignment(self):
+        """
+        Greedy DSATUR assignment
+        
+        Repeatedly assigns the variable whose assigned neighbours hold the most
+        distinct values (ties to the highest degree), giving it the value that
+        conflicts with the fewest of them. Every variable gets a value, so the
+        result may still contain conflicts.
+        """
+        assignment = {}
+        # neighbor_values[var] counts the values held by var's assigned not-equal neighbours
+        neighbor_values = {var: {} for var in self.variables}
+        ne_incoming = {var: [other for other, check in self.incoming[var] if check is not_equal]
+                       for var in self.variables}
+        order = {var: i for i, var in enumerate(self.variable_order)}
+        heap = [(0, -len(self.adjacent[var]), order[var], var) for var in self.variables]
+        heapq.heapify(heap)
+        
+        while heap:
+            saturation, degree, rank, var = heapq.heappop(heap)
+            if var in assignment or -saturation != len(neighbor_values[var]):
+                continue  # Stale entry
+            
+            held = neighbor_values[var]
+            value = min(self.domains[var],
+                        key=lambda v: held.get(v, 0) + self.arc_conflicts(var, v, assignment))
+            assignment[var] = value
+            
+            for other in ne_incoming[var]:
+                if other not in assignment:
+                    counts = neighbor_values[other]
+                    counts[value] = counts.get(value, 0) + 1
+                    if counts[value] == 1:
+                        heapq.heappush(heap, (-len(counts), -len(self.adjacent[other]), order[other], other))
+        return assignment
+    
+    def local_search(self, max_steps=1000000, time_limit=None, tabu_tenure=10, noise=0.1, seed=None):
+        """
+        Min-conflicts local search with a tabu list, started from a DSATUR assignment
+        
+        Each step picks a random conflicted variable and gives it the value
+        with the fewest conflicts that is not tabu (ties broken at random; a
+        tabu value is still taken if it removes every conflict of the
+        variable). With probability noise the variable takes a random value
+        instead. A value the variable leaves stays tabu for it for
+        tabu_tenure steps. Conflict counts for
+        not-equal constraints are kept per variable and value and updated
+        from the moved variable's neighbours only, so a step costs O(degree).
+        
+        Args:
+            max_steps: Maximum number of moves
+            time_limit: Maximum number of seconds, checked every 256 moves
+            tabu_tenure: Steps during which a variable may not return to a value it left
+            noise: Probability of a random-walk move
+            seed: Seed for the random choices
+        
+        Returns:
+            The solution, or None if the budget runs out first; the final
+            assignment is left in self.assignment either way
+        """
+        rng = random.Random(seed) if seed is not None else self.random or random.Random()
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        
+        current = self.dsatur_assignment()
+        ne_incoming = {var: [other for other, check in self.incoming[var] if check is not_equal]
+                       for var in self.variables}
+        # Vars whose own arcs mention var, so var moving changes their arc conflicts
+        arc_incoming = {var: list(dict.fromkeys(other for other, check in self.incoming[var]
+                                                if check is not not_equal))
+                        for var in self.variables}
+        
+        # held[var][value] = number of var's not-equal neighbours currently holding value
+        held = {var: {} for var in self.variables}
+        for var in self.variables:
+            value = current[var]
+            for other in ne_incoming[var]:
+                held[other][value] = held[other].get(value, 0) + 1
+        arc_cost = {var: self.arc_conflicts(var, current[var], current) if self.arcs[var] else 0
+                    for var in self.variables}
+        
+        conflicted = RandomAccessSet()
+        
+        def refresh(var):
+            if held[var].get(current[var], 0) + arc_cost[var]:
+                conflicted.add(var)
+            else:
+                conflicted.discard(var)
+        
+        for var in self.variables:
+            refresh(var)
+        
+        tabu = {}  # (var, value) -> step until which the move is forbidden
+        step = 0
+        while conflicted and step < max_steps:
+            if deadline is not None and step % 256 == 0 and time.perf_counter() > deadline:
+                break
+            step += 1
+            
+            var = conflicted.choice(rng)
+            old = current[var]
+            counts = held[var]
+            best_values = []
+            best_cost = None
+            for value in self.domains[var]:
+                cost = counts.get(value, 0)
+                if self.arcs[var]:
+                    cost += self.arc_conflicts(var, value, current)
+                # Aspiration: a tabu value is allowed if it clears every conflict
+                if value != old and tabu.get((var, value), 0) > step and cost > 0:
+                    continue
+                if best_cost is None or cost < best_cost:
+                    best_cost = cost
+                    best_values = [value]
+                elif cost == best_cost:
+                    best_values.append(value)
+            if not best_values:
+                continue
+            
+            value = rng.choice(best_values)
+            if rng.random() < noise:
+                # Random walk step to escape plateaus
+                value = rng.choice(self.domains[var])
+            if value == old:
+                continue
+            current[var] = value
+            tabu[(var, old)] = step + tabu_tenure
+            
+            for other in ne_incoming[var]:
+                other_held = held[other]
+                other_held[old] -= 1
+                other_held[value] = other_held.get(value, 0) + 1
+                refresh(other)
+            for other in arc_incoming[var]:
+                arc_cost[other] = self.arc_conflicts(other, current[other], current)
+                refresh(other)
+            if self.arcs[var]:
+                # Recount: a noise move may have taken a value other than the one best_cost was for
+                arc_cost[var] = self.arc_conflicts(var, value, current)
+            refresh(var)
+        
+        self.step_count += step
+        self.assignment = current
+        return None if conflicted else current
+    
+    # ----- Enumerating all solutions -----
+    
+    def iter_solutions(self, nogood_cache=True, max_nogood_size=8):
+        """
+        Yield every solution lazily, each as a new dictionary
+        
+        Uses conflict-directed backjumping: when a variable runs out of values
+        the search jumps straight back to the deepest variable involved in the
+        failure, instead of retrying the variables in between.
+        
+        Args:
+            nogood_cache: Remember failed partial assignments (nogoods) so
+                that equivalent failing subtrees are not explored again
+            max_nogood_size: Only cache nogoods with at most this many variables
+        """
+        return self._enumerate(True, nogood_cache, max_nogood_size)
+    
+    def count_solutions(self, nogood_cache=True, max_nogood_size=8, by_components=True):
+        """
+        Count the solutions without building an assignment dict for each one
+        
+        Args:
+            nogood_cache, max_nogood_size: As for iter_solutions
+            by_components: Count each connected component on its own and
+                multiply the counts
+        """
+        components = self.components() if by_components else [self.variables]
+        if len(components) == 1:
+            return sum(1 for _ in self._enumerate(False, nogood_cache, max_nogood_size))
+        
+        total = 1
+        for members, constraints in zip(components, self.split_constraints(components)):
+            if len(members) == 1 and not constraints:
+                count = len(self.domains[members[0]])
+            else:
+                csp = CSP(members, {var: self.domains[var] for var in members}, constraints,
+                          **self.options())
+                count = csp.count_solutions(nogood_cache, max_nogood_size, by_components=False)
+                self.add_stats(csp.stats())
+            total *= count
+            if total == 0:
+                break
+        return total
+    
+    def _enumerate(self, emit, nogood_cache, max_nogood_size):
+        """Run the backjumping enumeration; yields a dict per solution, or None when not emit"""
+        # Drop any live domains, trail or MRV queue left behind by an earlier search
+        self.reset()
+        depth = {}  # Position of each assigned variable in the assignment order
+        nogoods = {} if nogood_cache else None  # (var, value) -> nogoods containing that pair
+        self.ensure_recursion_depth()
+        yield from self._backjump(emit, depth, nogoods, max_nogood_size)
+    
+    def _backjump(self, emit, depth, nogoods, max_nogood_size):
+        """
+        One level of the backjumping enumeration
+        
+        Returns (through StopIteration) None if some solution was found below
+        this point, otherwise the conflict set: the assigned variables whose
+        values together explain why no solution exists below this point.
+        """
+        if self.is_complete():
+            yield dict(self.assignment) if emit else None
+            return None
+        
+        self.node_count += 1
+        var = self.select_unassigned_variable()
+        conflict_set = set()
+        found = False
+        for value in self.domains[var]:
+            culprits = self.conflicting_variables(var, value, depth, nogoods)
+            if culprits:
+                conflict_set |= culprits
+                continue
+            
+            self.assignment[var] = value
+            depth[var] = len(depth)
+            try:
+                child_conflicts = yield from self._backjump(emit, depth, nogoods, max_nogood_size)
+            finally:
+                del self.assignment[var]
+                del depth[var]
+            
+            if child_conflicts is None:
+                found = True
+                continue
+            self.backtrack_count += 1
+            if var not in child_conflicts:
+                # The failure below does not depend on var, so no other value can fix it
+                return None if found else child_conflicts
+            conflict_set |= child_conflicts
+            conflict_set.discard(var)
+        
+        if found:
+            return None
+        if nogoods is not None and len(conflict_set) <= max_nogood_size:
+            self.record_nogood(conflict_set, nogoods)
+        return conflict_set
+    
+    def conflicting_variables(self, variable, value, depth, nogoods):
+        """
+        Assigned variables that rule out variable=value, or an empty set if it is allowed
+        
+        A direct constraint violation is blamed on the earliest assigned
+        variable involved; a matching nogood is blamed on all of its other
+        variables.
+        """
+        assignment = self.assignment
+        culprit = None
+        for neighbor in self.ne_neighbors[variable]:
+            if neighbor in assignment and assignment[neighbor] == value:
+                if culprit is None or depth[neighbor] < depth[culprit]:
+                    culprit = neighbor
+        for neighbor, check in self.arcs[variable]:
+            if neighbor in assignment and not check(value, assignment[neighbor]):
+                if culprit is None or depth[neighbor] < depth[culprit]:
+                    culprit = neighbor
+        if culprit is not None:
+            return {culprit}
+        
+        if nogoods is not None:
+            for nogood in nogoods.get((variable, value), ()):
+                if all(other == variable or (other in assignment and assignment[other] == other_value)
+                       for other, other_value in nogood):
+                    return {other for other, _ in nogood if other != variable}
+        return set()
+    
+    def record_nogood(self, conflict_set, nogoods):
+        """Store the current values of conflict_set as a nogood, indexed by each of its pairs"""
+        nogood = tuple((var, self.assignment[var]) for var in conflict_set)
+        for pair in nogood:
+            nogoods.setdefault(pair, []).append(nogood)
+    
+    # ----- Decomposition into independent components -----
+    
+    def options(self):
+        """Constructor options, for building CSPs configured like this one"""
+        return {'propagation': self.propagation, 'incremental_mrv': self.incremental_mrv,
+                'compact': self.compact, 'seed': self.seed}
+    
+    def components(self):
+        """Split the variables into connected components of the constraint graph"""
+        component_of = {}
+        components = []
+        for start in self.variables:
+            if start in component_of:
+                continue
+            component_of[start] = len(components)
+            members = [start]
+            # members doubles as the BFS queue
+            for var in members:
+                for neighbor in self.adjacent[var]:
+                    if neighbor not in component_of:
+                        component_of[neighbor] = len(components)
+                        members.append(neighbor)
+            components.append(members)
+        return components
+    
+    def split_constraints(self, components):
+        """Group the constraints by the component they belong to, in a single pass"""
+        component_of = {var: i for i, members in enumerate(components) for var in members}
+        if isinstance(self.constraints, dict):
+            groups = [{} for _ in components]
+            for var, var_constraints in self.constraints.items():
+                if var in component_of:
+                    groups[component_of[var]][var] = var_constraints
+            return groups
+        
+        groups = [[] for _ in components]
+        for constraint in self.constraints:
+            for var in constraint.scope:
+                if var in component_of:
+                    groups[component_of[var]].append(constraint)
+                    break
+        return groups
+    
+    def solve_by_components(self, method='backtracking', workers=None, **options):
+        """
+        Solve each connected component of the constraint graph on its own
+        
+        Components share no constraints, so their solutions can simply be
+        merged. Single-variable components (islands) take their first value
+        without a search. As soon as one component turns out to have no
+        solution the whole problem fails, without searching the rest. A
+        backtrack_limit set on this CSP applies to each component search.
+        
+        Args:
+            method: 'backtracking' or 'local_search', run on every component
+            workers: Solve components in a process pool of this size; solve
+                them one after another in this process when None
+            options: Passed on to local_search
+        
+        Returns:
+            The merged solution, or None if some component has no solution
+        """
+        components = self.components()
+        self.component_count = len(components)
+        groups = self.split_constraints(components)
+        self.assignment = {}
+        
+        jobs = []
+        for members, constraints in zip(components, groups):
+            if len(members) == 1 and not constraints:
+                var = members[0]
+                if not self.domains[var]:
+                    return None
+                self.assignment[var] = self.domains[var][0]
+            else:
+                jobs.append((members, {var: self.domains[var] for var in members}, constraints))
+        
+        if workers is None:
+            for members, domains, constraints in jobs:
+                solution, stats = _solve_component(members, domains, constraints, self.options(),
+                                                   self.backtrack_limit, method, options)
+                self.add_stats(stats)
+                if solution is None:
+                    self.assignment = {}
+                    return None
+                self.assignment.update(solution)
+            return self.assignment
+        
+        stop_event = multiprocessing.Event()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_set_stop_event,
+                                 initargs=(stop_event,)) as executor:
+            pending = {executor.submit(_solve_component, members, domains, constraints,
+                                       self.options(), self.backtrack_limit, method, options)
+                       for members, domains, constraints in jobs}
+            failed = aborted = False
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.cancelled():
+                        continue
+                    try:
+                        solution, stats = future.result()
+                    except SearchAborted:
+                        # A component hit the backtrack limit: stop the others too
+                        failed = aborted = True
+                        continue
+                    self.add_stats(stats)
+                    if solution is None:
+                        failed = True
+                    elif not failed:
+                        self.assignment.update(solution)
+                if failed and not stop_event.is_set():
+                    # Cancel queued components and stop the running ones
+                    stop_event.set()
+                    for future in pending:
+                        future.cancel()
+        
+        if failed:
+            self.assignment = {}
+            if aborted:
+                raise SearchAborted()
+            return None
+        return self.assignment
+    
+    def add_stats(self, stats):
+        """Add a sub-search's statistics to this CSP's counters"""
+        self.backtrack_count += stats['backtracks']
+        self.node_count += stats['nodes']
+        self.prune_count += stats['pruned']
+        self.restart_count += stats['restarts']
+        self.step_count += stats['steps']
+    
+    def compile_constraints(self):
+        """
+        Compile the constraints into per-variable arc lists
+        
+        Not-equal arcs become plain neighbour lists (no per-edge check object),
+        every other arc is kept as a (neighbor, check) pair. Also indexes, for
+        each variable, the arcs pointing at it and its distinct neighbours.
+        """
+        if isinstance(self.constraints, dict):
+            arcs = ((var, constraint['neighbor'], constraint['check'])
+                    for var, var_constraints in self.constraints.items()
+                    for constraint in var_constraints)
+        else:
+            arcs = (arc for constraint in self.constraints for arc in constraint.arcs())
+        
+        ne_neighbors = {var: {} for var in self.variables}
+        self.arcs = {var: [] for var in self.variables}
+        for var, neighbor, check in arcs:
+            if var not in ne_neighbors or neighbor not in ne_neighbors:
+                continue  # Skip constraints on variables outside the problem
+            if check is not_equal:
+                ne_neighbors[var][neighbor] = None
+            else:
+                self.arcs[var].append((neighbor, check))
+        self.ne_neighbors = {var: list(neighbors) for var, neighbors in ne_neighbors.items()}
+        
+        # incoming[var] holds the constraints other variables have towards var,
+        # which are the ones to re-check when var's value changes
+        self.incoming = {var: [] for var in self.variables}
+        adjacent = {var: dict(ne_neighbors[var]) for var in self.variables}
+        for var in self.variables:
+            for neighbor in self.ne_neighbors[var]:
+                self.incoming[neighbor].append((var, not_equal))
+                adjacent[neighbor][var] = None
+            for neighbor, check in self.arcs[var]:
+                self.incoming[neighbor].append((var, check))
+                adjacent[var][neighbor] = None
+                adjacent[neighbor][var] = None
+        self.adjacent = {var: list(neighbors) for var, neighbors in adjacent.items()}
+    
+    # ----- Incremental MRV -----
+    
+    def setup_mrv_queue(self):
+        """Queue every unassigned variable by its current number of remaining values"""
+        max_size = max((len(self.domains[var]) for var in self.variables), default=0)
+        self.mrv_queue = MRVQueue(max_size, self.variable_order)
+        self.unassigned_values = 0
+        for var in self.variable_order:
+            if var not in self.assignment:
+                self.mrv_queue.add(var, self.count_remaining_values(var))
+                self.unassigned_values += len(self.domains[var])
+    
+    def count_remaining_values(self, variable):
+        """Count the remaining values of variable, charging the work to mrv_update_checks"""
+        if self.current_domains is not None:
+            self.mrv_update_checks += 1
+            return self.domain_size(variable)
+        self.mrv_update_checks += len(self.domains[variable])
+        return len(self.get_remaining_values(variable))
+    
+    def mrv_assigned(self, variable, touched):
+        """Dequeue a newly assigned variable and refresh the touched variables"""
+        self.mrv_queue.remove(variable)
+        self.unassigned_values -= len(self.domains[variable])
+        self.refresh_mrv(touched)
+    
+    def mrv_unassigned(self, variable, touched):
+        """Requeue an unassigned variable and refresh the touched variables"""
+        self.mrv_queue.add(variable, self.count_remaining_values(variable))
+        self.unassigned_values += len(self.domains[variable])
+        self.refresh_mrv(touched)
+    
+    def refresh_mrv(self, variables):
+        """Recount the remaining values of the queued variables among variables"""
+        for var in variables:
+            if var in self.mrv_queue:
+                self.mrv_queue.update(var, self.count_remaining_values(var))
+    
+    def trail_variables(self, mark):
+        """Distinct variables pruned on the trail after position mark"""
+        return dict.fromkeys(var for var, _ in self.trail[mark:])
+    
+    @property
+    def mrv_checks_saved(self):
+        """Value checks avoided by incremental MRV compared with full rescans"""
+        return self.mrv_naive_checks - self.mrv_update_checks
+    
+    # ----- Constraint propagation -----
+    
+    def setup_propagation(self):
+        """Create the live domains used while propagating"""
+        self.trail = []
+        if not self.compact:
+            self.current_domains = {var: list(self.domains[var]) for var in self.variables}
+            return
+        
+        # Intern every value to a bit so a domain becomes a single int
+        self.value_list = []
+        self.value_bits = {}
+        self.current_domains = {}
+        for var in self.variables:
+            mask = 0
+            for value in self.domains[var]:
+                if value not in self.value_bits:
+                    self.value_bits[value] = 1 << len(self.value_list)
+                    self.value_list.append(value)
+                mask |= self.value_bits[value]
+            self.current_domains[var] = mask
+        
+        for var in self.variables:
+            for _, check in self.arcs[var]:
+                if isinstance(check, TableCheck):
+                    check.build_masks(self.value_bits)
+    
+    def domain_values(self, variable):
+        """List the values left in the live domain of variable"""
+        domain = self.current_domains[variable]
+        if not self.compact:
+            # Copy: pruning and restoring change the live list
+            return list(domain)
+        values = []
+        while domain:
+            low = domain & -domain
+            values.append(self.value_list[low.bit_length() - 1])
+            domain ^= low
+        return values
+    
+    def domain_size(self, variable):
+        """Count the values left in the live domain of variable"""
+        if self.compact:
+            return self.current_domains[variable].bit_count()
+        return len(self.current_domains[variable])
+    
+    def prune(self, variable, value):
+        """Remove value from the live domain of variable, recording it on the trail"""
+        if self.compact:
+            self.prune_bits(variable, self.value_bits[value])
+            return
+        self.current_domains[variable].remove(value)
+        self.trail.append((variable, value))
+        self.prune_count += 1
+    
+    def prune_bits(self, variable, bits):
+        """Compact mode: clear bits (all present) from the live domain of variable"""
+        self.current_domains[variable] ^= bits
+        self.trail.append((variable, bits))
+        self.prune_count += bits.bit_count()
+    
+    def restore(self, mark):
+        """Undo every pruning recorded on the trail after position mark"""
+        while len(self.trail) > mark:
+            variable, value = self.trail.pop()
+            if self.compact:
+                # Trail entries hold the removed bits in compact mode
+                self.current_domains[variable] |= value
+            else:
+                self.current_domains[variable].append(value)
+    
+    def propagate(self, variable, value):
+        """Propagate variable=value; return False if some domain is wiped out"""
+        if not self.forward_check(variable, value):
+            return False
+        if self.propagation == 'ac3':
+            # Fix the assigned variable's domain and restore arc consistency
+            for other in self.domain_values(variable):
+                if other != value:
+                    self.prune(variable, other)
+            queue = [(other, variable, check) for other, check in self.incoming[variable]
+                     if other not in self.assignment]
+            return self.ac3(queue)
+        return True
+    
+    def forward_check(self, variable, value):
+        """Remove values of unassigned neighbours that conflict with variable=value"""
+        if self.compact:
+            return self.forward_check_bits(variable, value)
+        
+        for other, check in self.incoming[variable]:
+            if other in self.assignment:
+                continue
+            domain = self.current_domains[other]
+            if check is not_equal:
+                if value in domain:
+                    self.prune(other, value)
+            else:
+                for other_value in [v for v in domain if not check(v, value)]:
+                    self.prune(other, other_value)
+            if not domain:
+                return False
+        return True
+    
+    def forward_check_bits(self, variable, value):
+        """Compact forward checking: not-equal and table arcs are bit operations, other checks decode values"""
+        bit = self.value_bits[value]
+        domains = self.current_domains
+        for other, check in self.incoming[variable]:
+            if other in self.assignment:
+                continue
+            if check is not_equal:
+                if domains[other] & bit:
+                    self.prune_bits(other, bit)
+            elif isinstance(check, TableCheck):
+                removed = domains[other] & ~check.column_masks.get(value, 0)
+                if removed:
+                    self.prune_bits(other, removed)
+            else:
+                for other_value in self.domain_values(other):
+                    if not check(other_value, value):
+                        self.prune(other, other_value)
+            if not domains[other]:
+                return False
+        return True
+    
+    def revise(self, xi, xj, check):
+        """Remove values of xi that have no support in the live domain of xj"""
+        if self.compact and check is not_equal:
+            # x != y is only unsupported when xj is down to the single value x
+            xj_domain = self.current_domains[xj]
+            if xj_domain & (xj_domain - 1) == 0 and self.current_domains[xi] & xj_domain:
+                self.prune_bits(xi, xj_domain)
+                return True
+            return False
+        
+        if self.compact and isinstance(check, TableCheck):
+            xj_domain = self.current_domains[xj]
+            removed = 0
+            for x in self.domain_values(xi):
+                if not check.row_masks.get(x, 0) & xj_domain:
+                    removed |= self.value_bits[x]
+            if removed:
+                self.prune_bits(xi, removed)
+            return bool(removed)
+        
+        if check is not_equal:
+            xj_domain = self.current_domains[xj]
+            if len(xj_domain) == 1 and xj_domain[0] in self.current_domains[xi]:
+                self.prune(xi, xj_domain[0])
+                return True
+            return False
+        
+        revised = False
+        xj_domain = self.domain_values(xj)
+        for x in self.domain_values(xi):
+            if not any(check(x, y) for y in xj_domain):
+                self.prune(xi, x)
+                revised = True
+        return revised
+    
+    def ac3(self, queue=None):
+        """
+        AC-3 arc consistency over the live domains
+        
+        Args:
+            queue: Arcs (xi, xj, check) to start from, meaning xi's constraint
+                towards xj; defaults to every arc in the problem
+        
+        Returns:
+            False if some domain becomes empty, True otherwise
+        """
+        if queue is None:
+            queue = [(var, neighbor, check)
+                     for var in self.variables
+                     for neighbor, check in self.arcs[var]]
+            queue += [(var, neighbor, not_equal)
+                      for var in self.variables
+                      for neighbor in self.ne_neighbors[var]]
+        
+        queue = deque(queue)
+        while queue:
+            xi, xj, check = queue.popleft()
+            if self.revise(xi, xj, check):
+                if not self.current_domains[xi]:
+                    return False
+                # xi shrank, so arcs pointing at it must be checked again
+                for xk, xk_check in self.incoming[xi]:
+                    if xk != xj and xk not in self.assignment:
+                        queue.append((xk, xi, xk_check))
+        return True
+
+
+def default_portfolio(workers):
+    """
+    Portfolio of CSP configurations for portfolio_search
+    
+    The first two workers run deterministic searches (forward checking and
+    AC-3); the rest run randomised restart searches with different seeds.
+    """
+    configs = [
+        {'propagation': 'forward_checking', 'incremental_mrv': True, 'compact': True},
+        {'propagation': 'ac3', 'incremental_mrv': True, 'compact': True},
+    ]
+    for seed in range(max(0, workers - len(configs))):
+        configs.append({'propagation': 'forward_checking', 'incremental_mrv': True,
+                        'compact': True, 'seed': seed, 'restarts': True})
+    return configs[:workers]
+
+
+def _portfolio_worker(index, variables, domains, constraints, config, stop_event, results):
+    """Process entry point for one portfolio member: solve and report to the results queue"""
+    start = time.perf_counter()
+    csp = solution = message = None
+    try:
+        options = dict(config)
+        restarts = options.pop('restarts', False)
+        restart_base = options.pop('restart_base', 100)
+        csp = CSP(variables, domains, constraints, **options)
+        csp.stop_event = stop_event
+        if restarts:
+            solution = csp.restart_search(restart_base)
+        else:
+            solution = csp.backtracking_search()
+        status = 'solved' if solution is not None else 'unsatisfiable'
+    except SearchAborted:
+        status = 'cancelled'
+    except Exception as error:
+        # Always report, or the parent would wait for this worker
+        status, message = 'error', f"{type(error).__name__}: {error}"
+    
+    results.put(_portfolio_report(index, config, status, time.perf_counter() - start,
+                                  solution, csp, message))
+
+
+def _portfolio_report(index, config, status, elapsed, solution=None, csp=None, message=None):
+    """Report of one portfolio worker, as put on the results queue"""
+    report = {'worker': index, 'config': config, 'status': status, 'time': elapsed,
+              'assignment': dict(solution) if solution is not None else None}
+    if message is not None:
+        report['error'] = message
+    if csp is not None:
+        report.update(csp.stats())
+    else:
+        report.update(backtracks=0, nodes=0, pruned=0, restarts=0, steps=0)
+    return report
+
+
+def _drain_reports(results, reports):
+    """Move any reports already on the results queue into reports, keyed by worker"""
+    while True:
+        try:
+            report = results.get(timeout=PORTFOLIO_POLL)
+        except queue.Empty:
+            return
+        reports[report['worker']] = report
+
+
+_stop_event = None  # Set in component pool workers by _set_stop_event
+
+
+def _set_stop_event(stop_event):
+    """Pool initializer: share the stop event with the worker process"""
+    global _stop_event
+    _stop_event = stop_event
+
+
+def _solve_component(variables, domains, constraints, csp_options, backtrack_limit, method, options):
+    """Solve one component; returns (solution or None, statistics)"""
+    csp = CSP(variables, domains, constraints, **csp_options)
+    csp.stop_event = _stop_event
+    csp.backtrack_limit = backtrack_limit
+    try:
+        if method == 'local_search':
+            solution = csp.local_search(**options)
+        else:
+            solution = csp.backtracking_search()
+    except SearchAborted:
+        if _stop_event is None or not _stop_event.is_set():
+            raise  # Hit the backtrack limit rather than being told to stop
+        solution = None
+    return (dict(solution) if solution is not None else None), csp.stats()
 
 
 class MapColoringCSP:
-    def __init__(self):
+    def __init__(self, propagation='forward_checking', incremental_mrv=True, compact=False):
         self.regions = []
         self.colors = []
         self.neighbors = {}
         self.csp = None
+        self.propagation = propagation  # Propagation mode passed on to the CSP
+        self.incremental_mrv = incremental_mrv  # Use the MRVQueue for variable selection
+        self.compact = compact  # Keep live domains as bitmasks
     
     def setup_from_user_input(self):
         """Set up the map coloring problem from user input"""
@@ -109,36 +1372,113 @@ class MapColoringCSP:
         domains = {region: self.colors.copy() for region in self.regions}
         
         # Set up constraints - adjacent regions must have different colors
-        constraints = {}
-        for region, adjacent_regions in self.neighbors.items():
-            if region not in constraints:
-                constraints[region] = []
-            
-            for adj in adjacent_regions:
-                # Skip if not in our regions list
-                if adj not in self.regions:
-                    continue
-                
-                # Add constraint: adjacent regions must have different colors
-                constraints[region].append({
-                    'neighbor': adj,
-                    'check': lambda x, y: x != y
-                })
-                
-                # Add the reverse constraint as well
-                if adj not in constraints:
-                    constraints[adj] = []
-                constraints[adj].append({
-                    'neighbor': region,
-                    'check': lambda x, y: x != y
-                })
+        constraints = self.build_constraints()
         
         # Create the CSP
-        self.csp = CSP(self.regions, domains, constraints)
+        self.csp = CSP(self.regions, domains, constraints, propagation=self.propagation,
+                       incremental_mrv=self.incremental_mrv, compact=self.compact)
         
         print("\nMap Coloring CSP set up successfully!")
         self.print_map_info()
     
+    def build_constraints(self):
+        """One NotEqual constraint per adjacent pair of regions, however often it is listed"""
+        regions = set(self.regions)
+        seen = set()
+        constraints = []
+        for region, adjacent_regions in self.neighbors.items():
+            for adj in adjacent_regions:
+                # Skip regions outside our list and pairs already added from either side
+                if adj not in regions or region not in regions or adj == region:
+                    continue
+                if (region, adj) in seen or (adj, region) in seen:
+                    continue
+                seen.add((region, adj))
+                constraints.append(NotEqual(region, adj))
+        return constraints
+    
+    def load_dimacs(self, path, colors):
+        """
+        Load a graph-colouring instance in DIMACS .col format
+        
+        Reads 'p edge <vertices> <edges>' and 'e <u> <v>' lines one at a
+        time; vertices become regions named '1' .. '<vertices>'.
+        
+        Args:
+            path: Path of the .col file
+            colors: List of colour names, or the number of colours to use
+        """
+        regions = []
+        
+        def edges():
+            with open(path) as f:
+                for line in f:
+                    fields = line.split()
+                    if not fields or fields[0] == 'c':
+                        continue
+                    if fields[0] == 'p':
+                        regions.extend(str(v) for v in range(1, int(fields[2]) + 1))
+                    elif fields[0] == 'e':
+                        yield fields[1], fields[2]
+        
+        self.build_from_edges(regions, edges(), colors)
+        print(f"Loaded {path}: {len(self.regions)} regions, "
+              f"{len(self.csp.constraints)} adjacencies, {len(self.colors)} colors")
+    
+    def load_edge_list(self, path, colors):
+        """
+        Load a map from a plain edge list: one 'region region' pair per line
+        
+        Pairs may be separated by whitespace or a comma; lines starting with
+        '#' are comments. Regions are created in order of first appearance.
+        """
+        def edges():
+            with open(path) as f:
+                for line in f:
+                    fields = line.replace(',', ' ').split()
+                    if len(fields) >= 2 and not fields[0].startswith('#'):
+                        yield fields[0], fields[1]
+        
+        self.build_from_edges(None, edges(), colors)
+        print(f"Loaded {path}: {len(self.regions)} regions, "
+              f"{len(self.csp.constraints)} adjacencies, {len(self.colors)} colors")
+    
+    def build_from_edges(self, regions, edges, colors):
+        """
+        Build the regions, neighbours, constraints and CSP straight from an edge iterable
+        
+        Args:
+            regions: List of region names, or None to take them from the edges
+                in order of first appearance (regions is read after the edges
+                are consumed, so a loader may fill it while streaming)
+            edges: Iterable of (region, region) adjacency pairs; repeats and
+                self-loops are ignored
+            colors: List of colour names, or the number of colours to use
+        """
+        self.colors = [f"c{i}" for i in range(1, colors + 1)] if isinstance(colors, int) else list(colors)
+        
+        adjacency = {}
+        constraints = []
+        for u, v in edges:
+            if u == v:
+                continue
+            u_neighbors = adjacency.setdefault(u, {})
+            if v in u_neighbors:
+                continue
+            u_neighbors[v] = None
+            adjacency.setdefault(v, {})[u] = None
+            constraints.append(NotEqual(u, v))
+        
+        if regions is None:
+            regions = list(adjacency)
+        self.regions = regions
+        self.neighbors = {region: list(adjacency.get(region, ())) for region in regions}
+        
+        # Every region shares one domain list; the solver never modifies it
+        domains = {region: self.colors for region in self.regions}
+        self.csp = CSP(self.regions, domains, constraints, propagation=self.propagation,
+                       incremental_mrv=self.incremental_mrv, compact=self.compact)
+    
     def print_map_info(self):
         """Print information about the map"""
         print("\n=== Map Information ===")
@@ -148,40 +1488,96 @@ class MapColoringCSP:
         for region, adjacent in self.neighbors.items():
             print(f"  {region} is adjacent to: {', '.join(adjacent)}")
     
-    def solve(self):
-        """Solve the map coloring problem"""
+    def solve(self, mode='backtracking', **options):
+        """
+        Solve the map coloring problem
+        
+        Args:
+            mode: 'backtracking' for a single search, 'portfolio' to race
+                several searches with CSP.portfolio_search, or 'local_search'
+                for CSP.local_search on very large maps, or 'components' to
+                solve each connected part of the map on its own with
+                CSP.solve_by_components; options such as workers, timeout,
+                method, max_steps or time_limit are passed on
+        """
         print("\n=== Solving Map Coloring Problem ===")
         
         if not self.csp:
             print("Error: CSP not set up yet!")
             return
         
-        # Solve using backtracking
-        solution = self.csp.backtracking_search()
+        if mode == 'portfolio':
+            solution = self.csp.portfolio_search(**options)
+        elif mode == 'local_search':
+            solution = self.csp.local_search(**options)
+        elif mode == 'components':
+            solution = self.csp.solve_by_components(**options)
+        elif mode == 'backtracking':
+            # Solve using backtracking
+            solution = self.csp.backtracking_search()
+        else:
+            print(f"Error: Unknown solve mode {mode}")
+            return
         
         if solution:
             print("\n=== Solution Found! ===")
             print("\nColor assignments:")
-            for region, color in solution.items():
+            for i, (region, color) in enumerate(solution.items()):
+                if i == 50:
+                    print(f"  ... and {len(solution) - 50} more regions")
+                    break
                 print(f"  {region}: {color}")
             
-            print(f"\nBacktracks: {self.csp.backtrack_count}")
+            self.print_statistics(mode)
             
             # Check if the solution is valid
             self.verify_solution(solution)
         else:
-            print("\nNo solution found! This map cannot be colored with the given colors.")
+            if mode == 'local_search':
+                print("\nNo solution found within the local search budget.")
+            else:
+                print("\nNo solution found! This map cannot be colored with the given colors.")
+            if mode in ('portfolio', 'local_search', 'components'):
+                self.print_statistics(mode)
     
-    def verify_solution(self, solution):
-        """Verify that the solution is valid (no adjacent regions have same color)"""
-        is_valid = True
-        violations = []
+    def print_statistics(self, mode):
+        """Print the search statistics of the last solve"""
+        if mode == 'portfolio':
+            print("\nPortfolio workers:")
+            for report in self.csp.portfolio_stats:
+                winner = " (winner)" if report['winner'] else ""
+                error = f" ({report['error']})" if 'error' in report else ""
+                print(f"  Worker {report['worker']}: {report['status']}{winner}{error}, "
+                      f"{report['backtracks']} backtracks, {report['nodes']} nodes, "
+                      f"{report['restarts']} restarts, {report['time']:.3f}s")
+            return
+        if mode == 'local_search':
+            print(f"\nLocal search steps: {self.csp.step_count}")
+            return
         
+        if mode == 'components':
+            print(f"\nIndependent components: {self.csp.component_count}")
+        print(f"\nBacktracks: {self.csp.backtrack_count}")
+        if self.csp.propagation:
+            print(f"Values pruned ({self.csp.propagation}): {self.csp.prune_count}")
+        if self.csp.incremental_mrv and mode == 'backtracking':
+            print(f"MRV value checks: {self.csp.mrv_update_checks} "
+                  f"({self.csp.mrv_checks_saved} saved by incremental updates)")
+    
+    def find_conflicts(self, solution):
+        """List the pairs of adjacent regions that have the same color in solution"""
+        regions = set(self.regions)
+        violations = []
         for region, adjacent in self.neighbors.items():
             for adj in adjacent:
-                if adj in self.regions and solution.get(region) == solution.get(adj):
-                    is_valid = False
+                if adj in regions and solution.get(region) == solution.get(adj):
                     violations.append((region, adj))
+        return violations
+    
+    def verify_solution(self, solution):
+        """Verify that the solution is valid (no adjacent regions have same color)"""
+        violations = self.find_conflicts(solution)
+        is_valid = not violations
         
         if is_valid:
             print("\nVerification: The solution is valid! ✓")
@@ -213,40 +1609,210 @@ class MapColoringCSP:
         domains = {region: self.colors for region in self.regions}
         
         # Set up constraints - adjacent regions must have different colors
-        constraints = {}
-        for region, adjacent_regions in self.neighbors.items():
-            constraints[region] = []
-            for adj in adjacent_regions:
-                constraints[region].append({
-                    'neighbor': adj,
-                    'check': lambda x, y: x != y
-                })
+        constraints = self.build_constraints()
         
         # Create the CSP
-        self.csp = CSP(self.regions, domains, constraints)
+        self.csp = CSP(self.regions, domains, constraints, propagation=self.propagation,
+                       incremental_mrv=self.incremental_mrv, compact=self.compact)
         
         print("Example set up: Australia map coloring problem")
         self.print_map_info()
 
 
+# ----- Generated benchmark graphs -----
+
+def random_graph(n, average_degree, seed=0):
+    """Random graph with n vertices and about n * average_degree / 2 edges: (regions, edges)"""
+    rng = random.Random(seed)
+    regions = [str(v) for v in range(n)]
+    edges = set()
+    while len(edges) < int(n * average_degree / 2):
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u != v:
+            edges.add((min(u, v), max(u, v)))
+    return regions, [(regions[u], regions[v]) for u, v in sorted(edges)]
+
+
+def planar_graph(width, height, seed=0):
+    """Planar map-like graph: a grid where each cell gets one random diagonal (regions, edges)"""
+    rng = random.Random(seed)
+    regions = [f"{x}_{y}" for y in range(height) for x in range(width)]
+    edges = []
+    for y in range(height):
+        for x in range(width):
+            here = y * width + x
+            if x + 1 < width:
+                edges.append((regions[here], regions[here + 1]))
+            if y + 1 < height:
+                edges.append((regions[here], regions[here + width]))
+            if x + 1 < width and y + 1 < height:
+                if rng.random() < 0.5:
+                    edges.append((regions[here], regions[here + width + 1]))
+                else:
+                    edges.append((regions[here + 1], regions[here + width]))
+    return regions, edges
+
+
+def queen_graph(size):
+    """size x size queen graph: squares are adjacent when a queen could move between them"""
+    regions = [f"{r}_{c}" for r in range(size) for c in range(size)]
+    edges = []
+    for a in range(size * size):
+        ra, ca = divmod(a, size)
+        for b in range(a + 1, size * size):
+            rb, cb = divmod(b, size)
+            if ra == rb or ca == cb or abs(ra - rb) == abs(ca - cb):
+                edges.append((regions[a], regions[b]))
+    return regions, edges
+
+
+def write_dimacs(path, regions, edges):
+    """Write a graph in DIMACS .col format, numbering regions from 1 in list order"""
+    number = {region: i for i, region in enumerate(regions, 1)}
+    with open(path, 'w') as f:
+        f.write(f"p edge {len(regions)} {len(edges)}\n")
+        for u, v in edges:
+            f.write(f"e {number[u]} {number[v]}\n")
+
+
+def benchmark_corpus(seed=0):
+    """The bundled benchmark instances: list of (name, regions, edges, number of colors)"""
+    return [
+        ('random-2000-d4', *random_graph(2000, 4.0, seed), 4),
+        ('random-300-d4-3col', *random_graph(300, 4.0, seed), 3),
+        ('planar-50x50', *planar_graph(50, 50, seed), 4),
+        ('queen5_5', *queen_graph(5), 5),
+        ('queen8_8', *queen_graph(8), 9),
+    ]
+
+
+def ordering_chain(n):
+    """Unsatisfiable chain x0 < x1 < ... < x(n-1) over n - 1 values: (variables, domains, constraints)"""
+    variables = [f"x{i}" for i in range(n)]
+    domains = {var: list(range(n - 1)) for var in variables}
+    constraints = [FunctionConstraint(variables[i], variables[i + 1], operator.lt) for i in range(n - 1)]
+    return variables, domains, constraints
+
+
+def compare_propagation(sizes=(8, 12, 16), backtrack_limit=200000):
+    """
+    Print backtracks and time for plain, forward checking and AC-3 search on ordering chains
+    
+    With MRV, plain backtracking already counts only the values consistent
+    with the assigned neighbours, so it fails on an emptied domain as soon
+    as forward checking would: the two make the same number of backtracks
+    and forward checking only saves the consistency checks. AC-3 also
+    propagates between unassigned variables and refutes the chains without
+    searching at all.
+    """
+    print(f"{'instance':<12} {'propagation':<17} {'status':<8} {'time (s)':>9} {'backtracks':>11}")
+    for n in sizes:
+        for propagation in (None, 'forward_checking', 'ac3'):
+            csp = CSP(*ordering_chain(n), propagation=propagation, incremental_mrv=True)
+            csp.backtrack_limit = backtrack_limit
+            start = time.perf_counter()
+            try:
+                status = 'unsat' if csp.backtracking_search() is None else 'solved'
+            except SearchAborted:
+                status = 'limit'
+            print(f"{'chain-' + str(n):<12} {propagation or 'none':<17} {status:<8} "
+                  f"{time.perf_counter() - start:>9.3f} {csp.backtrack_count:>11}")
+
+
+BENCHMARK_MODES = ['backtracking', 'compact', 'ac3', 'components', 'local_search']
+
+
+def benchmark_case(regions, edges, colors, mode, backtrack_limit=50000, time_limit=30):
+    """Solve one instance in one mode; returns (status, seconds, backtracks)"""
+    map_csp = MapColoringCSP(propagation='ac3' if mode == 'ac3' else 'forward_checking',
+                             compact=mode == 'compact')
+    map_csp.build_from_edges(regions, edges, colors)
+    csp = map_csp.csp
+    csp.backtrack_limit = backtrack_limit
+    
+    start = time.perf_counter()
+    try:
+        if mode == 'local_search':
+            solution = csp.local_search(time_limit=time_limit, seed=0)
+        elif mode == 'components':
+            solution = csp.solve_by_components()
+        else:
+            solution = csp.backtracking_search()
+    except SearchAborted:
+        solution, status = None, 'limit'
+    else:
+        if solution is None:
+            status = 'budget' if mode == 'local_search' else 'unsat'
+        else:
+            status = 'solved' if not map_csp.find_conflicts(solution) else 'INVALID'
+    return status, time.perf_counter() - start, csp.backtrack_count
+
+
+def run_benchmark(corpus=None, modes=None, memory=True):
+    """
+    Solve every benchmark instance in every mode and print a results table
+    
+    Args:
+        corpus: List of (name, regions, edges, colors); defaults to benchmark_corpus()
+        modes: Solver modes from BENCHMARK_MODES; defaults to all of them
+        memory: Repeat each run under tracemalloc to report its peak memory
+    """
+    corpus = benchmark_corpus() if corpus is None else corpus
+    modes = BENCHMARK_MODES if modes is None else modes
+    
+    print(f"{'instance':<20} {'mode':<13} {'status':<8} {'time (s)':>9} {'backtracks':>11} {'peak (KB)':>10}")
+    for name, regions, edges, colors in corpus:
+        for mode in modes:
+            status, seconds, backtracks = benchmark_case(regions, edges, colors, mode)
+            peak = '-'
+            if memory:
+                # Separate run: tracing slows the solver down too much to time it.
+                # Live search state is bounded by the map size, so a short run
+                # reaches the same peak as a long one
+                tracemalloc.start()
+                benchmark_case(regions, edges, colors, mode, backtrack_limit=1000, time_limit=2)
+                peak = tracemalloc.get_traced_memory()[1] // 1024
+                tracemalloc.stop()
+            print(f"{name:<20} {mode:<13} {status:<8} {seconds:>9.3f} {backtracks:>11} {peak:>10}")
+
+
 def main():
     print("Constraint Satisfaction Problem Solver: Map Coloring")
     print("1. Set up your own map coloring problem")
     print("2. Use an example map coloring problem (Australia)")
+    print("3. Load a map from a DIMACS .col or edge-list file")
+    print("4. Run the benchmark over the generated graph corpus")
+    print("5. Compare backtracks with and without constraint propagation")
     
-    choice = input("\nSelect an option (1 or 2): ")
+    choice = input("\nSelect an option (1-5): ")
+    
+    if choice == '4':
+        run_benchmark()
+        return
+    if choice == '5':
+        compare_propagation()
+        return
     
     map_csp = MapColoringCSP()
+    mode = 'backtracking'
     
     if choice == '1':
         map_csp.setup_from_user_input()
+    elif choice == '3':
+        path = input("Enter the file path: ").strip()
+        colors = int(input("Enter the number of colors: "))
+        if path.endswith('.col'):
+            map_csp.load_dimacs(path, colors)
+        else:
+            map_csp.load_edge_list(path, colors)
+        mode = input("Solve mode (backtracking/components/local_search/portfolio) [backtracking]: ").strip() or mode
     else:
         map_csp.provide_example()
     
     print("\nReady to solve? (press Enter)")
     input()
     
-    map_csp.solve()
+    map_csp.solve(mode)
 
 if __name__ == "__main__":
     main()
@@ -1,17 +1,239 @@
+from concurrent.futures import ProcessPoolExecutor
 import math
+import mmap
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+# Transposition table entry flags: the stored score is exact, or only a bound
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# The 8 symmetries of the 3x3 board, each mapping cell index (row * 3 + col) to its image
+SYMMETRIES = []
+for _transform in (lambda r, c: (r, c), lambda r, c: (c, 2 - r), lambda r, c: (2 - r, 2 - c),
+                   lambda r, c: (2 - c, r), lambda r, c: (r, 2 - c), lambda r, c: (2 - r, c),
+                   lambda r, c: (c, r), lambda r, c: (2 - c, 2 - r)):
+    SYMMETRIES.append(tuple(3 * _transform(r, c)[0] + _transform(r, c)[1] for r in range(3) for c in range(3)))
+
+# Zobrist keys: one random 64-bit number per (player, cell)
+_rng = random.Random(20240)
+ZOBRIST = {player: [_rng.getrandbits(64) for _ in range(9)] for player in ('X', 'O')}
+
+
+class ListBoard:
+    """
+    3x3 board stored as a list of lists of 'X', 'O' and ' '
+    
+    Board interface used by TicTacToe: cell, place, remove, winner and moves.
+    """
+
+    def __init__(self):
+        self.rows = [[' ' for _ in range(3)] for _ in range(3)]
+
+    def cell(self, row, col):
+        return self.rows[row][col]
+
+    def place(self, row, col, player):
+        self.rows[row][col] = player
+
+    def remove(self, row, col):
+        self.rows[row][col] = ' '
+
+    def winner(self):
+        """'X' or 'O' if that player has three in a row, 'Tie' if the board is full, else None"""
+        board = self.rows
+        # Check rows
+        for i in range(3):
+            if board[i][0] == board[i][1] == board[i][2] != ' ':
+                return board[i][0]
+        
+        # Check columns
+        for i in range(3):
+            if board[0][i] == board[1][i] == board[2][i] != ' ':
+                return board[0][i]
+        
+        # Check diagonals
+        if board[0][0] == board[1][1] == board[2][2] != ' ':
+            return board[0][0]
+        if board[0][2] == board[1][1] == board[2][0] != ' ':
+            return board[0][2]
+        
+        # Check for tie
+        if all(board[i][j] != ' ' for i in range(3) for j in range(3)):
+            return 'Tie'
+        
+        # Game still ongoing
+        return None
+
+    def moves(self):
+        """All empty cells as (row, col)"""
+        moves = []
+        for i in range(3):
+            for j in range(3):
+                if self.rows[i][j] == ' ':
+                    moves.append((i, j))
+        return moves
+
+
+class BitBoard:
+    """
+    3x3 board stored as one 9-bit integer per player (bit row * 3 + col)
+    
+    Same interface as ListBoard. A win is a mask test against the 8 lines,
+    and empty cells are walked by peeling off the lowest set bit.
+    """
+    FULL = 0b111111111
+    WIN_MASKS = (0b000000111, 0b000111000, 0b111000000,  # Rows
+                 0b001001001, 0b010010010, 0b100100100,  # Columns
+                 0b100010001, 0b001010100)               # Diagonals
+    # Cell index -> (row, col), so moves() needs no division
+    CELLS = tuple(divmod(cell, 3) for cell in range(9))
 
-class TicTacToe:
     def __init__(self):
-        # Initialize empty 3x3 board
-        self.board = [[' ' for _ in range(3)] for _ in range(3)]
+        self.x = 0
+        self.o = 0
+
+    def cell(self, row, col):
+        bit = 1 << (row * 3 + col)
+        if self.x & bit:
+            return 'X'
+        if self.o & bit:
+            return 'O'
+        return ' '
+
+    def place(self, row, col, player):
+        if player == 'X':
+            self.x |= 1 << (row * 3 + col)
+        else:
+            self.o |= 1 << (row * 3 + col)
+
+    def remove(self, row, col):
+        mask = ~(1 << (row * 3 + col))
+        self.x &= mask
+        self.o &= mask
+
+    def winner(self):
+        """'X' or 'O' if that player has three in a row, 'Tie' if the board is full, else None"""
+        x, o = self.x, self.o
+        for mask in self.WIN_MASKS:
+            if x & mask == mask:
+                return 'X'
+            if o & mask == mask:
+                return 'O'
+        if x | o == self.FULL:
+            return 'Tie'
+        return None
+
+    def moves(self):
+        """All empty cells as (row, col)"""
+        empty = ~(self.x | self.o) & self.FULL
+        moves = []
+        while empty:
+            low = empty & -empty
+            moves.append(self.CELLS[low.bit_length() - 1])
+            empty ^= low
+        return moves
+
+
+BACKENDS = {'list': ListBoard, 'bitboard': BitBoard}
+
+# Perfect-play lookup table: a header, then one 2-byte record per position.
+# A position's index is the base-3 number whose digit for cell row * 3 + col
+# is 0 (empty), 1 (AI) or 2 (human). A record is the AI's best cell (or
+# NO_ENTRY if the AI never has to move there) and best_move's score + 128.
+LOOKUP_MAGIC = b'TTT1'
+LOOKUP_POSITIONS = 3 ** 9
+NO_ENTRY = 255
+DEFAULT_LOOKUP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tictactoe.table')
+POWERS_OF_3 = [3 ** cell for cell in range(9)]
+_lookup_tables = {}  # path -> mmap, shared by every game in the process
+
+
+def load_lookup_table(path):
+    """Memory-map a lookup table file, or return None if it is missing or malformed"""
+    if path not in _lookup_tables:
+        table = None
+        try:
+            # Check the size first: an empty file cannot be mapped at all
+            if os.path.getsize(path) == len(LOOKUP_MAGIC) + 2 * LOOKUP_POSITIONS:
+                with open(path, 'rb') as f:
+                    table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            table = None  # Missing or unreadable: fall back to search
+        if table is not None and table[:len(LOOKUP_MAGIC)] != LOOKUP_MAGIC:
+            table.close()
+            table = None
+        _lookup_tables[path] = table
+    return _lookup_tables[path]
+
+
+def generate_lookup_table(path=DEFAULT_LOOKUP_PATH):
+    """
+    Solve every position where the AI is to move and write the lookup table
+    
+    The AI is to move when both sides have the same number of marks (AI
+    started) or the human has one more (human started), and the game is not
+    over. Each position is solved by the normal search, so the table gives
+    exactly the moves best_move would. One game is reused for all of them,
+    so its transposition table carries over between positions.
+    
+    Returns:
+        Number of positions stored
+    """
+    records = bytearray([NO_ENTRY, 0]) * LOOKUP_POSITIONS
+    game = TicTacToe(lookup_path=None)
+    stored = 0
+    for index in range(LOOKUP_POSITIONS):
+        digits = [index // power % 3 for power in POWERS_OF_3]
+        ai_marks, human_marks = digits.count(1), digits.count(2)
+        if ai_marks != human_marks and human_marks != ai_marks + 1:
+            continue
+        for cell, digit in enumerate(digits):
+            if digit:
+                game.place(cell // 3, cell % 3, game.ai if digit == 1 else game.human)
+        if game.check_winner() is None:
+            row, col = game.best_move()
+            records[2 * index] = row * 3 + col
+            records[2 * index + 1] = game.best_score + 128
+            stored += 1
+        for cell, digit in enumerate(digits):
+            if digit:
+                game.remove(cell // 3, cell % 3)
+    
+    with open(path, 'wb') as f:
+        f.write(LOOKUP_MAGIC)
+        f.write(records)
+    _lookup_tables.pop(path, None)  # Reload the new file next time
+    return stored
+
+
+class TicTacToe:
+    def __init__(self, use_table=True, backend='list', lookup_path=DEFAULT_LOOKUP_PATH):
+        # Initialize empty 3x3 board ('list' or 'bitboard' backend)
+        self.board = BACKENDS[backend]()
         self.human = 'X'
         self.ai = 'O'
         
+        # Zobrist hash of the board under each of the 8 symmetries, updated
+        # on every move; the smallest one identifies the position up to symmetry
+        self.hashes = [0] * len(SYMMETRIES)
+        self.use_table = use_table
+        self.table = {}  # (canonical hash, AI to move) -> (flag, score relative to the node)
+        self.nodes = 0  # Positions visited by the last best_move search
+        self.best_score = None  # Score of the last best_move
+        
+        # Base-3 index of the board for the perfect-play lookup table, and
+        # the table itself (None when there is no table file: search instead)
+        self.position = 0
+        self.lookup = load_lookup_table(lookup_path) if lookup_path else None
+        
     def print_board(self):
         """Print the current state of the board"""
         print("  0 1 2")
         for i in range(3):
-            print(f"{i} {self.board[i][0]}|{self.board[i][1]}|{self.board[i][2]}")
+            print(f"{i} {self.board.cell(i, 0)}|{self.board.cell(i, 1)}|{self.board.cell(i, 2)}")
             if i < 2:
                 print("  -+-+-")
     
@@ -19,55 +241,74 @@ class TicTacToe:
         """Check if a move is valid"""
         if row < 0 or row > 2 or col < 0 or col > 2:
             return False
-        if self.board[row][col] != ' ':
+        if self.board.cell(row, col) != ' ':
             return False
         return True
     
     def make_move(self, row, col, player):
         """Make a move on the board"""
         if self.is_valid_move(row, col):
-            self.board[row][col] = player
+            self.place(row, col, player)
             return True
         return False
     
+    def place(self, row, col, player):
+        """Put a mark on an empty cell, keeping the symmetric hashes up to date if the table is on"""
+        self.board.place(row, col, player)
+        self.position += (1 if player == self.ai else 2) * POWERS_OF_3[row * 3 + col]
+        if self.use_table:
+            self.toggle_hash(row * 3 + col, player)
+    
+    def remove(self, row, col):
+        """Take a mark back off the board"""
+        player = self.board.cell(row, col)
+        self.position -= (1 if player == self.ai else 2) * POWERS_OF_3[row * 3 + col]
+        if self.use_table:
+            self.toggle_hash(row * 3 + col, player)
+        self.board.remove(row, col)
+    
+    def toggle_hash(self, cell, player):
+        keys = ZOBRIST[player]
+        for i, symmetry in enumerate(SYMMETRIES):
+            self.hashes[i] ^= keys[symmetry[cell]]
+    
+    @staticmethod
+    def to_table_score(score, depth):
+        """Make a win/loss score relative to this node, so it can be reused at any depth"""
+        if score > 0:
+            return score + depth
+        if score < 0:
+            return score - depth
+        return score
+    
+    @staticmethod
+    def from_table_score(score, depth):
+        """Turn a stored node-relative score back into a score at this depth"""
+        if score > 0:
+            return score - depth
+        if score < 0:
+            return score + depth
+        return score
+    
     def check_winner(self):
         """Check if there's a winner or a tie"""
-        # Check rows
-        for i in range(3):
-            if self.board[i][0] == self.board[i][1] == self.board[i][2] != ' ':
-                return self.board[i][0]
-        
-        # Check columns
-        for i in range(3):
-            if self.board[0][i] == self.board[1][i] == self.board[2][i] != ' ':
-                return self.board[0][i]
-        
-        # Check diagonals
-        if self.board[0][0] == self.board[1][1] == self.board[2][2] != ' ':
-            return self.board[0][0]
-        if self.board[0][2] == self.board[1][1] == self.board[2][0] != ' ':
-            return self.board[0][2]
-        
-        # Check for tie
-        if all(self.board[i][j] != ' ' for i in range(3) for j in range(3)):
-            return 'Tie'
-        
-        # Game still ongoing
-        return None
+        return self.board.winner()
     
     def get_available_moves(self):
         """Get all empty cells"""
-        moves = []
-        for i in range(3):
-            for j in range(3):
-                if self.board[i][j] == ' ':
-                    moves.append((i, j))
-        return moves
+        return self.board.moves()
     
     def minimax(self, depth, is_maximizing, alpha=float('-inf'), beta=float('inf')):
         """
         Minimax algorithm with alpha-beta pruning
         
+        Results are cached in a transposition table keyed by the board's
+        canonical hash (the smallest over the 8 symmetries) and the side to
+        move. A search cut short by alpha or beta only proves a bound, so
+        each entry is flagged exact, lower or upper bound. Win and loss
+        scores are stored relative to the node, since the same position
+        can turn up at different depths.
+        
         Parameters:
         - depth: current depth in the game tree
         - is_maximizing: True if current move is by maximizing player (AI)
@@ -76,6 +317,7 @@ class TicTacToe:
         Returns:
         - best score for the current board state
         """
+        self.nodes += 1
         result = self.check_winner()
         
         # Terminal states
@@ -86,54 +328,105 @@ class TicTacToe:
         elif result == 'Tie':
             return 0  # Tie
         
+        if self.use_table:
+            key = (min(self.hashes), is_maximizing)
+            entry = self.table.get(key)
+            if entry is not None:
+                flag, stored = entry
+                score = self.from_table_score(stored, depth)
+                if flag == EXACT:
+                    return score
+                if flag == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if beta <= alpha:
+                    return score
+            alpha_orig, beta_orig = alpha, beta
+        
         if is_maximizing:
             # AI's turn (maximizing)
             best_score = float('-inf')
             for move in self.get_available_moves():
                 row, col = move
-                self.board[row][col] = self.ai
+                self.place(row, col, self.ai)
                 score = self.minimax(depth + 1, False, alpha, beta)
-                self.board[row][col] = ' '  # Undo move
+                self.remove(row, col)  # Undo move
                 best_score = max(score, best_score)
                 
                 # Alpha-beta pruning
                 alpha = max(alpha, best_score)
                 if beta <= alpha:
                     break
-            return best_score
         else:
             # Human's turn (minimizing)
             best_score = float('inf')
             for move in self.get_available_moves():
                 row, col = move
-                self.board[row][col] = self.human
+                self.place(row, col, self.human)
                 score = self.minimax(depth + 1, True, alpha, beta)
-                self.board[row][col] = ' '  # Undo move
+                self.remove(row, col)  # Undo move
                 best_score = min(score, best_score)
                 
                 # Alpha-beta pruning
                 beta = min(beta, best_score)
                 if beta <= alpha:
                     break
-            return best_score
+        
+        if self.use_table:
+            if best_score <= alpha_orig:
+                flag = UPPER
+            elif best_score >= beta_orig:
+                flag = LOWER
+            else:
+                flag = EXACT
+            self.table[key] = (flag, self.to_table_score(best_score, depth))
+        return best_score
     
     def best_move(self):
-        """Find the best move for AI using minimax algorithm"""
+        """
+        Find the best move for AI using minimax algorithm
+        
+        If a lookup table is loaded, the answer is a single read from it.
+        Otherwise each root move is searched with alpha set to the best
+        score so far, so a move that cannot beat it is cut off early. Ties
+        keep the first move found.
+        """
+        self.nodes = 0
+        if self.lookup is not None:
+            offset = len(LOOKUP_MAGIC) + 2 * self.position
+            cell = self.lookup[offset]
+            if cell != NO_ENTRY:
+                self.best_score = self.lookup[offset + 1] - 128
+                return divmod(cell, 3)
+        
         best_score = float('-inf')
         best_move = None
         
         for move in self.get_available_moves():
-            row, col = move
-            self.board[row][col] = self.ai
-            score = self.minimax(0, False)
-            self.board[row][col] = ' '  # Undo move
+            score = self.search_root_move(move, best_score)
             
             if score > best_score:
                 best_score = score
                 best_move = move
         
+        self.best_score = best_score
         return best_move
     
+    def search_root_move(self, move, alpha=float('-inf')):
+        """Score of the AI playing move here (exact if above alpha)"""
+        row, col = move
+        self.place(row, col, self.ai)
+        score = self.minimax(0, False, alpha)
+        self.remove(row, col)  # Undo move
+        return score
+    
+    def snapshot(self):
+        """Picklable description of the game, for rebuilding it in a worker process"""
+        marks = [(row, col, self.board.cell(row, col)) for row in range(3) for col in range(3)
+                 if self.board.cell(row, col) != ' ']
+        return 'tictactoe', {'use_table': self.use_table, 'lookup_path': None}, marks
+    
     def play_game(self):
         """Main game loop"""
         print("Welcome to Tic-Tac-Toe!")
@@ -180,6 +473,507 @@ class TicTacToe:
         self.print_board()
         print("Game over!")
 
+class SearchTimeout(Exception):
+    """Raised inside MNKGame's search when the move's time budget runs out"""
+
+
+class MNKGame:
+    """
+    Generalised tic-tac-toe: an m x n board where k in a row wins
+    
+    The board is a flat list of cells (index row * cols + col). Every
+    window of k cells in a row, column or diagonal is a line. For each
+    line, the number of AI and human marks in it is kept up to date on
+    every move. That gives the win test and a heuristic evaluation in
+    O(lines through the cell) per move, with no board scan. A line that
+    only one side has marks in is worth weight[count] to that side. A
+    line both sides have marks in is dead and worth nothing.
+    """
+    WIN = 10 ** 9  # Score of a win, less one per ply it takes
+    RADIUS = 2  # Only empty cells this close to a mark are searched
+
+    def __init__(self, rows=7, cols=7, k=5, time_limit=1.0):
+        self.rows, self.cols, self.k = rows, cols, k
+        self.size = rows * cols
+        self.board = [' '] * self.size
+        self.human = 'X'
+        self.ai = 'O'
+        self.time_limit = time_limit  # Seconds per computer move
+        
+        # Lines: every window of k cells along the 4 directions
+        self.lines = []
+        for row in range(rows):
+            for col in range(cols):
+                for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_row, end_col = row + d_row * (k - 1), col + d_col * (k - 1)
+                    if 0 <= end_row < rows and 0 <= end_col < cols:
+                        self.lines.append(tuple((row + d_row * i) * cols + col + d_col * i for i in range(k)))
+        self.cell_lines = [[] for _ in range(self.size)]
+        for line_id, line in enumerate(self.lines):
+            for cell in line:
+                self.cell_lines[cell].append(line_id)
+        self.neighbours = [[r * cols + c
+                            for r in range(max(0, cell // cols - self.RADIUS), min(rows, cell // cols + self.RADIUS + 1))
+                            for c in range(max(0, cell % cols - self.RADIUS), min(cols, cell % cols + self.RADIUS + 1))
+                            if r * cols + c != cell]
+                           for cell in range(self.size)]
+        
+        # contribution[a][h]: value of a line holding a AI marks and h human marks
+        weight = [0] + [8 ** count for count in range(1, k)] + [0]
+        self.contribution = [[weight[a] if h == 0 else (-weight[h] if a == 0 else 0)
+                              for h in range(k + 1)] for a in range(k + 1)]
+        self.ai_count = [0] * len(self.lines)
+        self.human_count = [0] * len(self.lines)
+        self.completed = {self.ai: 0, self.human: 0}  # Lines filled by one player
+        self.near = [0] * self.size  # Marks within RADIUS of each cell
+        self.score = 0  # Sum of line contributions, from the AI's point of view
+        self.moves_made = []  # Cells in the order they were filled
+        
+        # Search state
+        self.nodes = 0
+        self.depth_reached = 0
+        self.deadline = None
+        self.pv = [[]]  # pv[ply]: best line found from that ply in this iteration
+        self.previous_pv = []  # Principal variation of the last finished iteration
+        self.killers = []  # killers[ply]: up to two moves that caused a cutoff there
+        self.history = {self.ai: [0] * self.size, self.human: [0] * self.size}
+
+    def print_board(self):
+        """Print the current state of the board"""
+        print("   " + " ".join(f"{col:<2}" for col in range(self.cols)))
+        for row in range(self.rows):
+            print(f"{row:<2} " + "  ".join(self.board[row * self.cols:(row + 1) * self.cols]))
+
+    def is_valid_move(self, row, col):
+        """Check if a move is valid"""
+        return 0 <= row < self.rows and 0 <= col < self.cols and self.board[row * self.cols + col] == ' '
+
+    def make_move(self, row, col, player):
+        """Make a move on the board"""
+        if self.is_valid_move(row, col):
+            self.place(row * self.cols + col, player)
+            return True
+        return False
+
+    def place(self, cell, player):
+        """Fill a cell and update the line counts, win count and evaluation"""
+        self.board[cell] = player
+        self.moves_made.append(cell)
+        counts = self.ai_count if player == self.ai else self.human_count
+        for line_id in self.cell_lines[cell]:
+            a, h = self.ai_count[line_id], self.human_count[line_id]
+            self.score -= self.contribution[a][h]
+            counts[line_id] += 1
+            if counts[line_id] == self.k:
+                self.completed[player] += 1
+            self.score += self.contribution[self.ai_count[line_id]][self.human_count[line_id]]
+        for other in self.neighbours[cell]:
+            self.near[other] += 1
+
+    def remove(self, cell):
+        """Undo the last move, which filled cell"""
+        player = self.board[cell]
+        self.board[cell] = ' '
+        self.moves_made.pop()
+        counts = self.ai_count if player == self.ai else self.human_count
+        for line_id in self.cell_lines[cell]:
+            self.score -= self.contribution[self.ai_count[line_id]][self.human_count[line_id]]
+            if counts[line_id] == self.k:
+                self.completed[player] -= 1
+            counts[line_id] -= 1
+            self.score += self.contribution[self.ai_count[line_id]][self.human_count[line_id]]
+        for other in self.neighbours[cell]:
+            self.near[other] -= 1
+
+    def check_winner(self):
+        """Check if there's a winner or a tie"""
+        if self.completed[self.ai]:
+            return self.ai
+        if self.completed[self.human]:
+            return self.human
+        if len(self.moves_made) == self.size:
+            return 'Tie'
+        return None
+
+    def get_available_moves(self):
+        """Empty cells near a mark (the centre on an empty board)"""
+        if not self.moves_made:
+            return [(self.rows // 2) * self.cols + self.cols // 2]
+        return [cell for cell in range(self.size) if self.board[cell] == ' ' and self.near[cell]]
+
+    def ordered_moves(self, ply, player):
+        """Candidate moves, best first: PV move, then killers, then by history score"""
+        history = self.history[player]
+        order = {cell: history[cell] for cell in self.get_available_moves()}
+        for age, move in enumerate(self.killers[ply]):
+            if move in order:
+                order[move] = 10 ** 12 * (2 - age)
+        if ply < len(self.previous_pv) and self.previous_pv[ply] in order:
+            order[self.previous_pv[ply]] = 10 ** 15
+        return sorted(order, key=order.get, reverse=True)
+
+    def minimax(self, depth, ply, is_maximizing, alpha=float('-inf'), beta=float('inf')):
+        """
+        Depth-limited minimax with alpha-beta pruning
+        
+        Parameters:
+        - depth: plies left to search before using the evaluation
+        - ply: distance from the root
+        - is_maximizing: True if it is the AI's move
+        - alpha, beta: parameters for alpha-beta pruning
+        
+        Returns:
+        - best score for the current board state
+        """
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        self.pv[ply] = []
+        
+        result = self.check_winner()
+        if result == self.ai:
+            return self.WIN - ply
+        elif result == self.human:
+            return ply - self.WIN
+        elif result == 'Tie':
+            return 0
+        if depth == 0:
+            return self.score
+        
+        if len(self.pv) <= ply + 1:
+            self.pv.append([])
+            self.killers.append([])
+        player = self.ai if is_maximizing else self.human
+        best_score = float('-inf') if is_maximizing else float('inf')
+        for cell in self.ordered_moves(ply, player):
+            self.place(cell, player)
+            score = self.minimax(depth - 1, ply + 1, not is_maximizing, alpha, beta)
+            self.remove(cell)
+            
+            if (score > best_score) if is_maximizing else (score < best_score):
+                best_score = score
+                self.pv[ply] = [cell] + self.pv[ply + 1]
+            if is_maximizing:
+                alpha = max(alpha, best_score)
+            else:
+                beta = min(beta, best_score)
+            if beta <= alpha:
+                # Remember the refutation for sibling nodes and later iterations
+                if cell not in self.killers[ply]:
+                    self.killers[ply] = [cell] + self.killers[ply][:1]
+                self.history[player][cell] += depth * depth
+                break
+        return best_score
+
+    def best_move(self, time_limit=None):
+        """
+        Find the AI's move by iterative deepening within a time budget
+        
+        Searches depth 1, 2, ... until the budget runs out, a forced win or
+        loss is found, or the game tree is exhausted. Each iteration tries
+        the previous principal variation first, so it often just confirms
+        it. If time runs out mid-iteration, the best root move finished in
+        that iteration is used. It was searched deeper than the previous
+        answer, and the previous answer was searched first.
+        
+        Returns:
+            (row, col) of the chosen move
+        """
+        time_limit = self.time_limit if time_limit is None else time_limit
+        self.start_search(time.perf_counter() + time_limit)
+        root_moves = len(self.moves_made)
+        
+        candidates = self.ordered_moves(0, self.ai)
+        best = candidates[0]
+        for depth in range(1, self.size - root_moves + 1):
+            try:
+                score = self.minimax(depth, 0, True)
+            except SearchTimeout:
+                while len(self.moves_made) > root_moves:
+                    self.remove(self.moves_made[-1])
+                if self.pv[0]:
+                    best = self.pv[0][0]
+                break
+            best = self.pv[0][0]
+            self.previous_pv = self.pv[0]
+            self.depth_reached = depth
+            if abs(score) > self.WIN - self.size:
+                break  # Forced result: searching deeper cannot change it
+        return divmod(best, self.cols)
+
+    def start_search(self, deadline):
+        """Reset the per-move search state"""
+        self.deadline = deadline
+        self.nodes = 0
+        self.depth_reached = 0
+        self.previous_pv = []
+        while len(self.pv) < 2:
+            self.pv.append([])
+        self.killers = [[] for _ in range(len(self.pv))]
+
+    def search_root_move(self, cell, depth, alpha=float('-inf')):
+        """
+        Score of the AI playing cell, looking depth plies ahead in total
+        (exact if above alpha). Raises SearchTimeout past the deadline,
+        with the board already restored.
+        """
+        root_moves = len(self.moves_made)
+        self.place(cell, self.ai)
+        try:
+            return self.minimax(depth - 1, 1, False, alpha)
+        finally:
+            while len(self.moves_made) > root_moves:
+                self.remove(self.moves_made[-1])
+
+    def snapshot(self):
+        """Picklable description of the game, for rebuilding it in a worker process"""
+        return 'mnk', {'rows': self.rows, 'cols': self.cols, 'k': self.k}, \
+            [(cell, self.board[cell]) for cell in self.moves_made]
+
+    def play_game(self):
+        """Main game loop"""
+        print(f"Welcome to {self.rows}x{self.cols} {self.k}-in-a-row!")
+        print("You are X, the computer is O")
+        
+        turn = input("Do you want to go first? (y/n): ").lower()
+        current_player = self.human if turn == 'y' else self.ai
+        
+        while True:
+            self.print_board()
+            
+            result = self.check_winner()
+            if result:
+                if result == 'Tie':
+                    print("It's a tie!")
+                else:
+                    print(f"Player {result} wins!")
+                break
+            
+            if current_player == self.human:
+                valid_move = False
+                while not valid_move:
+                    try:
+                        row = int(input(f"Enter row (0-{self.rows - 1}): "))
+                        col = int(input(f"Enter column (0-{self.cols - 1}): "))
+                        valid_move = self.make_move(row, col, self.human)
+                        if not valid_move:
+                            print("Invalid move, try again.")
+                    except ValueError:
+                        print("Please enter numbers within the board.")
+                current_player = self.ai
+            else:
+                print("Computer is thinking...")
+                row, col = self.best_move()
+                print(f"Computer chose: row {row}, column {col} "
+                      f"(depth {self.depth_reached}, {self.nodes} nodes)")
+                self.make_move(row, col, self.ai)
+                current_player = self.human
+        
+        print("Game over!")
+
+
+_shared_alpha = None  # Best root score so far, shared by the ParallelSearch workers
+_worker_games = {}  # Board geometry -> game reused by this worker, so lines are built once
+
+
+def _set_shared_alpha(alpha):
+    global _shared_alpha
+    _shared_alpha = alpha
+
+
+def _restore_game(snapshot):
+    """Rebuild a game from its snapshot"""
+    kind, options, marks = snapshot
+    if kind == 'tictactoe':
+        game = TicTacToe(**options)
+        for row, col, player in marks:
+            game.place(row, col, player)
+    else:
+        key = (options['rows'], options['cols'], options['k'])
+        if key not in _worker_games:
+            _worker_games[key] = MNKGame(**options)
+        game = _worker_games[key]
+        while game.moves_made:
+            game.remove(game.moves_made[-1])
+        for cell, player in marks:
+            game.place(cell, player)
+    return game
+
+
+def _search_root_move(snapshot, move, depth, deadline):
+    """
+    Worker task: score one root move, or None if the deadline passed
+    
+    The search starts from the shared alpha, lowered by one. Scores are
+    integers, so a move that ties the best score still gets its exact
+    score, and the merge can break ties by move order just as the serial
+    search does.
+    """
+    if deadline is not None and time.time() >= deadline:
+        return None
+    game = _restore_game(snapshot)
+    alpha = _shared_alpha.value - 1
+    if depth is None:
+        score = game.search_root_move(move, alpha)
+    else:
+        # Deadlines cross processes as wall-clock time; the search uses perf_counter
+        game.start_search(time.perf_counter() + (deadline - time.time()))
+        try:
+            score = game.search_root_move(move, depth, alpha)
+        except SearchTimeout:
+            return None
+    with _shared_alpha.get_lock():
+        if score > _shared_alpha.value:
+            _shared_alpha.value = score
+    return score
+
+
+class ParallelSearch:
+    """
+    Root-parallel best_move for TicTacToe and MNKGame over a process pool
+    
+    Young brothers wait: the first root move in the game's own order is
+    searched in this process, to get a good bound. The other root moves
+    are then shared out to the workers. Each starts from the best score
+    any move has reached so far, held in a shared multiprocessing.Value.
+    The results are merged in root order, so the chosen move is the one
+    the serial search picks, whatever order the workers finish in.
+    
+    Keep one ParallelSearch for many moves: the pool is started once.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.alpha = multiprocessing.Value('d', float('-inf'))
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_set_shared_alpha,
+                                            initargs=(self.alpha,))
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def search_root(self, game, moves, depth=None, deadline=None):
+        """
+        Score every root move, the first one here and the rest in the pool
+        (for MNKGame, searched depth plies ahead until the wall-clock
+        deadline, after game.start_search)
+        
+        Returns:
+            (best move, its score, whether every move finished in time),
+            or None if even the first move ran out of time
+        """
+        try:
+            if depth is None:
+                first = game.search_root_move(moves[0])
+            else:
+                game.deadline = time.perf_counter() + (deadline - time.time())
+                first = game.search_root_move(moves[0], depth)
+        except SearchTimeout:
+            return None
+        self.alpha.value = first
+        
+        snapshot = game.snapshot()
+        futures = [self.executor.submit(_search_root_move, snapshot, move, depth, deadline)
+                   for move in moves[1:]]
+        scores = [first] + [future.result() for future in futures]
+        complete = None not in scores
+        best = max((score, -i) for i, score in enumerate(scores) if score is not None)
+        return moves[-best[1]], best[0], complete
+
+    def best_move(self, game, time_limit=None):
+        """
+        Parallel version of game.best_move()
+        
+        TicTacToe is searched to the end of the game. MNKGame deepens one
+        ply at a time until its time budget runs out, with each depth
+        searched in parallel and the last best move tried first at the
+        next depth.
+        
+        Returns:
+            (row, col) of the chosen move
+        """
+        if isinstance(game, TicTacToe):
+            move, score, _ = self.search_root(game, game.get_available_moves())
+            game.best_score = score
+            return move
+        
+        time_limit = game.time_limit if time_limit is None else time_limit
+        deadline = time.time() + time_limit
+        game.start_search(time.perf_counter() + time_limit)
+        best = game.ordered_moves(0, game.ai)[0]
+        for depth in range(1, game.size - len(game.moves_made) + 1):
+            game.previous_pv = [best]
+            result = self.search_root(game, game.ordered_moves(0, game.ai), depth, deadline)
+            if result is None:
+                break
+            best, score, complete = result
+            if not complete:
+                break
+            game.depth_reached = depth
+            if abs(score) > game.WIN - game.size:
+                break  # Forced result: searching deeper cannot change it
+        return divmod(best, game.cols)
+
+
+def benchmark_parallel(rows=7, cols=7, k=5, depth=4, max_workers=None):
+    """
+    Time one fixed-depth MNKGame root search with 1, 2, ... worker processes
+    
+    The position is an opening with three marks, and every run picks the
+    same move, so only the latency changes.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    print(f"{'workers':>7} {'seconds':>9} {'move':>8}")
+    for workers in range(1, max_workers + 1):
+        game = MNKGame(rows, cols, k)
+        for row, col, player in ((rows // 2, cols // 2, 'X'), (rows // 2, cols // 2 + 1, 'O'),
+                                 (rows // 2 - 1, cols // 2 - 1, 'X')):
+            game.make_move(row, col, player)
+        game.start_search(float('inf'))
+        with ParallelSearch(workers) as search:
+            start = time.perf_counter()
+            move, _, _ = search.search_root(game, game.ordered_moves(0, game.ai), depth, float('inf'))
+            seconds = time.perf_counter() - start
+        print(f"{workers:>7} {seconds:>9.3f} {str(divmod(move, cols)):>8}")
+
+
+def benchmark_backends(repeats=3):
+    """
+    Compare search speed of the board backends
+    
+    Times a full search for the AI's first move on an empty board, with
+    the transposition table off so both backends visit the same nodes,
+    and prints nodes per second (best of repeats).
+    """
+    print(f"{'backend':<10} {'nodes':>8} {'seconds':>9} {'nodes/s':>10}")
+    for backend in BACKENDS:
+        best = None
+        for _ in range(repeats):
+            game = TicTacToe(use_table=False, backend=backend, lookup_path=None)
+            start = time.perf_counter()
+            game.best_move()
+            seconds = time.perf_counter() - start
+            best = seconds if best is None else min(best, seconds)
+        print(f"{backend:<10} {game.nodes:>8} {best:>9.4f} {game.nodes / best:>10.0f}")
+
+
 if __name__ == "__main__":
-    game = TicTacToe()
-    game.play_game()
\ No newline at end of file
+    if '--benchmark' in sys.argv:
+        benchmark_backends()
+    elif '--benchmark-parallel' in sys.argv:
+        benchmark_parallel()
+    elif '--mnk' in sys.argv:
+        # e.g. --mnk 7 7 5: a 7x7 board, five in a row wins
+        rows, cols, k = (int(arg) for arg in sys.argv[sys.argv.index('--mnk') + 1:][:3])
+        MNKGame(rows, cols, k).play_game()
+    elif '--generate-table' in sys.argv:
+        count = generate_lookup_table()
+        print(f"Stored {count} positions in {DEFAULT_LOOKUP_PATH}")
+    else:
+        game = TicTacToe()
+        game.play_game()
\ No newline at end of file
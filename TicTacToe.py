@@ -1,3 +1,12 @@
+import asyncio
+import itertools
+import random
+import sys
+import time
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
 def print_board(board):
     print("\nCurrent Board:")
     for row in board:
@@ -20,13 +29,233 @@ def check_winner(board, player):
 def is_full(board):
     return all([cell != " " for row in board for cell in row])
 
+class Board:
+    """A Tic-Tac-Toe board that detects a win or draw from the last move only.
+
+    Each row, column and diagonal keeps a counter: +1 for every X and -1 for
+    every O. A line is won when its counter reaches +3 or -3, so a move only
+    has to update the (at most four) lines through its cell.
+    """
+
+    def __init__(self):
+        self.cells = [[" " for _ in range(3)] for _ in range(3)]
+        self.rows = [0, 0, 0]
+        self.cols = [0, 0, 0]
+        self.diag = 0
+        self.anti = 0
+        self.moves = 0
+        self.current_player = "X"
+
+    def play(self, row, col):
+        """Place the current player's mark, switch players and return "win", "draw" or None."""
+        if not (0 <= row <= 2 and 0 <= col <= 2):
+            raise ValueError("Invalid position.")
+        if self.cells[row][col] != " ":
+            raise ValueError("Cell already taken.")
+
+        player = self.current_player
+        delta = 1 if player == "X" else -1
+        self.cells[row][col] = player
+        self.moves += 1
+        self.rows[row] += delta
+        self.cols[col] += delta
+        won = abs(self.rows[row]) == 3 or abs(self.cols[col]) == 3
+        if row == col:
+            self.diag += delta
+            won = won or abs(self.diag) == 3
+        if row + col == 2:
+            self.anti += delta
+            won = won or abs(self.anti) == 3
+
+        self.current_player = "O" if player == "X" else "X"
+        if won:
+            return "win"
+        if self.moves == 9:
+            return "draw"
+        return None
+
+class GameServer:
+    """Hosts many concurrent two-player games over a line protocol.
+
+    Requests and replies are single lines of text. Each connection's requests
+    are answered in order. A game is shared by id, so the two players may use
+    different connections.
+
+        NEW                  -> OK <id>
+        MOVE <id> <row> <col> -> OK <id> <next player> | WIN <id> <player> | DRAW <id>
+        BOARD <id>           -> BOARD <id> <9 cells, '.' for empty>
+        anything invalid     -> ERR <message>
+
+    Finished games are removed after their last move.
+    """
+
+    def __init__(self):
+        self.games = {}
+        self.ids = itertools.count(1)
+        self.moves_played = 0
+
+    def handle(self, line):
+        """Apply one request line and return the reply line."""
+        parts = line.split()
+        if not parts:
+            return "ERR empty request"
+        command = parts[0].upper()
+        try:
+            if command == "NEW":
+                game_id = next(self.ids)
+                self.games[game_id] = Board()
+                return f"OK {game_id}"
+            game_id = int(parts[1])
+            board = self.games[game_id]
+            if command == "MOVE":
+                player = board.current_player
+                result = board.play(int(parts[2]), int(parts[3]))
+                self.moves_played += 1
+                if result is None:
+                    return f"OK {game_id} {board.current_player}"
+                del self.games[game_id]
+                if result == "win":
+                    return f"WIN {game_id} {player}"
+                return f"DRAW {game_id}"
+            if command == "BOARD":
+                cells = "".join(cell for row in board.cells for cell in row)
+                return f"BOARD {game_id} {cells.replace(' ', '.')}"
+            return f"ERR unknown command {command}"
+        except IndexError:
+            return f"ERR missing arguments for {command}"
+        except ValueError as error:
+            return f"ERR {error}"
+        except KeyError:
+            return f"ERR no game {parts[1]}"
+
+    async def serve_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write((self.handle(line.decode()) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+async def run_server(host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+    """Serve games on a TCP port, or on a Unix socket if a path is given."""
+    server = GameServer()
+    if path:
+        listener = await asyncio.start_unix_server(server.serve_client, path)
+        print(f"Serving Tic-Tac-Toe on {path}")
+    else:
+        listener = await asyncio.start_server(server.serve_client, host, port)
+        print(f"Serving Tic-Tac-Toe on {host}:{port}")
+    async with listener:
+        await listener.serve_forever()
+
+class GameClient:
+    """One connection to a GameServer shared by many games.
+
+    Replies come back in request order, so each request waits on a future
+    queued in the same order.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.pending = []
+        self.reply_task = asyncio.ensure_future(self.read_replies())
+
+    async def read_replies(self):
+        index = 0
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            self.pending[index].set_result(line.decode().split())
+            index += 1
+            # Drop answered futures in blocks to keep the list short.
+            if index == 1024:
+                del self.pending[:index]
+                index = 0
+
+    async def request(self, line):
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append(future)
+        self.writer.write((line + "\n").encode())
+        return await future
+
+    def close(self):
+        self.reply_task.cancel()
+        self.writer.close()
+
+async def play_random_game(client, rng, latencies):
+    """Play one game of random moves through the server, timing each move."""
+    game_id = (await client.request("NEW"))[1]
+    free = [(row, col) for row in range(3) for col in range(3)]
+    rng.shuffle(free)
+    for row, col in free:
+        start = time.perf_counter()
+        reply = await client.request(f"MOVE {game_id} {row} {col}")
+        latencies.append(time.perf_counter() - start)
+        if reply[0] != "OK":
+            return reply[0]
+    return "DRAW"
+
+async def run_load(games=10000, connections=100, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                   path=None, seed=0):
+    """Play many concurrent games against a running server and report throughput.
+
+    The games are spread over the given number of connections, to a Unix
+    socket if a path is given. Returns the printed statistics as a dict.
+    """
+    clients = []
+    for _ in range(connections):
+        if path:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        clients.append(GameClient(reader, writer))
+
+    rng = random.Random(seed)
+    latencies = []
+    start = time.perf_counter()
+    results = await asyncio.gather(*(play_random_game(clients[i % connections], rng, latencies)
+                                     for i in range(games)))
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        client.close()
+
+    latencies.sort()
+    stats = {
+        'games': games,
+        'moves': len(latencies),
+        'seconds': elapsed,
+        'moves_per_second': len(latencies) / elapsed,
+        'p99_latency': latencies[int(len(latencies) * 0.99)],
+        'wins': sum(result == "WIN" for result in results),
+        'draws': sum(result == "DRAW" for result in results),
+    }
+    print(f"{games} concurrent games over {connections} connections: "
+          f"{stats['moves']} moves in {elapsed:.2f}s")
+    print(f"  {stats['moves_per_second']:.0f} moves/s, "
+          f"p99 move latency {stats['p99_latency'] * 1000:.1f} ms")
+    print(f"  {stats['wins']} wins, {stats['draws']} draws")
+    return stats
+
+def _option(name, default):
+    """Return the value following a command-line flag, or the default."""
+    if name in sys.argv:
+        return sys.argv[sys.argv.index(name) + 1]
+    return default
+
 def main():
     print("Tic-Tac-Toe Game (2 Player)")
-    board = [[" " for _ in range(3)] for _ in range(3)]
-    current_player = "X"
+    board = Board()
 
     while True:
-        print_board(board)
+        current_player = board.current_player
+        print_board(board.cells)
         try:
             row = int(input(f"Player {current_player}, enter row (0-2): "))
             col = int(input(f"Player {current_player}, enter column (0-2): "))
@@ -34,28 +263,35 @@ def main():
             print(" Invalid input. Enter numbers between 0 and 2.")
             continue
 
-        if not (0 <= row <= 2 and 0 <= col <= 2):
-            print(" Invalid position. Try again.")
-            continue
-
-        if board[row][col] != " ":
-            print(" Cell already taken. Try another.")
+        try:
+            result = board.play(row, col)
+        except ValueError as error:
+            print(f" {error} Try again.")
             continue
 
-        board[row][col] = current_player
-
-        if check_winner(board, current_player):
-            print_board(board)
+        if result == "win":
+            print_board(board.cells)
             print(f"🎉 Player {current_player} wins!")
             break
 
-        if is_full(board):
-            print_board(board)
+        if result == "draw":
+            print_board(board.cells)
             print(" It's a draw!")
             break
 
-        # Switch player
-        current_player = "O" if current_player == "X" else "X"
-
 if __name__ == "__main__":
-    main()
+    # python TicTacToe.py --serve [--port N | --unix PATH]
+    # python TicTacToe.py --load [--games N] [--connections N] [--port N | --unix PATH]
+    host = _option("--host", DEFAULT_HOST)
+    port = int(_option("--port", DEFAULT_PORT))
+    path = _option("--unix", None)
+    if "--serve" in sys.argv:
+        try:
+            asyncio.run(run_server(host, port, path))
+        except KeyboardInterrupt:
+            pass
+    elif "--load" in sys.argv:
+        asyncio.run(run_load(int(_option("--games", 10000)),
+                             int(_option("--connections", 100)), host, port, path))
+    else:
+        main()
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+import AlphaBeta
+from AlphaBeta import (alpha_beta_pruning, batch_minimax, check_batch, load_leaves, save_leaves,
+                       tree_depth)
+
+
+def minimax(values, branching, is_maximizing):
+    if len(values) == 1:
+        return values[0]
+    size = len(values) // branching
+    children = [minimax(values[i * size:(i + 1) * size], branching, not is_maximizing)
+                for i in range(branching)]
+    return max(children) if is_maximizing else min(children)
+
+
+def test_tree_depth_rejects_ragged_trees():
+    assert tree_depth(81, 3) == 4
+    assert tree_depth(1, 5) == 0
+    with pytest.raises(ValueError):
+        tree_depth(10, 3)
+    with pytest.raises(ValueError):
+        tree_depth(0, 2)
+
+
+@pytest.mark.parametrize('branching, depth', [(2, 6), (3, 4), (5, 3)])
+def test_alpha_beta_matches_minimax(branching, depth):
+    rng = random.Random(branching * 10 + depth)
+    for _ in range(50):
+        values = [rng.randint(-20, 20) for _ in range(branching ** depth)]
+        for is_maximizing in (True, False):
+            value, evaluated = alpha_beta_pruning(values, branching, is_maximizing)
+            assert value == minimax(values, branching, is_maximizing)
+            assert 1 <= evaluated <= len(values)
+
+
+def test_alpha_beta_prunes_sorted_leaves():
+    value, evaluated = alpha_beta_pruning([float(i) for i in range(2 ** 16)], 2)
+    assert value == minimax(list(range(2 ** 16)), 2, True)
+    assert evaluated < 2 ** 16
+
+
+def test_leaves_round_trip(tmp_path):
+    values = [3.5, -1.0, 7.0, 2.0, 0.0, 9.0, -4.0, 1.0, 6.0]
+    path = str(tmp_path / 'leaves.bin')
+    save_leaves(values, path)
+    mapped = load_leaves(path)
+    assert list(mapped) == values
+    assert alpha_beta_pruning(mapped, 3)[0] == minimax(values, 3, True)
+
+    text = tmp_path / 'leaves.txt'
+    text.write_text(' '.join(map(str, values)))
+    assert list(load_leaves(str(text))) == values
+
+    (tmp_path / 'bad.bin').write_bytes(b'123')
+    with pytest.raises(ValueError):
+        load_leaves(str(tmp_path / 'bad.bin'))
+
+
+@pytest.mark.parametrize('branching, depth', [(2, 5), (3, 3), (4, 1)])
+def test_batch_minimax_matches_alpha_beta(branching, depth):
+    np = pytest.importorskip('numpy')
+    rng = np.random.default_rng(branching)
+    leaves = rng.integers(-50, 50, size=(40, branching ** depth))
+    for is_maximizing in (True, False):
+        batch = batch_minimax(leaves, branching, is_maximizing)
+        assert list(batch) == [alpha_beta_pruning(row, branching, is_maximizing)[0] for row in leaves]
+        assert check_batch(leaves, branching, is_maximizing)
+
+
+def test_batch_minimax_without_numpy(monkeypatch):
+    monkeypatch.setattr(AlphaBeta, 'np', None)
+    rows = [[1, 5, 2, 8], [7, 3, 4, 6]]
+    assert batch_minimax(rows, 2) == [2, 4]
+
+
+def test_batch_minimax_rejects_flat_input():
+    np = pytest.importorskip('numpy')
+    with pytest.raises(ValueError):
+        batch_minimax(np.arange(8), 2)
@@ -0,0 +1,188 @@
+import random
+
+import pytest
+
+import BestFirstAstar
+from BestFirstAstar import (CSRGraph, IndexedHeap, _path_copy_a_star_search, a_star_search,
+                            best_first_search,
+                            bidirectional_search, grid_graph, load_csr, load_edge_list,
+                            load_graph, manhattan_heuristics, save_csr, search_file)
+
+# The example from the end of BestFirstAstar.py
+EXAMPLE = {'A': [('B', 1), ('C', 4)], 'B': [('A', 1), ('D', 5), ('G', 12)],
+           'C': [('A', 4), ('D', 1)], 'D': [('B', 5), ('C', 1), ('G', 3)],
+           'G': [('B', 12), ('D', 3)], 'E': []}
+EXAMPLE_HEURISTICS = {'A': 10, 'B': 6, 'C': 4, 'D': 2, 'G': 0, 'E': 0}
+
+
+def path_cost(graph, path):
+    return sum(min(cost for neighbor, cost in graph[node] if neighbor == after)
+               for node, after in zip(path, path[1:]))
+
+
+def test_searches_on_example_graph():
+    assert best_first_search(EXAMPLE, EXAMPLE_HEURISTICS, 'A', 'G') == ['A', 'C', 'D', 'G']
+    assert a_star_search(EXAMPLE, EXAMPLE_HEURISTICS, 'A', 'G') == ['A', 'C', 'D', 'G']
+    assert a_star_search(EXAMPLE, EXAMPLE_HEURISTICS, 'A', 'A') == ['A']
+    assert best_first_search(EXAMPLE, EXAMPLE_HEURISTICS, 'A', 'E') is None
+    assert a_star_search(EXAMPLE, EXAMPLE_HEURISTICS, 'A', 'E') is None
+
+
+def test_parent_pointer_a_star_matches_path_copying_version():
+    graph, coords = grid_graph(25, 20, seed=3)
+    rng = random.Random(3)
+    for _ in range(20):
+        start, goal = rng.randrange(len(graph)), rng.randrange(len(graph))
+        heuristics = manhattan_heuristics(coords, goal)
+        path = a_star_search(graph, heuristics, start, goal)
+        assert path[0] == start and path[-1] == goal
+        expected = _path_copy_a_star_search(graph, heuristics, start, goal)
+        assert path_cost(graph, path) == pytest.approx(path_cost(graph, expected))
+        assert best_first_search(graph, heuristics, start, goal)[-1] == goal
+
+
+@pytest.mark.parametrize('heap', ['lazy', 'indexed'])
+def test_a_star_reopens_nodes_for_inconsistent_heuristics(heap):
+    # Admissible but inconsistent: h(A) = 6 closes B through the costly S -> B arc first
+    graph = {'S': [('A', 1), ('B', 3)], 'A': [('S', 1), ('B', 1)],
+             'B': [('S', 3), ('A', 1), ('G', 5)], 'G': [('B', 5)]}
+    heuristics = {'S': 0, 'A': 6, 'B': 0, 'G': 0}
+    stats = {}
+    assert a_star_search(graph, heuristics, 'S', 'G', stats, heap=heap) == ['S', 'A', 'B', 'G']
+    assert stats['reexpansions'] == 1
+
+
+def test_a_star_heaps_agree_on_grid():
+    graph, coords = grid_graph(30, 30, seed=5)
+    heuristics = manhattan_heuristics(coords, 899)
+    lazy, indexed = {}, {}
+    path = a_star_search(graph, heuristics, 0, 899, lazy)
+    assert path_cost(graph, a_star_search(graph, heuristics, 0, 899, indexed, heap='indexed')) == \
+        pytest.approx(path_cost(graph, path))
+    assert lazy['stale_pops'] > 0 and indexed['stale_pops'] == 0 and indexed['decrease_keys'] > 0
+    with pytest.raises(ValueError):
+        a_star_search(graph, heuristics, 0, 899, heap='fibonacci')
+
+
+def test_indexed_heap_decrease_key():
+    rng = random.Random(1)
+    heap = IndexedHeap()
+    best = {}
+    for _ in range(500):
+        item, key = rng.randrange(100), rng.random()
+        heap.push(item, key)
+        best[item] = min(key, best.get(item, key))
+    assert len(heap) == len(best)
+    popped = [heap.pop() for _ in range(len(heap))]
+    assert popped == sorted(best.items(), key=lambda pair: pair[1])
+
+
+def test_csr_graph_matches_adjacency_dict(tmp_path):
+    graph, coords = grid_graph(12, 9, seed=2)
+    csr = CSRGraph.from_dict(graph)
+    path = str(tmp_path / 'grid.csr')
+    save_csr(csr, path)
+    mapped = load_csr(path)
+    assert len(mapped) == len(graph) and mapped.arc_count == sum(map(len, graph.values()))
+    for node, edges in graph.items():
+        node_id = mapped.node_id(str(node))
+        assert mapped.name(node_id) == str(node)
+        assert sorted((int(mapped.name(neighbor)), cost) for neighbor, cost in mapped[node_id]) == \
+            sorted(edges)
+
+    heuristics = manhattan_heuristics(coords, 100)
+    mapped_heuristics = [heuristics[int(name)] for name in mapped.names]
+    path_ids = a_star_search(mapped, mapped_heuristics, mapped.node_id('0'), mapped.node_id('100'))
+    assert path_cost(mapped, path_ids) == pytest.approx(
+        path_cost(graph, a_star_search(graph, heuristics, 0, 100)))
+
+
+def test_load_csr_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.csr'
+    path.write_bytes(b'NOPE' + bytes(60))
+    with pytest.raises(ValueError):
+        load_csr(str(path))
+
+
+def test_edge_list_loader(tmp_path):
+    path = tmp_path / 'edges.txt'
+    path.write_text("# comment\nx y 2.5\n\ny z\n")
+    graph = load_edge_list(str(path))
+    assert graph.names == ['x', 'y', 'z'] and graph.arc_count == 4
+    assert list(graph[graph.node_id('y')]) == [(0, 2.5), (2, 1.0)]
+    directed = load_edge_list(str(path), directed=True)
+    assert directed.arc_count == 2 and list(directed[directed.node_id('z')]) == []
+
+
+@pytest.fixture
+def directed_file(tmp_path):
+    # One-way arcs: the cheap route 1 -> 2 -> 4 cannot be walked backwards
+    path = tmp_path / 'oneway.gr'
+    path.write_text("p sp 4 5\na 1 2 1\na 2 4 1\na 1 3 5\na 3 4 5\na 4 1 1\n")
+    return str(path)
+
+
+def test_bidirectional_search_on_directed_graph_uses_reverse(directed_file):
+    graph = load_graph(directed_file)
+    assert not graph.symmetric
+    zero = [0] * len(graph)
+    path = bidirectional_search(graph, None, 0, 3, reverse_graph=graph.reverse())
+    assert path == a_star_search(graph, zero, 0, 3) == [0, 1, 3]
+
+
+def test_csr_file_keeps_symmetric_flag(tmp_path, directed_file):
+    edges = tmp_path / 'edges.txt'
+    edges.write_text("a b 2\nb c 3\n")
+    for source, symmetric in ((str(edges), True), (directed_file, False)):
+        target = str(tmp_path / 'graph.csr')
+        save_csr(load_graph(source), target)
+        mapped = load_csr(target)
+        assert mapped.symmetric is symmetric
+        path = bidirectional_search(mapped, None, 0, 2, reverse_graph=mapped.reverse())
+        assert path_cost(mapped, path) == 5
+
+
+def test_search_file_reverses_only_directed_graphs(tmp_path, directed_file, monkeypatch, capsys):
+    reversed_graphs = []
+    reverse = CSRGraph.reverse
+
+    def counting_reverse(graph):
+        reversed_graphs.append(graph)
+        return reverse(graph)
+
+    monkeypatch.setattr(BestFirstAstar.CSRGraph, 'reverse', counting_reverse)
+    edges = tmp_path / 'edges.txt'
+    edges.write_text("a b 2\nb c 3\na c 9\n")
+    search_file(str(edges), 'a', 'c')
+    assert reversed_graphs == []
+    assert "a -> b -> c" in capsys.readouterr().out
+
+    search_file(directed_file, '1', '4')
+    assert len(reversed_graphs) == 1
+    assert capsys.readouterr().out.count("1 -> 2 -> 4") == 3
+
+
+def test_dimacs_loader(directed_file):
+    graph = load_graph(directed_file)
+    assert len(graph) == 4 and graph.arc_count == 5
+    assert graph.name(3) == '4' and graph.node_id('4') == 3
+    assert list(graph[0]) == [(1, 1.0), (2, 5.0)]
+
+
+def test_bidirectional_search_matches_a_star_on_grid():
+    graph, coords = grid_graph(30, 20, seed=7)
+    rng = random.Random(7)
+    settled = {'dijkstra': 0, 'a_star': 0}
+    for _ in range(20):
+        start, goal = rng.randrange(len(graph)), rng.randrange(len(graph))
+        to_goal, to_start = manhattan_heuristics(coords, goal), manhattan_heuristics(coords, start)
+        expected = path_cost(graph, a_star_search(graph, to_goal, start, goal))
+        dijkstra, a_star = {}, {}
+        for path in (bidirectional_search(graph, None, start, goal, dijkstra),
+                     bidirectional_search(graph, to_goal, start, goal, a_star, to_start),
+                     bidirectional_search(graph, to_goal, start, goal)):
+            assert path[0] == start and path[-1] == goal
+            assert path_cost(graph, path) == pytest.approx(expected)
+        settled['dijkstra'] += dijkstra['settled']
+        settled['a_star'] += a_star['settled']
+    assert settled['a_star'] < settled['dijkstra']
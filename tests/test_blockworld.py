@@ -0,0 +1,248 @@
+from collections import deque
+import json
+import random
+import time
+
+import pytest
+
+from BlockWorld import BlockState, BlockWorld, run_batch, solve_problem
+
+
+def random_stacks(n_blocks, n_stacks, rng):
+    stacks = [[] for _ in range(n_stacks)]
+    for i in range(n_blocks):
+        stacks[rng.randrange(n_stacks)].append(f"B{i}")
+    return stacks
+
+
+def world_from(stacks):
+    world = BlockWorld()
+    for i, stack in enumerate(stacks):
+        world.add_stack()
+        for block in stack:
+            world.add_block(block, i)
+    return world
+
+
+def goal_from(stacks):
+    return {block: (i, height) for i, stack in enumerate(stacks) for height, block in enumerate(stack)}
+
+
+def shortest_plan_length(start, goal):
+    start = tuple(map(tuple, start))
+    goal = tuple(map(tuple, goal))
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        if state == goal:
+            return dist[state]
+        for source, stack in enumerate(state):
+            if not stack:
+                continue
+            for target in range(len(state)):
+                if target != source:
+                    child = list(state)
+                    child[source] = stack[:-1]
+                    child[target] = state[target] + stack[-1:]
+                    child = tuple(child)
+                    if child not in dist:
+                        dist[child] = dist[state] + 1
+                        queue.append(child)
+    return None
+
+
+def scramble(stacks, n_moves, rng):
+    stacks = [list(stack) for stack in stacks]
+    for _ in range(n_moves):
+        source = rng.choice([i for i, stack in enumerate(stacks) if stack])
+        target = rng.choice([i for i in range(len(stacks)) if i != source])
+        stacks[target].append(stacks[source].pop())
+    return stacks
+
+
+def check_plan(start, goal, plan):
+    world = world_from(start)
+    for block, source, target in plan:
+        assert world.block_positions[block][0] == source
+        assert world.move_block(block, target)
+    assert world.is_goal_state(goal_from(goal))
+
+
+def test_block_state_rejects_moving_onto_own_stack():
+    state = BlockState([['A', 'B'], ['C'], []])
+    before = state.key(), state.hash
+    with pytest.raises(ValueError):
+        state.move(state.index['B'], 0)
+    assert (state.key(), state.hash) == before
+    assert state.stacks() == [['A', 'B'], ['C'], []]
+
+
+def test_block_state_hash_and_undo_stay_consistent():
+    rng = random.Random(3)
+    stacks = random_stacks(12, 4, rng)
+    state = BlockState(stacks)
+    names = state.names
+    start = state.key(), state.hash
+    actions = []
+    for _ in range(200):
+        block, source, target = rng.choice(list(state.moves()))
+        actions.append(state.move(block, target))
+        assert state.hash == BlockState(state.stacks(), names).hash
+    for action in reversed(actions):
+        state.undo(action)
+    assert (state.key(), state.hash) == start
+    assert state.stacks() == stacks
+
+
+def test_block_state_restore_rebuilds_stacks():
+    rng = random.Random(5)
+    state = BlockState(random_stacks(10, 3, rng))
+    snapshots = []
+    for _ in range(50):
+        block, _, target = rng.choice(list(state.moves()))
+        state.move(block, target)
+        snapshots.append((state.key(), state.hash, state.stacks()))
+    for key, hash_value, stacks in snapshots:
+        state.restore(key, hash_value)
+        assert state.stacks() == stacks
+        assert state.hash == BlockState(stacks, state.names).hash
+
+
+def test_block_state_spare_stacks_are_interchangeable():
+    first = BlockState([['A', 'B'], ['C'], []], spare=[1, 2])
+    second = BlockState([['A', 'B'], [], ['C']], names=first.names, spare=[1, 2])
+    assert first.hash == second.hash
+    assert BlockState([['A'], ['B', 'C'], []], names=first.names, spare=[1, 2]).hash != first.hash
+
+
+def test_plan_optimal_matches_breadth_first_search():
+    rng = random.Random(1)
+    for _ in range(300):
+        n_stacks = rng.randint(2, 4)
+        start = random_stacks(rng.randint(1, 5), n_stacks, rng)
+        goal = random_stacks(sum(map(len, start)), n_stacks, rng)
+        plan = world_from(start).plan_optimal(goal_from(goal))
+        length = shortest_plan_length(start, goal)
+        if length is None:
+            assert plan is None
+        else:
+            assert len(plan) == length
+            check_plan(start, goal, plan)
+
+
+def test_plan_optimal_solves_15_to_20_blocks_in_seconds():
+    rng = random.Random(2)
+    started = time.perf_counter()
+    for _ in range(20):
+        goal = random_stacks(rng.randint(15, 20), rng.randint(3, 8), rng)
+        start = scramble(goal, 40, rng)  # Plans of 8-17 moves
+        plan = world_from(start).plan_optimal(goal_from(goal))
+        check_plan(start, goal, plan)
+    assert time.perf_counter() - started < 10
+
+
+def test_plan_optimal_gives_up_after_max_nodes():
+    rng = random.Random(4)
+    start, goal = random_stacks(20, 5, rng), random_stacks(20, 5, rng)
+    world = world_from(start)
+    assert world.plan_optimal(goal_from(goal), max_nodes=50) is None
+    assert world.nodes_expanded == 51
+
+
+@pytest.mark.parametrize('n_blocks, n_stacks', [(200, 3), (2000, 10)])
+def test_solve_large_reaches_goal(n_blocks, n_stacks):
+    rng = random.Random(n_blocks)
+    start, goal = random_stacks(n_blocks, n_stacks, rng), random_stacks(n_blocks, n_stacks, rng)
+    world = world_from(start)
+    assert world.solve_large(goal_from(goal))
+    assert world.stacks == goal
+    check_plan(start, goal, world.actions)
+
+
+def test_solve_large_hands_small_worlds_to_plan_optimal():
+    start, goal = [['A', 'B', 'C'], []], [[], ['C', 'B', 'A']]
+    world = world_from(start)
+    assert world.solve_large(goal_from(goal))
+    assert world.stacks == goal and len(world.actions) == 3
+
+    # With two stacks, B can never end up under A in the first one
+    world = world_from([['A', 'B'], []])
+    assert not world.solve_large(goal_from([['B', 'A'], []]))
+
+
+def test_solve_problem_modes():
+    problem = {'id': 'p1', 'stacks': [['A', 'B', 'C'], ['D'], []], 'goal': [['C', 'B'], ['A', 'D'], []]}
+    results = {mode: solve_problem(problem, mode) for mode in ('optimal', 'large')}
+    for result in results.values():
+        assert result['id'] == 'p1' and result['status'] == 'solved'
+        check_plan(problem['stacks'], problem['goal'], [tuple(move) for move in result['plan']])
+    assert results['optimal']['plan_length'] == shortest_plan_length(problem['stacks'], problem['goal'])
+    assert results['large']['plan_length'] >= results['optimal']['plan_length']
+
+    problem['mode'] = 'optimal'
+    problem['max_nodes'] = 1
+    assert solve_problem(problem, 'large')['status'] == 'failed'
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_run_batch(tmp_path, workers):
+    rng = random.Random(13)
+    problems = []
+    for i in range(25):
+        n_stacks = rng.randint(3, 6)
+        stacks = random_stacks(rng.randint(5, 40), n_stacks, rng)
+        problems.append({'id': i, 'stacks': stacks, 'goal': random_stacks(sum(map(len, stacks)), n_stacks, rng)})
+    lines = [json.dumps(problem) for problem in problems]
+    lines[3] = 'not json'
+    lines[7] = json.dumps({'stacks': [['A']]})
+    input_path, output_path = tmp_path / 'problems.jsonl', tmp_path / 'results.jsonl'
+    input_path.write_text('\n'.join(lines[:10]) + '\n\n' + '\n'.join(lines[10:]) + '\n')
+
+    summary = run_batch(str(input_path), str(output_path), workers, chunk_size=4)
+    results = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert summary['problems'] == len(results) == 25 and summary['solved'] == 23
+    assert [result['status'] for result in results].count('error') == 2
+    assert results[3]['id'] == 4 and results[7]['id'] == 8  # Line numbers for bad lines
+    for problem, result in zip(problems, results):
+        if result['status'] == 'solved':
+            assert result['id'] == problem['id']
+            check_plan(problem['stacks'], problem['goal'], [tuple(move) for move in result['plan']])
+    assert summary['moves'] == sum(result.get('plan_length') or 0 for result in results)
+
+
+def test_solve_problem_rejects_malformed_problems():
+    assert solve_problem([1, 2])['status'] == 'error'
+    assert solve_problem({'id': 'm', 'stacks': [['A']], 'goal': [['A']], 'mode': 'nonsense'}) == {
+        'id': 'm', 'status': 'error', 'error': 'Unknown mode: nonsense'}
+    for mode in ('greedy', 'optimal', 'large'):
+        repeated = {'stacks': [['A', 'A'], [], []], 'goal': [[], ['A'], []], 'mode': mode}
+        assert solve_problem(repeated)['status'] == 'error'
+        moved = {'stacks': [['A', 'B'], [], []], 'goal': [['B'], ['A'], ['A']], 'mode': mode}
+        assert solve_problem(moved)['status'] == 'error'
+    world = world_from([['A', 'A'], [], []])
+    assert world.plan_optimal({'A': (1, 0)}) is None and not world.solve_large({'A': (1, 0)})
+
+
+def test_solve_problem_greedy_does_not_print(capsys):
+    rng = random.Random(6)
+    statuses = set()
+    for _ in range(30):
+        stacks = random_stacks(8, 3, rng)
+        result = solve_problem({'stacks': stacks, 'goal': random_stacks(8, 3, rng), 'mode': 'greedy'})
+        statuses.add(result['status'])
+        if result['status'] == 'error':
+            assert result['error']
+    assert 'error' in statuses
+    assert capsys.readouterr().out == ''
+
+
+def test_run_batch_survives_non_object_lines(tmp_path):
+    input_path, output_path = tmp_path / 'problems.jsonl', tmp_path / 'results.jsonl'
+    input_path.write_text('[1, 2]\n"x"\n' + json.dumps({'stacks': [['A'], [], []], 'goal': [[], [], ['A']]}) + '\n')
+    summary = run_batch(str(input_path), str(output_path), workers=1)
+    results = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert [result['status'] for result in results] == ['error', 'error', 'solved']
+    assert [result['id'] for result in results[:2]] == [1, 2] and summary['solved'] == 1
+    with pytest.raises(ValueError):
+        run_batch(str(input_path), str(output_path), workers=1, mode='nonsense')
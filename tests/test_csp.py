@@ -0,0 +1,331 @@
+import itertools
+import operator
+import os
+import random
+import time
+
+import pytest
+
+from CSP import (CSP, AllDifferent, FunctionConstraint, MapColoringCSP, NotEqual, SearchAborted, TableConstraint,
+                 benchmark_case, luby, not_equal, ordering_chain, planar_graph, queen_graph, random_graph,
+                 write_dimacs)
+
+
+def solve_map(regions, edges, colors, **options):
+    map_csp = MapColoringCSP(**options)
+    map_csp.build_from_edges(regions, edges, colors)
+    map_csp.csp.backtrack_limit = 20000
+    solution = map_csp.csp.backtracking_search()
+    return map_csp, solution
+
+
+@pytest.mark.parametrize('propagation', [None, 'forward_checking', 'ac3'])
+def test_mrv_queue_matches_rescan_on_planar_map(propagation):
+    regions, edges = planar_graph(30, 30, 0)
+    rescan, rescan_solution = solve_map(regions, edges, 4, propagation=propagation, incremental_mrv=False)
+    queue, queue_solution = solve_map(regions, edges, 4, propagation=propagation, incremental_mrv=True)
+    assert queue_solution == rescan_solution
+    assert queue.csp.backtrack_count == rescan.csp.backtrack_count == 0
+    assert not queue.find_conflicts(queue_solution)
+
+
+@pytest.mark.parametrize('propagation', [None, 'forward_checking', 'ac3'])
+def test_mrv_queue_matches_rescan_when_backtracking(propagation):
+    regions, edges = random_graph(40, 4.4, 1)
+    rescan, rescan_solution = solve_map(regions, edges, 3, propagation=propagation, incremental_mrv=False)
+    queue, queue_solution = solve_map(regions, edges, 3, propagation=propagation, incremental_mrv=True)
+    assert queue_solution == rescan_solution
+    assert queue.csp.backtrack_count == rescan.csp.backtrack_count > 0
+
+
+def test_propagation_cuts_backtracks_on_ordering_chain():
+    backtracks = {}
+    for propagation in (None, 'forward_checking', 'ac3'):
+        csp = CSP(*ordering_chain(10), propagation=propagation, incremental_mrv=True)
+        assert csp.backtracking_search() is None
+        backtracks[propagation] = csp.backtrack_count
+    assert backtracks[None] == 2 ** 9 - 1
+    assert backtracks['forward_checking'] <= backtracks[None]
+    assert backtracks['ac3'] == 0
+
+
+def small_mixed_problem(seed):
+    rng = random.Random(seed)
+    variables = [f"v{i}" for i in range(rng.randint(5, 25))]
+    constraints = [NotEqual(*rng.sample(variables, 2)) for _ in range(rng.randint(0, 2 * len(variables)))]
+    constraints += [FunctionConstraint(*rng.sample(variables, 2), rng.choice([operator.lt, operator.ne]))
+                    for _ in range(rng.randint(1, len(variables)))]
+    domains = {var: list(range(rng.randint(2, 6))) for var in variables}
+    return variables, domains, constraints
+
+
+def test_local_search_returns_only_consistent_assignments():
+    solved = 0
+    for seed in range(150):
+        csp = CSP(*small_mixed_problem(seed))
+        solution = csp.local_search(max_steps=3000, noise=0.3, seed=seed)
+        if solution is not None:
+            solved += 1
+            assert all(csp.is_consistent(var, value) for var, value in solution.items())
+    assert solved > 0
+
+
+def test_iter_solutions_after_backtracking_search():
+    map_csp = MapColoringCSP()
+    map_csp.provide_example()
+    csp = map_csp.csp
+    assert csp.backtracking_search() is not None
+    solutions = list(csp.iter_solutions())
+    # Australia with 3 colours: 6 colourings of the mainland times 3 for Tasmania
+    assert len(solutions) == 18
+    assert all(not map_csp.find_conflicts(solution) for solution in solutions)
+    assert csp.count_solutions() == 18
+    assert csp.backtracking_search() is not None
+
+
+@pytest.mark.parametrize('propagation', ['forward_checking', 'ac3'])
+def test_compact_domains_search_like_value_lists(propagation):
+    # Without backtracking both modes try values in domain order
+    regions, edges = planar_graph(20, 20, 1)
+    lists, list_solution = solve_map(regions, edges, 4, propagation=propagation, compact=False)
+    bits, bit_solution = solve_map(regions, edges, 4, propagation=propagation, compact=True)
+    assert bit_solution == list_solution
+    assert bits.csp.backtrack_count == lists.csp.backtrack_count == 0
+    assert bits.csp.prune_count == lists.csp.prune_count
+
+    regions, edges = random_graph(60, 4.4, 2)
+    bits, bit_solution = solve_map(regions, edges, 3, propagation=propagation, compact=True)
+    assert bit_solution is not None and not bits.find_conflicts(bit_solution)
+
+
+def test_compact_domains_with_mixed_constraints():
+    for seed in range(40):
+        variables, domains, constraints = small_mixed_problem(seed)
+        expected = CSP(variables, domains, constraints, propagation='forward_checking').backtracking_search()
+        csp = CSP(variables, domains, constraints, compact=True)
+        assert csp.propagation == 'forward_checking'
+        solution = csp.backtracking_search()
+        assert (solution is None) == (expected is None)
+        if solution is not None:
+            assert all(csp.is_consistent(var, value) for var, value in solution.items())
+
+
+def satisfies(constraint, solution):
+    if isinstance(constraint, AllDifferent):
+        values = [solution[var] for var in constraint.scope]
+        return len(set(values)) == len(values)
+    x, y = (solution[var] for var in constraint.scope)
+    if isinstance(constraint, NotEqual):
+        return x != y
+    if isinstance(constraint, TableConstraint):
+        return (x, y) in constraint.allowed
+    return constraint.check(x, y)
+
+
+def random_typed_problem(rng):
+    variables = ['a', 'b', 'c', 'd', 'e']
+    domains = {var: list(range(rng.randint(2, 4))) for var in variables}
+    constraints = [AllDifferent(rng.sample(variables, 3))]
+    x, y = rng.sample(variables, 2)
+    constraints.append(TableConstraint(x, y, [(i, j) for i in range(4) for j in range(4) if rng.random() < 0.5]))
+    constraints.append(FunctionConstraint(*rng.sample(variables, 2), operator.le))
+    constraints.append(NotEqual(*rng.sample(variables, 2)))
+    return variables, domains, constraints
+
+
+@pytest.mark.parametrize('options', [{}, {'propagation': 'forward_checking'}, {'propagation': 'ac3'},
+                                     {'compact': True}, {'incremental_mrv': True}])
+def test_typed_constraints_agree_with_brute_force(options):
+    rng = random.Random(4)
+    for _ in range(60):
+        variables, domains, constraints = random_typed_problem(rng)
+        satisfiable = any(all(satisfies(c, dict(zip(variables, values))) for c in constraints)
+                          for values in itertools.product(*(domains[var] for var in variables)))
+        solution = CSP(variables, domains, constraints, **options).backtracking_search()
+        assert (solution is not None) == satisfiable
+        if solution is not None:
+            assert all(satisfies(c, solution) for c in constraints)
+
+
+def test_constraints_compile_into_arcs():
+    csp = CSP(['a', 'b', 'c'], {var: [0, 1, 2] for var in 'abc'},
+              [AllDifferent(['a', 'b']), FunctionConstraint('b', 'c', operator.lt), NotEqual('a', 'z')])
+    assert csp.ne_neighbors == {'a': ['b'], 'b': ['a'], 'c': []}
+    assert [neighbor for neighbor, _ in csp.arcs['b']] == ['c']
+    assert csp.arcs['c'][0][1](2, 1)  # Reverse arc: c = 2 > b = 1
+    assert sorted(csp.adjacent['b']) == ['a', 'c']
+
+
+def test_dict_constraints_still_supported():
+    constraints = {'a': [{'neighbor': 'b', 'check': not_equal}],
+                   'b': [{'neighbor': 'a', 'check': not_equal}, {'neighbor': 'c', 'check': operator.gt}],
+                   'c': [{'neighbor': 'b', 'check': operator.lt}]}
+    csp = CSP(['a', 'b', 'c'], {var: [0, 1] for var in 'abc'}, constraints)
+    assert csp.backtracking_search() == {'a': 0, 'b': 1, 'c': 0}
+
+
+def test_luby_sequence():
+    assert [luby(i) for i in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+
+def test_restart_search():
+    regions, edges = random_graph(60, 4.4, 2)
+    map_csp = MapColoringCSP()
+    map_csp.build_from_edges(regions, edges, 3)
+    map_csp.csp.random = random.Random(0)
+    solution = map_csp.csp.restart_search(base_limit=5)
+    assert solution is not None and not map_csp.find_conflicts(solution)
+    assert map_csp.csp.restart_count > 0
+    assert map_csp.csp.backtrack_limit is None
+
+    csp = CSP(*ordering_chain(7), seed=0)
+    assert csp.restart_search(base_limit=1) is None  # Unsatisfiable: the limits keep growing
+    csp = CSP(*ordering_chain(12), seed=0)
+    assert csp.restart_search(base_limit=1, max_restarts=3) is None
+    assert csp.restart_count == 4
+
+
+def test_portfolio_search():
+    regions, edges = random_graph(60, 4.4, 2)
+    map_csp = MapColoringCSP()
+    map_csp.build_from_edges(regions, edges, 3)
+    configs = [{'propagation': 'forward_checking', 'incremental_mrv': True},
+               {'propagation': 'ac3', 'compact': True, 'seed': 1, 'restarts': True}]
+    solution = map_csp.csp.portfolio_search(configs, timeout=60)
+    assert solution is not None and not map_csp.find_conflicts(solution)
+    stats = map_csp.csp.portfolio_stats
+    assert [report['worker'] for report in stats] == [0, 1]
+    assert sum(report['winner'] for report in stats) == 1
+    assert all(report['status'] in ('solved', 'cancelled') for report in stats)
+
+
+
+def exit_check(x, y):
+    os._exit(3)
+
+
+def hang_check(x, y):
+    time.sleep(60)
+    return True
+
+
+def test_portfolio_search_survives_failed_workers():
+    regions, edges = random_graph(60, 4.4, 2)
+    map_csp = MapColoringCSP()
+    map_csp.build_from_edges(regions, edges, 3)
+    configs = [{'propagation': 'forward_checking'}, {'propagation': 'bogus'}]
+    solution = map_csp.csp.portfolio_search(configs, timeout=30)
+    assert solution is not None and not map_csp.find_conflicts(solution)
+    failed = map_csp.csp.portfolio_stats[1]
+    assert failed['status'] == 'error' and 'bogus' in failed['error'] and not failed['winner']
+
+    # A worker that dies without reporting
+    csp = CSP(['a', 'b'], {'a': [1, 2], 'b': [1, 2]}, [FunctionConstraint('a', 'b', exit_check)])
+    assert csp.portfolio_search([{}]) is None
+    assert csp.portfolio_stats[0]['status'] == 'error'
+
+
+def test_portfolio_search_terminates_stragglers_after_timeout():
+    csp = CSP(['a', 'b'], {'a': [1, 2], 'b': [1, 2]}, [FunctionConstraint('a', 'b', hang_check)])
+    started = time.perf_counter()
+    assert csp.portfolio_search([{}, {'propagation': 'ac3'}], timeout=0.5) is None
+    assert time.perf_counter() - started < 10
+    assert [report['status'] for report in csp.portfolio_stats] == ['terminated', 'terminated']
+
+def disjoint_maps(colors, extra_edges=()):
+    edges = list(extra_edges)
+    regions = list(dict.fromkeys(region for edge in edges for region in edge))
+    for prefix, seed in (('p', 3), ('r', 4)):
+        part_regions, part_edges = random_graph(40, 4.0, seed)
+        regions += [prefix + region for region in part_regions]
+        edges += [(prefix + u, prefix + v) for u, v in part_edges]
+    map_csp = MapColoringCSP()
+    map_csp.build_from_edges(regions + ['island'], edges, colors)
+    return map_csp
+
+
+@pytest.mark.parametrize('workers', [None, 2])
+def test_solve_by_components(workers):
+    map_csp = disjoint_maps(4)
+    csp = map_csp.csp
+    components = csp.components()
+    assert ['island'] in components
+    assert sorted(var for members in components for var in members) == sorted(map_csp.regions)
+    component_of = {var: i for i, members in enumerate(components) for var in members}
+    assert all(component_of[var] == component_of[neighbor]
+               for var in map_csp.regions for neighbor in csp.adjacent[var])
+    solution = csp.solve_by_components(workers=workers)
+    assert csp.component_count == len(components)
+    assert set(solution) == set(map_csp.regions) and not map_csp.find_conflicts(solution)
+
+    # A 4-clique cannot be 3-coloured, so the whole problem fails
+    clique = [('k0', 'k1'), ('k0', 'k2'), ('k0', 'k3'), ('k1', 'k2'), ('k1', 'k3'), ('k2', 'k3')]
+    map_csp = disjoint_maps(3, clique)
+    assert map_csp.csp.solve_by_components(workers=workers) is None
+    assert map_csp.csp.assignment == {}
+
+
+def test_solve_by_components_respects_backtrack_limit():
+    csp = CSP(*ordering_chain(12))
+    csp.backtrack_limit = 10
+    with pytest.raises(SearchAborted):
+        csp.solve_by_components()
+
+
+def test_solve_by_components_with_local_search():
+    map_csp = disjoint_maps(4)
+    solution = map_csp.csp.solve_by_components(method='local_search', seed=0)
+    assert solution is not None and not map_csp.find_conflicts(solution)
+
+
+def test_dimacs_round_trip(tmp_path):
+    regions, edges = random_graph(50, 4.0, 5)
+    path = str(tmp_path / 'map.col')
+    write_dimacs(path, regions, edges)
+    map_csp = MapColoringCSP()
+    map_csp.load_dimacs(path, 4)
+    number = {region: str(i) for i, region in enumerate(regions, 1)}
+    assert map_csp.regions == [number[region] for region in regions]
+    assert map_csp.colors == ['c1', 'c2', 'c3', 'c4']
+    assert {frozenset(c.scope) for c in map_csp.csp.constraints} == \
+        {frozenset((number[u], number[v])) for u, v in edges}
+
+
+def test_edge_list_loader(tmp_path):
+    path = tmp_path / 'map.txt'
+    path.write_text("# comment\nWA,NT\nNT SA\nSA WA\nSA SA\nNT,WA\n\nSA Q\n")
+    map_csp = MapColoringCSP()
+    map_csp.load_edge_list(str(path), ['red', 'green', 'blue'])
+    assert map_csp.regions == ['WA', 'NT', 'SA', 'Q']
+    assert map_csp.neighbors['SA'] == ['NT', 'WA', 'Q']
+    assert len(map_csp.csp.constraints) == 4
+    solution = map_csp.csp.backtracking_search()
+    assert not map_csp.find_conflicts(solution)
+
+
+def test_queen_graph():
+    regions, edges = queen_graph(5)
+    assert len(regions) == 25 and len(edges) == 160
+
+
+@pytest.mark.parametrize('mode', ['backtracking', 'compact', 'ac3', 'components', 'local_search'])
+def test_benchmark_case(mode):
+    status, seconds, _ = benchmark_case(*queen_graph(5), 5, mode, time_limit=10)
+    assert status == 'solved' and seconds >= 0
+    status, _, _ = benchmark_case(*queen_graph(4), 3, mode, time_limit=0.2)
+    assert status == ('budget' if mode == 'local_search' else 'unsat')
+
+
+@pytest.mark.parametrize('nogood_cache', [True, False])
+def test_enumeration_counts_match_brute_force(nogood_cache):
+    rng = random.Random(8)
+    for _ in range(40):
+        variables, domains, constraints = random_typed_problem(rng)
+        expected = {values for values in itertools.product(*(domains[var] for var in variables))
+                    if all(satisfies(c, dict(zip(variables, values))) for c in constraints)}
+        csp = CSP(variables, domains, constraints)
+        solutions = [tuple(solution[var] for var in variables)
+                     for solution in csp.iter_solutions(nogood_cache=nogood_cache)]
+        assert len(solutions) == len(set(solutions)) and set(solutions) == expected
+        for by_components in (True, False):
+            assert csp.count_solutions(nogood_cache, by_components=by_components) == len(expected)
@@ -0,0 +1,216 @@
+import random
+import time
+
+import pytest
+
+from MinMaxAlgo import (LOOKUP_MAGIC, SYMMETRIES, BitBoard, ListBoard, MNKGame, ParallelSearch, TicTacToe,
+                        generate_lookup_table)
+
+
+def ai_to_move_positions(count, seed=0):
+    # Random unfinished positions with the AI ('O') to move, as lists of (row, col, player)
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        game = TicTacToe(use_table=False, lookup_path=None)
+        cells = rng.sample([(row, col) for row in range(3) for col in range(3)], rng.choice([1, 3, 5, 7]))
+        marks = [(row, col, 'XO'[i % 2]) for i, (row, col) in enumerate(cells)]
+        for row, col, player in marks:
+            game.place(row, col, player)
+        if game.check_winner() is None:
+            positions.append(marks)
+    return positions
+
+
+def new_game(marks, **options):
+    game = TicTacToe(lookup_path=None, **options)
+    for row, col, player in marks:
+        game.place(row, col, player)
+    return game
+
+
+@pytest.mark.parametrize('contents', [b'', LOOKUP_MAGIC + b'\0' * 100, b'JUNK' + b'\0' * (2 * 3 ** 9)])
+def test_bad_lookup_table_falls_back_to_search(tmp_path, contents):
+    path = tmp_path / 'tictactoe.table'
+    path.write_bytes(contents)
+    game = TicTacToe(lookup_path=str(path))
+    assert game.lookup is None
+    game.place(0, 0, game.human)
+    assert game.best_move() == (1, 1)
+
+
+def test_lookup_table_gives_the_searched_moves(tmp_path):
+    path = str(tmp_path / 'tictactoe.table')
+    assert generate_lookup_table(path) > 0
+    for marks in ai_to_move_positions(100, seed=6):
+        game = new_game(marks)
+        searched = game.best_move(), game.best_score
+        game = TicTacToe(lookup_path=path)
+        for row, col, player in marks:
+            game.place(row, col, player)
+        assert (game.best_move(), game.best_score) == searched
+        assert game.nodes == 0
+
+
+def test_missing_lookup_table_falls_back_to_search(tmp_path):
+    game = TicTacToe(lookup_path=str(tmp_path / 'missing.table'))
+    assert game.lookup is None
+    assert game.best_move() is not None
+
+
+def test_transposition_table_keeps_scores_and_saves_nodes():
+    table_nodes = plain_nodes = 0
+    for marks in ai_to_move_positions(60):
+        plain = new_game(marks, use_table=False)
+        plain.best_move()
+        game = new_game(marks)
+        move = game.best_move()
+        assert game.best_score == plain.best_score
+        assert new_game(marks, use_table=False).search_root_move(move) == plain.best_score
+        table_nodes += game.nodes
+        plain_nodes += plain.nodes
+    assert table_nodes < plain_nodes
+
+
+def test_canonical_hash_is_symmetry_invariant():
+    for marks in ai_to_move_positions(30, seed=1):
+        game = new_game(marks)
+        for symmetry in SYMMETRIES:
+            image = new_game([(*divmod(symmetry[row * 3 + col], 3), player) for row, col, player in marks])
+            assert min(image.hashes) == min(game.hashes)
+        for row, col, _ in reversed(marks):
+            game.remove(row, col)
+        assert game.hashes == [0] * len(SYMMETRIES) and game.position == 0
+
+
+def test_board_backends_agree():
+    rng = random.Random(2)
+    for _ in range(300):
+        boards = ListBoard(), BitBoard()
+        cells = rng.sample([(row, col) for row in range(3) for col in range(3)], 9)
+        for i, (row, col) in enumerate(cells):
+            for board in boards:
+                board.place(row, col, 'XO'[i % 2])
+            assert boards[0].winner() == boards[1].winner()
+            assert boards[0].moves() == boards[1].moves()
+            assert all(boards[0].cell(r, c) == boards[1].cell(r, c) for r in range(3) for c in range(3))
+            if boards[0].winner() is not None:
+                break
+        row, col = cells[0]
+        for board in boards:
+            board.remove(row, col)
+        assert boards[0].cell(row, col) == boards[1].cell(row, col) == ' '
+        assert boards[0].moves() == boards[1].moves()
+
+
+@pytest.mark.parametrize('use_table', [True, False])
+def test_bitboard_search_matches_list_search(use_table):
+    for marks in ai_to_move_positions(40, seed=3):
+        games = [new_game(marks, use_table=use_table, backend=backend) for backend in ('list', 'bitboard')]
+        assert games[0].best_move() == games[1].best_move()
+        assert games[0].best_score == games[1].best_score
+        assert games[0].nodes == games[1].nodes
+
+
+def mnk_rescan(game):
+    # Evaluation and winner recomputed from the board alone
+    score, winner = 0, None
+    for line in game.lines:
+        marks = [game.board[cell] for cell in line]
+        a, h = marks.count(game.ai), marks.count(game.human)
+        score += game.contribution[a][h]
+        if a == game.k:
+            winner = game.ai
+        elif h == game.k and winner is None:
+            winner = game.human
+    return score, winner
+
+
+def test_mnk_incremental_state_matches_rescan():
+    rng = random.Random(5)
+    game = MNKGame(6, 7, 4)
+    for _ in range(400):
+        empty = [cell for cell in range(game.size) if game.board[cell] == ' ']
+        if game.moves_made and (not empty or rng.random() < 0.3):
+            game.remove(game.moves_made[-1])
+        else:
+            game.place(rng.choice(empty), rng.choice([game.ai, game.human]))
+        score, winner = mnk_rescan(game)
+        assert game.score == score
+        if winner is not None:
+            assert game.check_winner() in (game.ai, game.human)
+        elif len(game.moves_made) < game.size:
+            assert game.check_winner() is None
+
+
+def test_mnk_takes_wins_and_blocks_losses():
+    game = MNKGame(7, 7, 5, time_limit=1.0)
+    for col in range(4):
+        game.place(3 * 7 + col, game.ai)
+        game.place(5 * 7 + col + 1, game.human)
+    assert game.best_move() == (3, 4)
+
+    game = MNKGame(7, 7, 5, time_limit=1.0)
+    for col, row in ((1, 3), (2, 3), (3, 3), (4, 3)):
+        game.place(row * 7 + col, game.human)
+    game.place(3 * 7, game.ai)
+    game.place(6 * 7 + 6, game.ai)
+    game.place(0, game.ai)
+    assert game.best_move() == (3, 5)
+
+
+def test_mnk_plays_perfect_tic_tac_toe():
+    game = MNKGame(3, 3, 3, time_limit=30)
+    game.place(0, game.human)  # Corner opening: only the centre holds the draw
+    assert game.best_move() == (1, 1)
+    assert game.moves_made == [0]
+
+
+def test_mnk_respects_time_limit():
+    game = MNKGame(9, 9, 5, time_limit=0.3)
+    game.place(40, game.human)
+    start = time.perf_counter()
+    row, col = game.best_move()
+    assert time.perf_counter() - start < 1.5
+    assert game.is_valid_move(row, col) and game.moves_made == [40]
+
+
+@pytest.fixture(scope='module')
+def parallel_search():
+    with ParallelSearch(2) as search:
+        yield search
+
+
+def test_parallel_tictactoe_matches_serial(parallel_search):
+    for marks in ai_to_move_positions(15, seed=4):
+        serial = new_game(marks)
+        game = new_game(marks)
+        assert parallel_search.best_move(game) == serial.best_move()
+        assert game.best_score == serial.best_score
+
+
+def test_parallel_mnk_root_search_matches_serial(parallel_search):
+    game = MNKGame(7, 7, 5)
+    for row, col, player in ((3, 3, 'X'), (3, 4, 'O'), (2, 2, 'X')):
+        game.make_move(row, col, player)
+    for depth in (1, 2, 3):
+        game.start_search(float('inf'))
+        moves = game.ordered_moves(0, game.ai)
+        best_score, best_move = float('-inf'), None
+        for move in moves:
+            score = game.search_root_move(move, depth, best_score)
+            if score > best_score:
+                best_score, best_move = score, move
+        game.start_search(float('inf'))
+        assert parallel_search.search_root(game, moves, depth, float('inf')) == (best_move, best_score, True)
+
+
+def test_parallel_mnk_best_move_in_time(parallel_search):
+    game = MNKGame(7, 7, 5, time_limit=0.5)
+    for col in range(4):
+        game.place(3 * 7 + col, game.ai)
+        game.place(5 * 7 + col + 1, game.human)
+    start = time.perf_counter()
+    assert parallel_search.best_move(game) == (3, 4)
+    assert time.perf_counter() - start < 2
+    assert len(game.moves_made) == 8
@@ -0,0 +1,63 @@
+import asyncio
+import random
+
+import pytest
+
+from TicTacToe import Board, GameServer, check_winner, is_full, run_load
+
+
+def test_board_detects_results_like_a_full_scan():
+    rng = random.Random(0)
+    for _ in range(300):
+        board = Board()
+        cells = [(row, col) for row in range(3) for col in range(3)]
+        rng.shuffle(cells)
+        for row, col in cells:
+            player = board.current_player
+            result = board.play(row, col)
+            if check_winner(board.cells, player):
+                assert result == "win"
+                break
+            assert result == ("draw" if is_full(board.cells) else None)
+
+
+def test_board_rejects_bad_moves():
+    board = Board()
+    board.play(1, 1)
+    with pytest.raises(ValueError):
+        board.play(1, 1)
+    with pytest.raises(ValueError):
+        board.play(3, 0)
+    assert board.current_player == "O"
+
+
+def test_game_server_protocol():
+    server = GameServer()
+    assert server.handle("NEW") == "OK 1"
+    assert server.handle("NEW") == "OK 2"
+    for row, col, reply in ((0, 0, "OK 1 O"), (1, 0, "OK 1 X"), (0, 1, "OK 1 O"), (1, 1, "OK 1 X")):
+        assert server.handle(f"MOVE 1 {row} {col}") == reply
+    assert server.handle("BOARD 1") == "BOARD 1 XX.OO...."
+    assert server.handle("MOVE 1 0 0").startswith("ERR")
+    assert server.handle("MOVE 1 0 2") == "WIN 1 X"
+    assert server.handle("BOARD 1") == "ERR no game 1"
+    assert server.handle("MOVE 2") == "ERR missing arguments for MOVE"
+    assert server.handle("JUMP 2") == "ERR unknown command JUMP"
+    assert server.handle("") == "ERR empty request"
+    assert list(server.games) == [2]
+
+
+def test_load_run_against_server(tmp_path):
+    path = str(tmp_path / 'ttt.sock')
+
+    async def play():
+        server = GameServer()
+        listener = await asyncio.start_unix_server(server.serve_client, path)
+        async with listener:
+            stats = await run_load(games=200, connections=4, path=path)
+        return server, stats
+
+    server, stats = asyncio.run(play())
+    assert stats['wins'] + stats['draws'] == 200
+    assert stats['moves'] == server.moves_played
+    assert server.games == {}